@@ -18,28 +18,60 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.typing import ConfigType
 
+from .aggregates import parse_windows
+from .cache import DATA_RESPONSE_CACHE, SharedResponseCache
 from .const import (
+    CONF_AGGREGATES,
+    CONF_CACHE_DIR,
     CONF_ENDPOINT,
+    CONF_FORECAST_SERIES,
+    CONF_FORECAST_STATISTICS,
+    CONF_HORIZON_CUTOFF,
+    CONF_INTERPOLATE_CURRENT,
+    CONF_LOCATION_GRID,
     CONF_MODELS,
+    CONF_PUSH_UPDATES,
+    CONF_RULES,
+    CONF_SHARE_FORECAST,
+    CONF_SOLAR_AZIMUTH,
+    CONF_SOLAR_CAPACITY,
+    CONF_SOLAR_TILT,
     CONF_UNITS,
+    CONF_WINDOWS,
+    CONF_WRITE_POLICIES,
     DEFAULT_ENDPOINT,
+    DEFAULT_HORIZON_CUTOFF,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SOLAR_AZIMUTH,
+    DEFAULT_SOLAR_TILT,
     DOMAIN,
     ENTRY_NAME,
+    ENTRY_RECONFIGURE,
+    ENTRY_RULE_ENGINE,
     ENTRY_WEATHER_COORDINATOR,
     MANUFACTURER,
     PLATFORMS,
+    PUSH_FALLBACK_SCAN_INTERVAL,
     PW_PLATFORM,
     PW_PLATFORMS,
     PW_ROUND,
+    RULE_PLATFORMS,
     UPDATE_LISTENER,
 )
+from .dispatcher import parse_write_policies
+from .rules import RuleEngine, parse_rules
+from .services import async_setup_services
+from .solar import SolarArray
+from .views import async_register_views
 
 # from .weather_update_coordinator import WeatherUpdateCoordinator, DarkSkyData
 from .weather_update_coordinator import WeatherUpdateCoordinator
+from .windows import parse_queries
 
 CONF_FORECAST = "forecast"
 CONF_HOURLY_FORECAST = "hourly_forecast"
@@ -47,107 +79,81 @@ CONF_HOURLY_FORECAST = "hourly_forecast"
 _LOGGER = logging.getLogger(__name__)
 ATTRIBUTION = "Powered by Pirate Weather"
 
+# Options that change the API request or the platforms need a full reload
+RELOAD_OPTIONS = {
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_UNITS,
+    CONF_LANGUAGE,
+    CONF_ENDPOINT,
+    CONF_MODELS,
+    CONF_CACHE_DIR,
+    CONF_LOCATION_GRID,
+    PW_PLATFORM,
+}
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Pirate Weather as config entry."""
-    name = entry.data[CONF_NAME]
-    api_key = entry.data[CONF_API_KEY]
-    latitude = _get_config_value(entry, CONF_LATITUDE)
-    longitude = _get_config_value(entry, CONF_LONGITUDE)
-    forecast_mode = "daily"
-    conditions = _get_config_value(entry, CONF_MONITORED_CONDITIONS)
-    units = _get_config_value(entry, CONF_UNITS)
-    forecast_days = _get_config_value(entry, CONF_FORECAST)
-    forecast_hours = _get_config_value(entry, CONF_HOURLY_FORECAST)
-    pw_entity_platform = _get_config_value(entry, PW_PLATFORM)
-    pw_entity_rounding = _get_config_value(entry, PW_ROUND)
-    scan_interval = _get_config_value(entry, CONF_SCAN_INTERVAL)
-    language = _get_config_value(entry, CONF_LANGUAGE)
-    endpoint = _get_config_value(entry, CONF_ENDPOINT)
-    models = _get_config_value(entry, CONF_MODELS)
-
-    # If scan_interval config value is not configured fall back to the entry data config value
-    if not scan_interval:
-        scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-
-    # If endpoint config value is not configured fall back to the default
-    if not endpoint:
-        endpoint = DEFAULT_ENDPOINT
-        _LOGGER.info("Using default Pirate Weather Endpoint")
-
-    # If latitude or longitude is not configured fall back to the HA location
-    if not latitude:
-        latitude = hass.config.latitude
-    if not longitude:
-        longitude = hass.config.longitude
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-    scan_interval = max(scan_interval, 60)
 
-    # Extract list of int from forecast days/ hours string if present
-    # _LOGGER.warning('forecast_days_type: ' + str(type(forecast_days)))
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Pirate Weather services."""
+    async_setup_services(hass)
+    return True
 
-    # _LOGGER.warning(forecast_days)
-    if isinstance(forecast_days, str):
-        # If empty, set to none
-        if forecast_days in {"", "None"}:
-            forecast_days = None
-        else:
-            if forecast_days[0] == "[":
-                forecast_days = forecast_days[1:-1].split(",")
-            else:
-                forecast_days = forecast_days.split(",")
-            forecast_days = [int(i) for i in forecast_days]
 
-    if isinstance(forecast_hours, str):
-        # If empty, set to none
-        if forecast_hours in {"", "None"}:
-            forecast_hours = None
-        else:
-            if forecast_hours[0] == "[":
-                forecast_hours = forecast_hours[1:-1].split(",")
-            else:
-                forecast_hours = forecast_hours.split(",")
-            forecast_hours = [int(i) for i in forecast_hours]
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Pirate Weather as config entry."""
+    name = entry.data[CONF_NAME]
+    settings = _get_entry_settings(hass, entry)
 
-    unique_location = f"pw-{latitude}-{longitude}"
+    # Optional response cache shared with other instances on the same host
+    shared_cache = None
+    if settings[CONF_CACHE_DIR]:
+        shared_cache = SharedResponseCache(
+            hass, hass.config.path(settings[CONF_CACHE_DIR])
+        )
 
     hass.data.setdefault(DOMAIN, {})
     # Create and link weather WeatherUpdateCoordinator
     weather_coordinator = WeatherUpdateCoordinator(
-        api_key,
-        latitude,
-        longitude,
-        timedelta(seconds=scan_interval),
-        language,
-        endpoint,
-        units,
+        settings[CONF_API_KEY],
+        settings[CONF_LATITUDE],
+        settings[CONF_LONGITUDE],
+        timedelta(seconds=settings[CONF_SCAN_INTERVAL]),
+        settings[CONF_LANGUAGE],
+        settings[CONF_ENDPOINT],
+        settings[CONF_UNITS],
         hass,
         entry,
-        models,
+        settings[CONF_MODELS],
+        shared_cache,
+        settings[CONF_LOCATION_GRID],
+        settings[CONF_INTERPOLATE_CURRENT],
     )
-    hass.data[DOMAIN][unique_location] = weather_coordinator
+    weather_coordinator.solar_array = _get_solar_array(settings)
 
     # await weather_coordinator.async_refresh()
     await weather_coordinator.async_config_entry_first_refresh()
 
+    # Rules are evaluated on each update, before any entity reads them
+    rule_engine = RuleEngine(hass, weather_coordinator)
+    entry.async_on_unload(
+        weather_coordinator.async_add_listener(rule_engine.async_update)
+    )
+    entry.async_on_unload(rule_engine.async_stop)
+    rule_engine.async_set_rules(settings[CONF_RULES])
+
     hass.data[DOMAIN][entry.entry_id] = {
         ENTRY_NAME: name,
         ENTRY_WEATHER_COORDINATOR: weather_coordinator,
-        CONF_API_KEY: api_key,
-        CONF_LATITUDE: latitude,
-        CONF_LONGITUDE: longitude,
-        CONF_UNITS: units,
-        CONF_MONITORED_CONDITIONS: conditions,
-        CONF_MODE: forecast_mode,
-        CONF_FORECAST: forecast_days,
-        CONF_HOURLY_FORECAST: forecast_hours,
-        PW_PLATFORM: pw_entity_platform,
-        PW_ROUND: pw_entity_rounding,
-        CONF_SCAN_INTERVAL: scan_interval,
-        CONF_LANGUAGE: language,
-        CONF_ENDPOINT: endpoint,
-        CONF_MODELS: models,
+        ENTRY_RULE_ENGINE: rule_engine,
+        **settings,
     }
+    pw_entity_platform = settings[PW_PLATFORM]
+
+    if settings[CONF_PUSH_UPDATES] or settings[CONF_SHARE_FORECAST]:
+        async_register_views(hass)
 
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
@@ -170,6 +176,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # If only weather
     elif PW_PLATFORMS[1] in pw_entity_platform:
         await hass.config_entries.async_forward_entry_setups(entry, [PLATFORMS[1]])
+    if settings[CONF_RULES]:
+        await hass.config_entries.async_forward_entry_setups(entry, RULE_PLATFORMS)
 
     update_listener = entry.add_update_listener(async_update_options)
     hass.data[DOMAIN][entry.entry_id][UPDATE_LISTENER] = update_listener
@@ -177,8 +185,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update options."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Update options.
+
+    Only options that change the API request or the platforms reload the entry.
+    Polling and sharing options are applied to the running coordinator, and the
+    platforms add, remove or update just the entities affected by the rest.
+    """
+    domain_data = hass.data[DOMAIN][entry.entry_id]
+    settings = _get_entry_settings(hass, entry)
+    changed = {key for key, value in settings.items() if domain_data.get(key) != value}
+    if not changed:
+        return
+
+    # The rule platform is only set up for entries with rules
+    if changed & RELOAD_OPTIONS or bool(settings[CONF_RULES]) != bool(
+        domain_data[CONF_RULES]
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Reconfiguring %s without a reload: %s", entry.title, changed)
+    domain_data.update(settings)
+
+    weather_coordinator = domain_data[ENTRY_WEATHER_COORDINATOR]
+    weather_coordinator.scan_interval = timedelta(seconds=settings[CONF_SCAN_INTERVAL])
+    weather_coordinator.update_interval = weather_coordinator.scan_interval
+    weather_coordinator.async_set_interpolation(settings[CONF_INTERPOLATE_CURRENT])
+    weather_coordinator.solar_array = _get_solar_array(settings)
+    if CONF_RULES in changed:
+        domain_data[ENTRY_RULE_ENGINE].async_set_rules(settings[CONF_RULES])
+
+    if settings[CONF_PUSH_UPDATES] or settings[CONF_SHARE_FORECAST]:
+        async_register_views(hass)
+
+    for async_reconfigure in domain_data.get(ENTRY_RECONFIGURE, []):
+        await async_reconfigure(changed)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -200,6 +241,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         unload_ok = await hass.config_entries.async_unload_platforms(
             entry, [PLATFORMS[1]]
         )
+    if hass.data[DOMAIN][entry.entry_id][CONF_RULES]:
+        unload_ok = (
+            await hass.config_entries.async_unload_platforms(entry, RULE_PLATFORMS)
+            and unload_ok
+        )
 
     _LOGGER.info("Unloading Pirate Weather")
 
@@ -207,11 +253,133 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         update_listener = hass.data[DOMAIN][entry.entry_id][UPDATE_LISTENER]
         update_listener()
 
+        # The coordinator releases its forecast when the entry unloads
         hass.data[DOMAIN].pop(entry.entry_id)
 
+        # Cached responses are only shared between loaded entries
+        if not hass.config_entries.async_loaded_entries(DOMAIN):
+            hass.data[DOMAIN].pop(DATA_RESPONSE_CACHE, None)
+
     return unload_ok
 
 
+def _get_entry_settings(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the settings of an entry with defaults and fallbacks applied."""
+    latitude = _get_config_value(entry, CONF_LATITUDE)
+    longitude = _get_config_value(entry, CONF_LONGITUDE)
+    forecast_days = _get_config_value(entry, CONF_FORECAST)
+    forecast_hours = _get_config_value(entry, CONF_HOURLY_FORECAST)
+    # A tilt or azimuth of 0 is a valid orientation
+    solar_tilt = _get_config_value(entry, CONF_SOLAR_TILT)
+    if solar_tilt is None:
+        solar_tilt = DEFAULT_SOLAR_TILT
+    solar_azimuth = _get_config_value(entry, CONF_SOLAR_AZIMUTH)
+    if solar_azimuth is None:
+        solar_azimuth = DEFAULT_SOLAR_AZIMUTH
+
+    horizon_cutoff = _get_config_value(entry, CONF_HORIZON_CUTOFF)
+    if horizon_cutoff is None:
+        horizon_cutoff = DEFAULT_HORIZON_CUTOFF
+    scan_interval = _get_config_value(entry, CONF_SCAN_INTERVAL)
+    endpoint = _get_config_value(entry, CONF_ENDPOINT)
+    push_updates = bool(_get_config_value(entry, CONF_PUSH_UPDATES))
+
+    # If scan_interval config value is not configured fall back to the entry data config value
+    if not scan_interval:
+        scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+
+    # If endpoint config value is not configured fall back to the default
+    if not endpoint:
+        endpoint = DEFAULT_ENDPOINT
+        _LOGGER.info("Using default Pirate Weather Endpoint")
+
+    # If latitude or longitude is not configured fall back to the HA location
+    if not latitude:
+        latitude = hass.config.latitude
+    if not longitude:
+        longitude = hass.config.longitude
+
+    scan_interval = max(scan_interval, 60)
+
+    # Pushed forecasts keep the data fresh, so polling only needs to catch missed pushes
+    if push_updates:
+        scan_interval = max(scan_interval, PUSH_FALLBACK_SCAN_INTERVAL)
+
+    # Extract list of int from forecast days/ hours string if present
+    # _LOGGER.warning('forecast_days_type: ' + str(type(forecast_days)))
+
+    # _LOGGER.warning(forecast_days)
+    if isinstance(forecast_days, str):
+        # If empty, set to none
+        if forecast_days in {"", "None"}:
+            forecast_days = None
+        else:
+            if forecast_days[0] == "[":
+                forecast_days = forecast_days[1:-1].split(",")
+            else:
+                forecast_days = forecast_days.split(",")
+            forecast_days = [int(i) for i in forecast_days]
+
+    if isinstance(forecast_hours, str):
+        # If empty, set to none
+        if forecast_hours in {"", "None"}:
+            forecast_hours = None
+        else:
+            if forecast_hours[0] == "[":
+                forecast_hours = forecast_hours[1:-1].split(",")
+            else:
+                forecast_hours = forecast_hours.split(",")
+            forecast_hours = [int(i) for i in forecast_hours]
+
+    return {
+        CONF_API_KEY: entry.data[CONF_API_KEY],
+        CONF_LATITUDE: latitude,
+        CONF_LONGITUDE: longitude,
+        CONF_UNITS: _get_config_value(entry, CONF_UNITS),
+        CONF_MONITORED_CONDITIONS: _get_config_value(entry, CONF_MONITORED_CONDITIONS),
+        CONF_MODE: "daily",
+        CONF_FORECAST: forecast_days,
+        CONF_HOURLY_FORECAST: forecast_hours,
+        CONF_FORECAST_SERIES: bool(_get_config_value(entry, CONF_FORECAST_SERIES)),
+        CONF_HORIZON_CUTOFF: horizon_cutoff,
+        CONF_FORECAST_STATISTICS: _get_config_value(entry, CONF_FORECAST_STATISTICS)
+        or [],
+        CONF_AGGREGATES: parse_windows(_get_config_value(entry, CONF_AGGREGATES)),
+        CONF_WINDOWS: parse_queries(_get_config_value(entry, CONF_WINDOWS)),
+        CONF_RULES: parse_rules(_get_config_value(entry, CONF_RULES)),
+        CONF_WRITE_POLICIES: parse_write_policies(
+            _get_config_value(entry, CONF_WRITE_POLICIES)
+        ),
+        CONF_SOLAR_CAPACITY: _get_config_value(entry, CONF_SOLAR_CAPACITY) or 0,
+        CONF_SOLAR_TILT: solar_tilt,
+        CONF_SOLAR_AZIMUTH: solar_azimuth,
+        PW_PLATFORM: _get_config_value(entry, PW_PLATFORM),
+        PW_ROUND: _get_config_value(entry, PW_ROUND),
+        CONF_SCAN_INTERVAL: scan_interval,
+        CONF_INTERPOLATE_CURRENT: bool(
+            _get_config_value(entry, CONF_INTERPOLATE_CURRENT)
+        ),
+        CONF_LANGUAGE: _get_config_value(entry, CONF_LANGUAGE),
+        CONF_ENDPOINT: endpoint,
+        CONF_MODELS: _get_config_value(entry, CONF_MODELS),
+        CONF_PUSH_UPDATES: push_updates,
+        CONF_SHARE_FORECAST: bool(_get_config_value(entry, CONF_SHARE_FORECAST)),
+        CONF_CACHE_DIR: _get_config_value(entry, CONF_CACHE_DIR),
+        CONF_LOCATION_GRID: _get_config_value(entry, CONF_LOCATION_GRID) or 0.0,
+    }
+
+
+def _get_solar_array(settings: dict[str, Any]) -> SolarArray | None:
+    """Return the solar array of the entry settings, or None without one."""
+    if not settings[CONF_SOLAR_CAPACITY]:
+        return None
+    return SolarArray(
+        settings[CONF_SOLAR_CAPACITY],
+        settings[CONF_SOLAR_TILT],
+        settings[CONF_SOLAR_AZIMUTH],
+    )
+
+
 def _get_config_value(config_entry: ConfigEntry, key: str) -> Any:
     if config_entry.options and key in config_entry.options:
         return config_entry.options[key]
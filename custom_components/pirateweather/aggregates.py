@@ -0,0 +1,170 @@
+"""Rolling window aggregates over the hourly forecast."""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Reductions over the values of a window
+VALUE_REDUCTIONS = ("min", "max", "sum", "mean")
+# Reductions counting the hours above or below a threshold
+COUNT_REDUCTIONS = ("above", "below")
+
+# Conditions that cannot be reduced: text, which has no order or sum, times,
+# whose sum or mean is not a time of the day, the fire risk level, which has no
+# hourly column of its own, and bearings, where the mean of 350 and 10 degrees
+# would be 180 rather than 0
+UNAGGREGATED_CONDITIONS = frozenset(
+    {
+        "summary",
+        "icon",
+        "precip_type",
+        "time",
+        "fire_risk_level",
+        "wind_bearing",
+        "nearest_storm_bearing",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AggregateWindow:
+    """A reduction of a monitored condition over the next hours.
+
+    Windows start at the current hour. Count reductions compare each hour with
+    a threshold in the units requested from the API.
+    """
+
+    condition: str
+    reduction: str
+    horizon: int
+    threshold: float | None = None
+
+    @property
+    def key(self) -> str:
+        """Return a key identifying the window."""
+        if self.threshold is None:
+            return f"{self.condition}_{self.reduction}_{self.horizon}h"
+        return f"{self.condition}_{self.reduction}_{self.threshold:g}_{self.horizon}h"
+
+    @property
+    def label(self) -> str:
+        """Return the name of the window."""
+        if self.threshold is None:
+            return f"{self.reduction.title()} {self.horizon}h"
+        return f"{self.reduction.title()} {self.threshold:g} {self.horizon}h"
+
+
+def parse_windows(value: str | None) -> list[AggregateWindow]:
+    """Parse comma separated window definitions.
+
+    A definition is condition:reduction:hours, with a threshold added for the
+    count reductions, ex. 'temperature:max:12,temperature:below:12:0'. Invalid
+    definitions are logged and skipped.
+    """
+    windows = []
+    for definition in (value or "").split(","):
+        if not definition.strip():
+            continue
+        try:
+            windows.append(_parse_window(definition))
+        except ValueError as err:
+            _LOGGER.warning("Ignoring aggregate %s: %s", definition.strip(), err)
+    return windows
+
+
+def _parse_window(definition: str) -> AggregateWindow:
+    """Parse one window definition."""
+    parts = [part.strip() for part in definition.split(":")]
+    if len(parts) not in {3, 4}:
+        raise ValueError("expected condition:reduction:hours[:threshold]")
+
+    condition, reduction, horizon = parts[:3]
+    if condition in UNAGGREGATED_CONDITIONS:
+        raise ValueError(f"{condition} cannot be aggregated")
+    horizon = int(horizon)
+    if horizon < 1:
+        raise ValueError("the window must cover at least one hour")
+
+    if reduction in VALUE_REDUCTIONS and len(parts) == 3:
+        return AggregateWindow(condition, reduction, horizon)
+    if reduction in COUNT_REDUCTIONS and len(parts) == 4:
+        return AggregateWindow(condition, reduction, horizon, float(parts[3]))
+    raise ValueError(
+        f"reduction must be one of {', '.join(VALUE_REDUCTIONS)} or one of "
+        f"{', '.join(COUNT_REDUCTIONS)} with a threshold"
+    )
+
+
+class PrefixAggregates:
+    """Prefix reductions of an hourly field, answering any window in O(1).
+
+    Windows all start at the same row, so the sum, count, minimum and maximum
+    of every prefix are computed once and each window reads one element.
+    Missing values are left out of every reduction.
+    """
+
+    __slots__ = ("_counts", "_known", "_max", "_min", "_sum", "_values")
+
+    def __init__(self, values: list[Any]) -> None:
+        """Compute the prefix reductions of the values."""
+        self._values = [
+            value
+            if isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and value != -999
+            else None
+            for value in values
+        ]
+        self._sum = list(accumulate((value or 0 for value in self._values), initial=0))
+        self._known = list(
+            accumulate((value is not None for value in self._values), initial=0)
+        )
+        self._min = list(
+            accumulate(
+                (math.inf if value is None else value for value in self._values), min
+            )
+        )
+        self._max = list(
+            accumulate(
+                (-math.inf if value is None else value for value in self._values), max
+            )
+        )
+        # Prefix counts by reduction and threshold, built for the windows asking
+        self._counts: dict[tuple[str, float], list[int]] = {}
+
+    def reduce(self, window: AggregateWindow) -> float | None:
+        """Return the reduction of a window, or None without known values."""
+        end = min(window.horizon, len(self._values))
+        if not end or not self._known[end]:
+            return None
+
+        if window.reduction == "sum":
+            return self._sum[end]
+        if window.reduction == "mean":
+            return self._sum[end] / self._known[end]
+        if window.reduction == "min":
+            return self._min[end - 1]
+        if window.reduction == "max":
+            return self._max[end - 1]
+        return self._count(window.reduction, window.threshold)[end]
+
+    def _count(self, reduction: str, threshold: float) -> list[int]:
+        """Return the prefix counts of the values above or below a threshold."""
+        key = (reduction, threshold)
+        if key not in self._counts:
+            if reduction == "above":
+                hits = (
+                    value is not None and value > threshold for value in self._values
+                )
+            else:
+                hits = (
+                    value is not None and value < threshold for value in self._values
+                )
+            self._counts[key] = list(accumulate(hits, initial=0))
+        return self._counts[key]
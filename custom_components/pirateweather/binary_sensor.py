@@ -0,0 +1,132 @@
+"""Binary sensors for the Pirate Weather forecast rules."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    CONF_RULES,
+    DOMAIN,
+    ENTRY_RECONFIGURE,
+    ENTRY_RULE_ENGINE,
+    MANUFACTURER,
+)
+from .rules import ForecastRule, RuleEngine
+
+ATTRIBUTION = "Powered by Pirate Weather"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Pirate Weather rule binary sensors based on a config entry."""
+    domain_data = hass.data[DOMAIN][config_entry.entry_id]
+    name = domain_data[CONF_NAME]
+    rule_engine = domain_data[ENTRY_RULE_ENGINE]
+    service_id = config_entry.unique_id or config_entry.entry_id
+
+    device_info = DeviceInfo(
+        entry_type=DeviceEntryType.SERVICE,
+        identifiers={(DOMAIN, service_id)},
+        manufacturer=MANUFACTURER,
+        name=name,
+    )
+
+    # Binary sensors added for the current rules, by unique ID
+    added: dict[str, PirateWeatherRuleBinarySensor] = {}
+
+    def build_sensors() -> dict[str, PirateWeatherRuleBinarySensor]:
+        """Build a binary sensor for every rule of the entry."""
+        sensors = (
+            PirateWeatherRuleBinarySensor(
+                rule_engine,
+                rule,
+                name,
+                f"{service_id}-binary_sensor-rule-{rule.key}",
+                device_info,
+            )
+            for rule in domain_data.get(CONF_RULES) or []
+        )
+        return {sensor.unique_id: sensor for sensor in sensors}
+
+    async def async_reconfigure(changed: set[str]) -> None:
+        """Add and remove binary sensors for changed rules."""
+        if CONF_RULES not in changed:
+            return
+
+        wanted = build_sensors()
+        for unique_id in added.keys() - wanted.keys():
+            await added.pop(unique_id).async_remove()
+
+        new_sensors = [
+            sensor for unique_id, sensor in wanted.items() if unique_id not in added
+        ]
+        added.update((sensor.unique_id, sensor) for sensor in new_sensors)
+        async_add_entities(new_sensors)
+
+    domain_data.setdefault(ENTRY_RECONFIGURE, []).append(async_reconfigure)
+
+    added.update(build_sensors())
+    async_add_entities(list(added.values()))
+
+
+class PirateWeatherRuleBinarySensor(BinarySensorEntity):
+    """Binary sensor that is on while a forecast rule is met.
+
+    The rule engine evaluates the rule on each coordinator update and as its
+    block rolls over, so the sensor is only written after an evaluation.
+    """
+
+    _attr_attribution = ATTRIBUTION
+    _attr_should_poll = False
+    _attr_icon = "mdi:weather-cloudy-alert"
+
+    def __init__(
+        self,
+        rule_engine: RuleEngine,
+        rule: ForecastRule,
+        name: str,
+        unique_id: str,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the binary sensor."""
+        self._rule_engine = rule_engine
+        self.rule = rule
+        self._attr_name = f"{name} {rule.label}"
+        self._attr_unique_id = unique_id
+        self._attr_device_info = device_info
+
+    @property
+    def available(self) -> bool:
+        """Return if the rule has been evaluated."""
+        return self.rule.key in self._rule_engine.results
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return if the rule is met."""
+        if (result := self._rule_engine.results.get(self.rule.key)) is None:
+            return None
+        return result.active
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the first point meeting the rule."""
+        result = self._rule_engine.results.get(self.rule.key)
+        if result is None or result.time is None:
+            return {"time": None, "value": None}
+        return {"time": result.time.isoformat(), "value": result.value}
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state after each evaluation of the rules."""
+        self.async_on_remove(
+            self._rule_engine.async_add_listener(self.async_write_ha_state)
+        )
@@ -0,0 +1,213 @@
+"""Response caches shared between Pirate Weather entries and instances."""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, TextIO
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.file import write_utf8_file
+from homeassistant.util.json import json_loads
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RESPONSE_CACHE = "response_cache"
+
+# Seconds to wait for another instance to finish fetching before fetching anyway
+LOCK_TIMEOUT = 30
+LOCK_POLL_INTERVAL = 0.25
+
+
+def request_cache_key(forecast_string: str, api_key: str) -> str:
+    """Return a cache key for a forecast request without exposing the API key."""
+    return hashlib.sha256(forecast_string.replace(api_key, "").encode()).hexdigest()
+
+
+@callback
+def async_get_response_cache(hass: HomeAssistant) -> ResponseCache:
+    """Return the in-memory response cache shared by all entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_RESPONSE_CACHE not in domain_data:
+        domain_data[DATA_RESPONSE_CACHE] = ResponseCache()
+    return domain_data[DATA_RESPONSE_CACHE]
+
+
+class ResponseCache:
+    """Cache API responses in memory so entries making the same request share fetches.
+
+    Each response is kept as the API's JSON document until its time to live
+    expires, and every entry parses its own forecast from it. A lock per
+    request lets concurrent refreshes wait for a single fetch.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: dict[str, tuple[float, float, dict[str, Any]]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """Return the lock serializing fetches of a request."""
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    def get(self, key: str, max_age: float) -> dict[str, Any] | None:
+        """Return a cached response if it was fetched within max_age seconds."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        fetched, expires, data = entry
+        now = time.monotonic()
+        if now > expires or now - fetched > max_age:
+            return None
+        return data
+
+    def set(self, key: str, data: dict[str, Any], ttl: float) -> None:
+        """Store a response for ttl seconds and drop expired responses."""
+        now = time.monotonic()
+        for expired in [k for k, v in self._entries.items() if v[1] < now]:
+            del self._entries[expired]
+            # Responses stored without fetching under the lock, such as the one
+            # kept by the config flow, have no lock to drop
+            lock = self._locks.get(expired)
+            if lock is not None and not lock.locked():
+                del self._locks[expired]
+        self._entries[key] = (now, now + ttl, data)
+
+
+class SharedResponseCache:
+    """Cache API responses in a directory shared by several Home Assistant instances.
+
+    Each entry is a JSON file holding the response and the time it was fetched.
+    Files are replaced atomically, and a lock file per entry lets one instance
+    fetch while the others wait for its result. Waiting happens on the event
+    loop, with one non-blocking attempt at the lock per executor job.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: str) -> None:
+        """Initialize the cache for a directory."""
+        self._hass = hass
+        self.directory = Path(directory)
+
+    async def async_get(self, key: str, max_age: float) -> dict[str, Any] | None:
+        """Return a cached response if it was fetched within max_age seconds."""
+        return await self._hass.async_add_executor_job(self._get, key, max_age)
+
+    async def async_set(self, key: str, data: dict[str, Any]) -> None:
+        """Store a response together with the time it was fetched."""
+        await self._hass.async_add_executor_job(self._set, key, data)
+
+    @asynccontextmanager
+    async def async_lock(self, key: str) -> AsyncIterator[None]:
+        """Hold the lock of a cache entry across instances."""
+        lock_file = await self._async_acquire(key)
+        try:
+            yield
+        finally:
+            if lock_file is not None:
+                await self._hass.async_add_executor_job(self._release, lock_file)
+
+    async def _async_acquire(self, key: str) -> TextIO | None:
+        """Wait for the lock of a cache entry, or None if it cannot be taken.
+
+        A blocking flock cannot be interrupted once its executor job runs, so a
+        waiter cancelled by an unload or the refresh timeout would leave a thread
+        stuck until another instance let go, and then holding a lock nobody
+        releases. Each attempt here returns at once instead, and an attempt that
+        outlives its waiter gives back whatever it took.
+        """
+        lock_file = await self._hass.async_add_executor_job(self._open_lock, key)
+        if lock_file is None:
+            return None
+
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            attempt = self._hass.async_add_executor_job(self._try_lock, lock_file)
+            try:
+                locked = await asyncio.shield(attempt)
+            except asyncio.CancelledError:
+                # The attempt still finishes in its thread, so give back the lock
+                # it may take
+                attempt.add_done_callback(partial(self._async_abandon, lock_file))
+                raise
+            if locked:
+                return lock_file
+
+            if time.monotonic() > deadline:
+                _LOGGER.debug("Timed out waiting for cache entry %s", key)
+                await self._hass.async_add_executor_job(lock_file.close)
+                return None
+            try:
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+            except asyncio.CancelledError:
+                self._hass.async_add_executor_job(lock_file.close)
+                raise
+
+    @callback
+    def _async_abandon(self, lock_file: TextIO, attempt: asyncio.Future) -> None:
+        """Release or close a lock file whose waiter was cancelled."""
+        if attempt.exception() is None and attempt.result():
+            self._hass.async_add_executor_job(self._release, lock_file)
+        else:
+            self._hass.async_add_executor_job(lock_file.close)
+
+    def _get(self, key: str, max_age: float) -> dict[str, Any] | None:
+        try:
+            entry = json_loads(self.directory.joinpath(f"{key}.json").read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            _LOGGER.warning(
+                "Unable to read Pirate Weather cache entry %s: %s", key, err
+            )
+            return None
+
+        if time.time() - entry.get("fetched", 0) > max_age:
+            return None
+        return entry.get("data")
+
+    def _set(self, key: str, data: dict[str, Any]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_utf8_file(
+                str(self.directory.joinpath(f"{key}.json")),
+                json_bytes({"fetched": time.time(), "data": data}),
+                mode="wb",
+            )
+        except (OSError, HomeAssistantError) as err:
+            _LOGGER.warning(
+                "Unable to write Pirate Weather cache entry %s: %s", key, err
+            )
+
+    def _open_lock(self, key: str) -> TextIO | None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            return self.directory.joinpath(f"{key}.lock").open("a")
+        except OSError as err:
+            _LOGGER.warning(
+                "Unable to lock Pirate Weather cache entry %s: %s", key, err
+            )
+            return None
+
+    def _try_lock(self, lock_file: TextIO) -> bool:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _release(self, lock_file: TextIO) -> None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
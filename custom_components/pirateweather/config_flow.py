@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import timedelta
+from http import HTTPStatus
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
@@ -26,18 +27,37 @@ from homeassistant.const import (
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .cache import async_get_response_cache, request_cache_key
 from .const import (
     ALL_CONDITIONS,
+    CONF_AGGREGATES,
+    CONF_CACHE_DIR,
     CONF_ENDPOINT,
+    CONF_FORECAST_SERIES,
+    CONF_FORECAST_STATISTICS,
+    CONF_HORIZON_CUTOFF,
+    CONF_INTERPOLATE_CURRENT,
     CONF_LANGUAGE,
+    CONF_LOCATION_GRID,
     CONF_MODELS,
+    CONF_PUSH_UPDATES,
+    CONF_RULES,
+    CONF_SHARE_FORECAST,
+    CONF_SOLAR_AZIMUTH,
+    CONF_SOLAR_CAPACITY,
+    CONF_SOLAR_TILT,
     CONF_UNITS,
+    CONF_WINDOWS,
+    CONF_WRITE_POLICIES,
     CONFIG_FLOW_VERSION,
     DEFAULT_ENDPOINT,
     DEFAULT_FORECAST_MODE,
+    DEFAULT_HORIZON_CUTOFF,
     DEFAULT_LANGUAGE,
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SOLAR_AZIMUTH,
+    DEFAULT_SOLAR_TILT,
     DEFAULT_UNITS,
     DOMAIN,
     LANGUAGES,
@@ -45,7 +65,9 @@ from .const import (
     PW_PLATFORMS,
     PW_PREVPLATFORM,
     PW_ROUND,
+    SETUP_RESPONSE_TTL,
 )
+from .weather_update_coordinator import build_forecast_url, snap_to_grid
 
 ATTRIBUTION = "Powered by Pirate Weather"
 _LOGGER = logging.getLogger(__name__)
@@ -82,6 +104,7 @@ class PirateWeatherConfigFlow(ConfigFlow, domain=DOMAIN):
                     CONF_LONGITUDE, default=self.hass.config.longitude
                 ): cv.longitude,
                 vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
+                vol.Optional(CONF_INTERPOLATE_CURRENT, default=False): bool,
                 vol.Required(PW_PLATFORM, default=[PW_PLATFORMS[1]]): cv.multi_select(
                     PW_PLATFORMS
                 ),
@@ -91,14 +114,40 @@ class PirateWeatherConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_MODELS, default=""): str,
                 vol.Optional(CONF_FORECAST, default=""): str,
                 vol.Optional(CONF_HOURLY_FORECAST, default=""): str,
+                vol.Optional(CONF_FORECAST_SERIES, default=False): bool,
+                vol.Optional(
+                    CONF_HORIZON_CUTOFF, default=DEFAULT_HORIZON_CUTOFF
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
                 vol.Optional(CONF_MONITORED_CONDITIONS, default=[]): cv.multi_select(
                     ALL_CONDITIONS
                 ),
+                vol.Optional(CONF_FORECAST_STATISTICS, default=[]): cv.multi_select(
+                    ALL_CONDITIONS
+                ),
+                vol.Optional(CONF_AGGREGATES, default=""): str,
+                vol.Optional(CONF_WINDOWS, default=""): str,
+                vol.Optional(CONF_RULES, default=""): str,
+                vol.Optional(CONF_WRITE_POLICIES, default=""): str,
+                vol.Optional(CONF_SOLAR_CAPACITY, default=0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(CONF_SOLAR_TILT, default=DEFAULT_SOLAR_TILT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=90)
+                ),
+                vol.Optional(
+                    CONF_SOLAR_AZIMUTH, default=DEFAULT_SOLAR_AZIMUTH
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=360)),
                 vol.Optional(PW_ROUND, default="No"): vol.In(["Yes", "No"]),
                 vol.Optional(CONF_UNITS, default=DEFAULT_UNITS): vol.In(
                     ["si", "us", "ca", "uk"]
                 ),
                 vol.Optional(CONF_ENDPOINT, default=DEFAULT_ENDPOINT): str,
+                vol.Optional(CONF_PUSH_UPDATES, default=False): bool,
+                vol.Optional(CONF_SHARE_FORECAST, default=False): bool,
+                vol.Optional(CONF_CACHE_DIR, default=""): str,
+                vol.Optional(CONF_LOCATION_GRID, default=0.0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=1)
+                ),
             }
         )
 
@@ -132,7 +181,12 @@ class PirateWeatherConfigFlow(ConfigFlow, domain=DOMAIN):
 
             try:
                 api_status = await _is_pw_api_online(
-                    self.hass, user_input[CONF_API_KEY], latitude, longitude, endpoint
+                    self.hass,
+                    user_input[CONF_API_KEY],
+                    latitude,
+                    longitude,
+                    endpoint,
+                    user_input,
                 )
 
                 if api_status == 403:
@@ -180,6 +234,20 @@ class PirateWeatherConfigFlow(ConfigFlow, domain=DOMAIN):
             config[CONF_FORECAST] = ""
         if CONF_HOURLY_FORECAST not in config:
             config[CONF_HOURLY_FORECAST] = ""
+        if CONF_FORECAST_SERIES not in config:
+            config[CONF_FORECAST_SERIES] = False
+        if CONF_HORIZON_CUTOFF not in config:
+            config[CONF_HORIZON_CUTOFF] = DEFAULT_HORIZON_CUTOFF
+        if CONF_FORECAST_STATISTICS not in config:
+            config[CONF_FORECAST_STATISTICS] = []
+        if CONF_AGGREGATES not in config:
+            config[CONF_AGGREGATES] = ""
+        config.setdefault(CONF_WINDOWS, "")
+        config.setdefault(CONF_RULES, "")
+        config.setdefault(CONF_WRITE_POLICIES, "")
+        config.setdefault(CONF_SOLAR_CAPACITY, 0)
+        config.setdefault(CONF_SOLAR_TILT, DEFAULT_SOLAR_TILT)
+        config.setdefault(CONF_SOLAR_AZIMUTH, DEFAULT_SOLAR_AZIMUTH)
         if CONF_API_KEY not in config:
             config[CONF_API_KEY] = None
         if PW_PLATFORM not in config:
@@ -190,8 +258,18 @@ class PirateWeatherConfigFlow(ConfigFlow, domain=DOMAIN):
             config[PW_ROUND] = "No"
         if CONF_SCAN_INTERVAL not in config:
             config[CONF_SCAN_INTERVAL] = DEFAULT_SCAN_INTERVAL
+        if CONF_INTERPOLATE_CURRENT not in config:
+            config[CONF_INTERPOLATE_CURRENT] = False
         if CONF_ENDPOINT not in config:
             config[CONF_ENDPOINT] = DEFAULT_ENDPOINT
+        if CONF_PUSH_UPDATES not in config:
+            config[CONF_PUSH_UPDATES] = False
+        if CONF_SHARE_FORECAST not in config:
+            config[CONF_SHARE_FORECAST] = False
+        if CONF_CACHE_DIR not in config:
+            config[CONF_CACHE_DIR] = ""
+        if CONF_LOCATION_GRID not in config:
+            config[CONF_LOCATION_GRID] = 0.0
         return await self.async_step_user(config)
 
 
@@ -252,6 +330,13 @@ class PirateWeatherOptionsFlow(OptionsFlow):
                         ),
                     ),
                 ): int,
+                vol.Optional(
+                    CONF_INTERPOLATE_CURRENT,
+                    default=self.config_entry.options.get(
+                        CONF_INTERPOLATE_CURRENT,
+                        self.config_entry.data.get(CONF_INTERPOLATE_CURRENT, False),
+                    ),
+                ): bool,
                 vol.Required(
                     PW_PLATFORM,
                     default=self.config_entry.options.get(
@@ -293,6 +378,22 @@ class PirateWeatherOptionsFlow(OptionsFlow):
                         ),
                     ),
                 ): str,
+                vol.Optional(
+                    CONF_FORECAST_SERIES,
+                    default=self.config_entry.options.get(
+                        CONF_FORECAST_SERIES,
+                        self.config_entry.data.get(CONF_FORECAST_SERIES, False),
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_HORIZON_CUTOFF,
+                    default=self.config_entry.options.get(
+                        CONF_HORIZON_CUTOFF,
+                        self.config_entry.data.get(
+                            CONF_HORIZON_CUTOFF, DEFAULT_HORIZON_CUTOFF
+                        ),
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
                 vol.Optional(
                     CONF_MONITORED_CONDITIONS,
                     default=self.config_entry.options.get(
@@ -300,6 +401,64 @@ class PirateWeatherOptionsFlow(OptionsFlow):
                         self.config_entry.data.get(CONF_MONITORED_CONDITIONS, []),
                     ),
                 ): cv.multi_select(ALL_CONDITIONS),
+                vol.Optional(
+                    CONF_FORECAST_STATISTICS,
+                    default=self.config_entry.options.get(
+                        CONF_FORECAST_STATISTICS,
+                        self.config_entry.data.get(CONF_FORECAST_STATISTICS, []),
+                    ),
+                ): cv.multi_select(ALL_CONDITIONS),
+                vol.Optional(
+                    CONF_AGGREGATES,
+                    default=self.config_entry.options.get(
+                        CONF_AGGREGATES,
+                        self.config_entry.data.get(CONF_AGGREGATES, ""),
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_WINDOWS,
+                    default=self.config_entry.options.get(
+                        CONF_WINDOWS,
+                        self.config_entry.data.get(CONF_WINDOWS, ""),
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_RULES,
+                    default=self.config_entry.options.get(
+                        CONF_RULES,
+                        self.config_entry.data.get(CONF_RULES, ""),
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_WRITE_POLICIES,
+                    default=self.config_entry.options.get(
+                        CONF_WRITE_POLICIES,
+                        self.config_entry.data.get(CONF_WRITE_POLICIES, ""),
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_SOLAR_CAPACITY,
+                    default=self.config_entry.options.get(
+                        CONF_SOLAR_CAPACITY,
+                        self.config_entry.data.get(CONF_SOLAR_CAPACITY, 0),
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_SOLAR_TILT,
+                    default=self.config_entry.options.get(
+                        CONF_SOLAR_TILT,
+                        self.config_entry.data.get(CONF_SOLAR_TILT, DEFAULT_SOLAR_TILT),
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=90)),
+                vol.Optional(
+                    CONF_SOLAR_AZIMUTH,
+                    default=self.config_entry.options.get(
+                        CONF_SOLAR_AZIMUTH,
+                        self.config_entry.data.get(
+                            CONF_SOLAR_AZIMUTH, DEFAULT_SOLAR_AZIMUTH
+                        ),
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=360)),
                 vol.Optional(
                     CONF_UNITS,
                     default=self.config_entry.options.get(
@@ -323,15 +482,65 @@ class PirateWeatherOptionsFlow(OptionsFlow):
                         ),
                     ),
                 ): str,
+                vol.Optional(
+                    CONF_PUSH_UPDATES,
+                    default=self.config_entry.options.get(
+                        CONF_PUSH_UPDATES,
+                        self.config_entry.data.get(CONF_PUSH_UPDATES, False),
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_SHARE_FORECAST,
+                    default=self.config_entry.options.get(
+                        CONF_SHARE_FORECAST,
+                        self.config_entry.data.get(CONF_SHARE_FORECAST, False),
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_CACHE_DIR,
+                    default=str(
+                        self.config_entry.options.get(
+                            CONF_CACHE_DIR,
+                            self.config_entry.data.get(CONF_CACHE_DIR, ""),
+                        ),
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_LOCATION_GRID,
+                    default=self.config_entry.options.get(
+                        CONF_LOCATION_GRID,
+                        self.config_entry.data.get(CONF_LOCATION_GRID, 0.0),
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
             }
         )
 
 
-async def _is_pw_api_online(hass, api_key, lat, lon, endpoint):
-    forecast_string = (
-        endpoint + "/forecast/" + api_key + "/" + str(lat) + "," + str(lon)
+async def _is_pw_api_online(hass, api_key, lat, lon, endpoint, user_input):  # noqa: PLR0917
+    """Request the forecast of a new entry and return the HTTP status.
+
+    The request matches the one the entry's coordinator makes, so a valid
+    response is kept in the response cache and reused for the first refresh.
+    A minimal request excluding every block would save nothing, as the entry
+    is created and refreshed right after a successful validation.
+    """
+    location_grid = user_input.get(CONF_LOCATION_GRID)
+    forecast_string = build_forecast_url(
+        endpoint,
+        api_key,
+        snap_to_grid(lat or hass.config.latitude, location_grid),
+        snap_to_grid(lon or hass.config.longitude, location_grid),
+        user_input.get(CONF_UNITS) or "si",
+        user_input.get(CONF_LANGUAGE) or DEFAULT_LANGUAGE,
+        user_input.get(CONF_MODELS),
     )
 
     session = async_get_clientsession(hass)
     async with session.get(forecast_string) as resp:
+        if resp.status == HTTPStatus.OK:
+            async_get_response_cache(hass).set(
+                request_cache_key(forecast_string, api_key),
+                await resp.json(),
+                SETUP_RESPONSE_TTL,
+            )
         return resp.status
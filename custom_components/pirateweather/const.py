@@ -33,15 +33,35 @@ DEFAULT_LANGUAGE = "en"
 DEFAULT_UNITS = "us"
 DEFAULT_SCAN_INTERVAL = 1200
 DEFAULT_ENDPOINT = "https://api.pirateweather.net"
+DEFAULT_HORIZON_CUTOFF = 24
+DEFAULT_SOLAR_TILT = 30
+DEFAULT_SOLAR_AZIMUTH = 180
 ATTRIBUTION = "Data provided by Pirate Weather GUI"
 MANUFACTURER = "PirateWeather"
 CONF_LANGUAGE = "language"
 CONF_UNITS = "units"
 CONF_ENDPOINT = "endpoint"
 CONF_MODELS = "models"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_SHARE_FORECAST = "share_forecast"
+CONF_CACHE_DIR = "cache_dir"
+CONF_LOCATION_GRID = "location_grid"
+CONF_FORECAST_SERIES = "forecast_series"
+CONF_HORIZON_CUTOFF = "horizon_cutoff"
+CONF_FORECAST_STATISTICS = "forecast_statistics"
+CONF_INTERPOLATE_CURRENT = "interpolate_current"
+CONF_AGGREGATES = "aggregates"
+CONF_WINDOWS = "windows"
+CONF_RULES = "rules"
+CONF_WRITE_POLICIES = "write_policies"
+CONF_SOLAR_CAPACITY = "solar_capacity"
+CONF_SOLAR_TILT = "solar_tilt"
+CONF_SOLAR_AZIMUTH = "solar_azimuth"
 CONFIG_FLOW_VERSION = 2
 ENTRY_NAME = "name"
 ENTRY_WEATHER_COORDINATOR = "weather_coordinator"
+ENTRY_RECONFIGURE = "reconfigure"
+ENTRY_RULE_ENGINE = "rule_engine"
 ATTR_API_PRECIPITATION = "precipitation"
 ATTR_API_PRECIPITATION_KIND = "precipitation_kind"
 ATTR_API_DATETIME = "datetime"
@@ -63,10 +83,36 @@ ATTR_API_FORECAST = "forecast"
 UPDATE_LISTENER = "update_listener"
 PLATFORMS = [Platform.SENSOR, Platform.WEATHER]
 PW_PLATFORMS = ["Sensor", "Weather"]
+# Set up for entries with rules, whichever platforms are selected
+RULE_PLATFORMS = [Platform.BINARY_SENSOR]
 PW_PLATFORM = "pw_platform"
 PW_PREVPLATFORM = "pw_prevplatform"
 PW_ROUND = "pw_round"
 
+# When forecasts are pushed to the integration, polling only acts as a safety net
+PUSH_FALLBACK_SCAN_INTERVAL = 10800
+
+# Seconds a response fetched while setting up an entry is kept for its first refresh
+SETUP_RESPONSE_TTL = 300
+
+# Fired when a forecast rule turns on or off
+EVENT_RULE = "pirateweather_rule"
+
+# Seconds between local updates of interpolated current conditions
+INTERPOLATION_INTERVAL = 60
+
+# Current condition fields advanced between polls, with the smallest change in
+# API units that is worth writing
+INTERPOLATED_FIELDS = {
+    "temperature": 0.1,
+    "apparentTemperature": 0.1,
+    "humidity": 0.01,
+    "windSpeed": 0.1,
+    "windGust": 0.1,
+    "pressure": 0.1,
+    "precipIntensity": 0.001,
+}
+
 ATTR_FORECAST_CLOUD_COVERAGE = "cloud_coverage"
 ATTR_FORECAST_HUMIDITY = "humidity"
 ATTR_FORECAST_NATIVE_VISIBILITY = "native_visibility"
@@ -82,6 +128,16 @@ FORECAST_MODES = [
 
 DEFAULT_FORECAST_MODE = FORECAST_MODE_DAILY
 
+FORECAST_BLOCKS = [
+    "currently",
+    "minutely",
+    "hourly",
+    "day_night",
+    "daily",
+    "alerts",
+    "flags",
+]
+
 FORECASTS_HOURLY = "forecasts_hourly"
 FORECASTS_DAILY = "forecasts_daily"
 
@@ -95,6 +151,12 @@ ALL_CONDITIONS = {
     "temperature": "Temperature",
     "apparent_temperature": "Apparent Temperature",
     "dew_point": "Dew Point",
+    "heat_index": "Heat Index",
+    "wind_chill": "Wind Chill",
+    "humidex": "Humidex",
+    "wet_bulb": "Wet Bulb Temperature",
+    "heating_degree_hours": "Heating Degree Hours",
+    "cooling_degree_hours": "Cooling Degree Hours",
     "humidity": "Humidity",
     "wind_speed": "Wind Speed",
     "wind_gust": "Wind Gust",
@@ -104,6 +166,12 @@ ALL_CONDITIONS = {
     "visibility": "Visibility",
     "ozone": "Ozone",
     "minutely_summary": "Minutely Summary",
+    "solar_energy_today": "Solar Energy Today",
+    "solar_energy_tomorrow": "Solar Energy Tomorrow",
+    "nowcast_onset": "Precipitation Onset",
+    "nowcast_end": "Precipitation End",
+    "nowcast_peak_intensity": "Next Hour Peak Precipitation Intensity",
+    "nowcast_accumulation": "Next Hour Precipitation Accumulation",
     "hourly_summary": "Hourly Summary",
     "daily_summary": "Daily Summary",
     "temperature_high": "Temperature High",
@@ -0,0 +1,207 @@
+"""Comfort and agronomic indices derived from the forecast."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .forecast_models import Forecast
+
+# Fields added to the currently, hourly and daily data of every forecast
+DERIVED_FIELDS = (
+    "heatIndex",
+    "windChill",
+    "humidex",
+    "wetBulb",
+    "heatingDegreeHours",
+    "coolingDegreeHours",
+)
+
+# Fields each block derives from: the temperature for heat indices, the
+# temperature for cold indices and the hours each point covers. Daily points
+# use their high and low, and their mean for the degree hours.
+DERIVED_INPUTS = {
+    "currently": ("temperature", "temperature", 1),
+    "hourly": ("temperature", "temperature", 1),
+    "daily": ("temperatureHigh", "temperatureLow", 24),
+}
+
+# Temperature scale and km/h per wind speed unit of each unit system
+UNIT_SYSTEMS = {
+    "si": ("C", 3.6),
+    "us": ("F", 1.609344),
+    "ca": ("C", 1.0),
+    "uk": ("C", 1.609344),
+    "uk2": ("C", 1.609344),
+}
+
+# Base temperature of the degree hours in each temperature scale
+DEGREE_HOURS_BASE = {"C": 18.0, "F": 65.0}
+
+
+def derive_fields(forecast: Forecast, units: str) -> None:
+    """Add the derived indices to the currently, hourly and daily data.
+
+    Every index of a block is computed in a single pass over its columns.
+    Indices are None where an input is missing. They are added fields of the
+    forecast rather than part of its API document, and blocks the indices
+    were already added to are skipped, so deriving a forecast again does
+    nothing.
+    """
+    scale, wind_factor = UNIT_SYSTEMS.get(units, UNIT_SYSTEMS["si"])
+    for key, (warm_field, cold_field, hours) in DERIVED_INPUTS.items():
+        if not forecast.added_fields(key).isdisjoint(DERIVED_FIELDS):
+            continue
+
+        names = (warm_field, cold_field, "humidity", "dewPoint", "windSpeed")
+        if key == "currently":
+            point = forecast.currently()
+            inputs = [[point.get(name)] for name in names]
+        else:
+            block = getattr(forecast, key)()
+            if not block.data:
+                continue
+            inputs = [block.column(name) for name in names]
+
+        columns: dict[str, list[float | None]] = {name: [] for name in DERIVED_FIELDS}
+        for warm, cold, humidity, dew_point, wind_speed in zip(*inputs, strict=True):
+            for name, value in zip(
+                DERIVED_FIELDS,
+                _derive(
+                    _known(warm),
+                    _known(cold),
+                    _known(humidity),
+                    _known(dew_point),
+                    _known(wind_speed),
+                    scale,
+                    wind_factor,
+                    hours,
+                ),
+                strict=True,
+            ):
+                columns[name].append(value)
+        forecast.add_fields(key, columns)
+
+
+def _derive(  # noqa: PLR0917
+    warm: float | None,
+    cold: float | None,
+    humidity: float | None,
+    dew_point: float | None,
+    wind_speed: float | None,
+    scale: str,
+    wind_factor: float,
+    hours: int,
+) -> tuple[float | None, ...]:
+    """Return the derived indices of one data point in the entry's units."""
+    warm_c = _to_celsius(warm, scale)
+    cold_c = _to_celsius(cold, scale)
+
+    heat = None
+    humid = None
+    wet_bulb = None
+    if warm_c is not None and humidity is not None:
+        heat = heat_index(warm_c, humidity)
+        wet_bulb = wet_bulb_temperature(warm_c, humidity)
+    if warm_c is not None and dew_point is not None:
+        humid = humidex(warm_c, _to_celsius(dew_point, scale))
+
+    chill = None
+    if cold_c is not None and wind_speed is not None:
+        chill = wind_chill(cold_c, wind_speed * wind_factor)
+
+    heating = cooling = None
+    if warm is not None and cold is not None:
+        mean = (warm + cold) / 2
+        base = DEGREE_HOURS_BASE[scale]
+        heating = round(max(base - mean, 0) * hours, 2)
+        cooling = round(max(mean - base, 0) * hours, 2)
+
+    return (
+        _from_celsius(heat, scale),
+        _from_celsius(chill, scale),
+        _from_celsius(humid, scale),
+        _from_celsius(wet_bulb, scale),
+        heating,
+        cooling,
+    )
+
+
+def heat_index(temperature: float, humidity: float) -> float:
+    """Return the NWS heat index in °C for a temperature in °C and humidity 0-1."""
+    t = temperature * 9 / 5 + 32
+    rh = humidity * 100
+    index = 0.5 * (t + 61 + (t - 68) * 1.2 + rh * 0.094)
+    if (index + t) / 2 >= 80:
+        index = (
+            -42.379
+            + 2.04901523 * t
+            + 10.14333127 * rh
+            - 0.22475541 * t * rh
+            - 0.00683783 * t * t
+            - 0.05481717 * rh * rh
+            + 0.00122874 * t * t * rh
+            + 0.00085282 * t * rh * rh
+            - 0.00000199 * t * t * rh * rh
+        )
+        if rh < 13 and 80 <= t <= 112:
+            index -= (13 - rh) / 4 * math.sqrt((17 - abs(t - 95)) / 17)
+        elif rh > 85 and 80 <= t <= 87:
+            index += (rh - 85) / 10 * ((87 - t) / 5)
+    return (index - 32) * 5 / 9
+
+
+def wind_chill(temperature: float, wind_speed: float) -> float:
+    """Return the wind chill in °C for a temperature in °C and wind in km/h.
+
+    The index is only defined at or below 10 °C with wind above 4.8 km/h, and
+    is the temperature otherwise.
+    """
+    if temperature > 10 or wind_speed <= 4.8:
+        return temperature
+    factor = wind_speed**0.16
+    return 13.12 + 0.6215 * temperature - 11.37 * factor + 0.3965 * temperature * factor
+
+
+def humidex(temperature: float, dew_point: float) -> float:
+    """Return the humidex for a temperature and dew point in °C."""
+    vapour_pressure = 6.11 * math.exp(
+        5417.7530 * (1 / 273.16 - 1 / (273.15 + dew_point))
+    )
+    return temperature + 0.5555 * (vapour_pressure - 10)
+
+
+def wet_bulb_temperature(temperature: float, humidity: float) -> float:
+    """Return the Stull wet-bulb temperature in °C for °C and humidity 0-1."""
+    rh = humidity * 100
+    return (
+        temperature * math.atan(0.151977 * math.sqrt(rh + 8.313659))
+        + math.atan(temperature + rh)
+        - math.atan(rh - 1.676331)
+        + 0.00391838 * rh**1.5 * math.atan(0.023101 * rh)
+        - 4.686035
+    )
+
+
+def _known(value: Any) -> float | None:
+    """Return a number, or None for missing values and the -999 sentinel."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value == -999:
+        return None
+    return value
+
+
+def _to_celsius(value: float | None, scale: str) -> float | None:
+    """Convert a temperature of the entry's scale to °C."""
+    if value is None or scale == "C":
+        return value
+    return (value - 32) * 5 / 9
+
+
+def _from_celsius(value: float | None, scale: str) -> float | None:
+    """Convert a temperature in °C to the entry's scale, rounded to 0.01."""
+    if value is None:
+        return None
+    if scale == "F":
+        value = value * 9 / 5 + 32
+    return round(value, 2)
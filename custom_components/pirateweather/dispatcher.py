@@ -0,0 +1,427 @@
+"""Central state write handling for Pirate Weather sensors."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .aggregates import PrefixAggregates
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .aggregates import AggregateWindow
+    from .forecast_models import (
+        Alert,
+        Forecast,
+        PirateWeatherDataBlock,
+        PirateWeatherDataPoint,
+        PirateWeatherFlagsBlock,
+    )
+    from .sensor import PirateWeatherSensor
+    from .weather_update_coordinator import WeatherUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Forecast sensors at or beyond these offsets are written at most once per
+# far horizon interval, since their values rarely change in a meaningful way
+FAR_HORIZON_HOURS = 24
+FAR_HORIZON_DAYS = 2
+
+# Sensors written before yielding to the event loop during a dispatch
+DISPATCH_CHUNK_SIZE = 50
+
+
+@dataclass(frozen=True, slots=True)
+class WritePolicy:
+    """Decide when a new sensor value is worth writing to the state machine.
+
+    A numeric change is written when it exceeds the absolute deadband or the
+    relative deadband (a fraction of the last written value). Without deadbands
+    any change is written. Far horizon forecast sensors are written at most once
+    per min_interval, and every sensor is written at least once per max_interval.
+    """
+
+    absolute: float | None = None
+    relative: float | None = None
+    min_interval: float = 3600
+    max_interval: float = 21600
+
+    def should_write(
+        self, previous: Any, value: Any, elapsed: float, far_horizon: bool
+    ) -> bool:
+        """Return whether value should replace the previously written value."""
+        if elapsed >= self.max_interval:
+            return True
+        if far_horizon and elapsed < self.min_interval:
+            return False
+        if value == previous:
+            return False
+
+        numeric = (int, float)
+        if (
+            not isinstance(value, numeric)
+            or not isinstance(previous, numeric)
+            or (self.absolute is None and self.relative is None)
+        ):
+            return True
+
+        change = abs(value - previous)
+        if self.absolute is not None and change >= self.absolute:
+            return True
+        return self.relative is not None and change >= self.relative * abs(previous)
+
+
+DEFAULT_WRITE_POLICY = WritePolicy()
+
+# Settings of a write policy that can be changed in the options
+WRITE_POLICY_SETTINGS = ("absolute", "relative", "min_interval", "max_interval")
+
+# Policies by monitored condition, falling back to the sensor's device class
+WRITE_POLICIES: dict[str, WritePolicy] = {
+    SensorDeviceClass.TEMPERATURE: WritePolicy(absolute=0.1),
+    SensorDeviceClass.HUMIDITY: WritePolicy(absolute=1),
+    SensorDeviceClass.PRESSURE: WritePolicy(absolute=0.1),
+    SensorDeviceClass.WIND_SPEED: WritePolicy(absolute=0.1),
+    SensorDeviceClass.PRECIPITATION: WritePolicy(absolute=0.001, relative=0.05),
+    SensorDeviceClass.PRECIPITATION_INTENSITY: WritePolicy(
+        absolute=0.001, relative=0.05
+    ),
+    "wind_bearing": WritePolicy(absolute=5),
+    "cloud_cover": WritePolicy(absolute=1),
+    "visibility": WritePolicy(absolute=0.1),
+    "ozone": WritePolicy(absolute=1),
+    "nearest_storm_distance": WritePolicy(relative=0.05),
+    "nearest_storm_bearing": WritePolicy(absolute=5),
+    "solar": WritePolicy(absolute=1),
+    "cape": WritePolicy(absolute=10),
+}
+
+
+def get_write_policy(
+    condition: str,
+    device_class: str | None,
+    overrides: dict[str, WritePolicy] | None = None,
+) -> WritePolicy:
+    """Return the write policy for a monitored condition.
+
+    Policies of the condition, overridden or not, come before the policies of
+    its device class.
+    """
+    overrides = overrides or {}
+    for key in (condition, device_class):
+        if key in overrides:
+            return overrides[key]
+        if key in WRITE_POLICIES:
+            return WRITE_POLICIES[key]
+    return DEFAULT_WRITE_POLICY
+
+
+def parse_write_policies(value: str | None) -> dict[str, WritePolicy]:
+    """Parse comma separated write policy overrides.
+
+    An override is a condition or device class followed by the settings it
+    changes, ex. 'temperature:absolute=0.5,precipitation:relative=0.1'.
+    Settings left out keep the default policy of the condition or device
+    class. Invalid overrides are logged and skipped.
+    """
+    policies = {}
+    for definition in (value or "").split(","):
+        if not definition.strip():
+            continue
+        try:
+            key, policy = _parse_write_policy(definition)
+        except ValueError as err:
+            _LOGGER.warning("Ignoring write policy %s: %s", definition.strip(), err)
+            continue
+        policies[key] = policy
+    return policies
+
+
+def _parse_write_policy(definition: str) -> tuple[str, WritePolicy]:
+    """Parse one write policy override."""
+    key, *parts = [part.strip() for part in definition.split(":")]
+    if not key or not parts:
+        raise ValueError("expected key:setting=value[:setting=value]")
+
+    settings = {}
+    for part in parts:
+        setting, _, number = part.partition("=")
+        setting = setting.strip()
+        if setting not in WRITE_POLICY_SETTINGS:
+            raise ValueError(
+                f"setting must be one of {', '.join(WRITE_POLICY_SETTINGS)}"
+            )
+        settings[setting] = float(number)
+        if settings[setting] < 0:
+            raise ValueError(f"{setting} cannot be negative")
+
+    return key, replace(WRITE_POLICIES.get(key, DEFAULT_WRITE_POLICY), **settings)
+
+
+class ForecastBlocks:
+    """Blocks of a forecast, each looked up at most once per coordinator update.
+
+    Sensors read the blocks from here instead of navigating the forecast
+    themselves, so blocks such as flags are only built once for all sensors.
+    """
+
+    def __init__(self, forecast: Forecast) -> None:
+        """Initialize the blocks of a forecast."""
+        self.forecast = forecast
+        # Row of the hourly or daily point covering the current time
+        self._base_rows: dict[str, int] = {}
+        # Prefix aggregates of hourly fields counted from the hourly base row
+        self._aggregates: dict[str, PrefixAggregates] = {}
+
+    @cached_property
+    def currently(self) -> PirateWeatherDataPoint:
+        """Return the currently data point."""
+        return self.forecast.currently()
+
+    @cached_property
+    def minutely(self) -> PirateWeatherDataBlock:
+        """Return the minutely data block."""
+        return self.forecast.minutely()
+
+    @cached_property
+    def hourly(self) -> PirateWeatherDataBlock:
+        """Return the hourly data block."""
+        return self.forecast.hourly()
+
+    @cached_property
+    def daily(self) -> PirateWeatherDataBlock:
+        """Return the daily data block."""
+        return self.forecast.daily()
+
+    @cached_property
+    def flags(self) -> PirateWeatherFlagsBlock:
+        """Return the flags block."""
+        return self.forecast.flags()
+
+    @property
+    def alerts(self) -> list[Alert]:
+        """Return the alerts."""
+        return self.forecast.alerts()
+
+    def base_row(self, block: str) -> int:
+        """Return the row relative hourly or daily sensors count from.
+
+        Relative sensors are indexed against the wall clock rather than the first
+        point of the payload, so they stay correct between polls.
+        """
+        if block not in self._base_rows:
+            self._base_rows[block] = max(getattr(self, block).row_at(time.time()), 0)
+        return self._base_rows[block]
+
+    def rebase(self, now: float) -> set[str]:
+        """Move the base rows to the current time and return the blocks that moved."""
+        moved = set()
+        for block, row in self._base_rows.items():
+            new_row = max(getattr(self, block).row_at(now), 0)
+            if new_row != row:
+                self._base_rows[block] = new_row
+                moved.add(block)
+        if "hourly" in moved:
+            self._aggregates.clear()
+        return moved
+
+    def aggregate(self, field: str, window: AggregateWindow) -> float | None:
+        """Return the aggregate of an hourly field over a window from this hour.
+
+        The prefix reductions of a field are computed once, so every window over
+        the field costs a single lookup.
+        """
+        if (prefixes := self._aggregates.get(field)) is None:
+            base = self.base_row("hourly")
+            prefixes = PrefixAggregates(self.hourly.column(field)[base:])
+            self._aggregates[field] = prefixes
+        return prefixes.reduce(window)
+
+    def next_rollover(self, blocks: set[str], now: float) -> int | None:
+        """Return the unix time the base row of one of the blocks next moves."""
+        times = [
+            next_time
+            for block in blocks
+            if (next_time := getattr(self, block).next_time(now)) is not None
+        ]
+        return min(times, default=None)
+
+
+class SensorDispatcher:
+    """Write the sensors of a config entry after each coordinator update.
+
+    One coordinator listener serves every sensor of the entry. The forecast
+    blocks are parsed once for all sensors, each sensor's write policy decides
+    whether its new value is written, and large entries are written in chunks
+    that yield to the event loop in between. When the current hour or day
+    rolls over between polls, only the relative forecast sensors are rewritten.
+    """
+
+    def __init__(
+        self,
+        coordinator: WeatherUpdateCoordinator,
+        write_policies: dict[str, WritePolicy] | None = None,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.coordinator = coordinator
+        # Write policies of the options, by condition or device class
+        self.write_policies = write_policies or {}
+        self._sensors: dict[str, PirateWeatherSensor] = {}
+        self._blocks: ForecastBlocks | None = None
+        self._dispatch_task: asyncio.Task | None = None
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+        self._unsub_current: CALLBACK_TYPE | None = None
+
+    @property
+    def blocks(self) -> ForecastBlocks:
+        """Return the parsed blocks of the current coordinator data."""
+        data = self.coordinator.data
+        if self._blocks is None or self._blocks.forecast is not data:
+            self._blocks = ForecastBlocks(data)
+        return self._blocks
+
+    def get_sensor(self, unique_id: str) -> PirateWeatherSensor | None:
+        """Return the sensor added to Home Assistant with a unique ID."""
+        return self._sensors.get(unique_id)
+
+    @callback
+    def async_add_sensor(self, sensor: PirateWeatherSensor) -> Callable[[], None]:
+        """Start dispatching updates to a sensor and return a remove callback."""
+        self._sensors[sensor.unique_id] = sensor
+        if sensor.relative_block is not None and self._unsub_rollover is None:
+            self._async_schedule_rollover()
+        if sensor.interpolated and self._unsub_current is None:
+            self._unsub_current = self.coordinator.async_add_current_listener(
+                self._async_update_current
+            )
+
+        @callback
+        def remove_sensor() -> None:
+            self._sensors.pop(sensor.unique_id, None)
+
+        return remove_sensor
+
+    @callback
+    def async_update(self) -> None:
+        """Write every sensor whose write policy accepts its new value."""
+        # A newer update supersedes a dispatch that is still in progress
+        if self._dispatch_task is not None and not self._dispatch_task.done():
+            self._dispatch_task.cancel()
+        self._dispatch_task = None
+        self._async_schedule_rollover()
+
+        sensors = list(self._sensors.values())
+        if len(sensors) <= DISPATCH_CHUNK_SIZE:
+            written = self._write_chunk(sensors, time.monotonic())
+            _LOGGER.debug("Wrote %s of %s sensors", written, len(sensors))
+            return
+
+        self._dispatch_task = self.coordinator.config_entry.async_create_task(
+            self.coordinator.hass,
+            self._async_dispatch(sensors),
+            "pirateweather sensor dispatch",
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop rewriting sensors between coordinator updates."""
+        self.async_cancel_rollover()
+        if self._unsub_current is not None:
+            self._unsub_current()
+            self._unsub_current = None
+
+    @callback
+    def async_cancel_rollover(self) -> None:
+        """Stop rewriting relative sensors when the hour or day rolls over."""
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+
+    @callback
+    def _async_schedule_rollover(self) -> None:
+        """Schedule the next rewrite of the relative sensors."""
+        self.async_cancel_rollover()
+        relative_blocks = {
+            sensor.relative_block
+            for sensor in self._sensors.values()
+            if sensor.relative_block is not None
+        }
+        if not relative_blocks or self.coordinator.data is None:
+            return
+
+        blocks = self.blocks
+        for block in relative_blocks:
+            blocks.base_row(block)
+        if (next_time := blocks.next_rollover(relative_blocks, time.time())) is None:
+            return
+
+        self._unsub_rollover = async_track_point_in_utc_time(
+            self.coordinator.hass,
+            self._async_rollover,
+            dt_util.utc_from_timestamp(next_time),
+        )
+
+    @callback
+    def _async_rollover(self, now: datetime) -> None:
+        """Write the relative sensors of the blocks whose current point moved.
+
+        Like coordinator updates, only the sensors whose write policy accepts the
+        new value are written.
+        """
+        self._unsub_rollover = None
+        moved = self.blocks.rebase(now.timestamp())
+        written_at = time.monotonic()
+        written = 0
+        for sensor in list(self._sensors.values()):
+            if sensor.relative_block in moved and sensor.async_update_state(
+                written_at
+            ):
+                written += 1
+        _LOGGER.debug("Wrote %s sensors after the forecast rolled over", written)
+        self._async_schedule_rollover()
+
+    @callback
+    def _async_update_current(self) -> None:
+        """Write the current condition sensors the coordinator interpolated."""
+        now = time.monotonic()
+        written = 0
+        for sensor in list(self._sensors.values()):
+            if sensor.interpolated and sensor.async_update_state(now):
+                written += 1
+        _LOGGER.debug("Wrote %s interpolated current condition sensors", written)
+
+    async def _async_dispatch(self, sensors: list[PirateWeatherSensor]) -> None:
+        """Write sensors in chunks, yielding to the event loop between chunks."""
+        now = time.monotonic()
+        written = 0
+        for start in range(0, len(sensors), DISPATCH_CHUNK_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            written += self._write_chunk(
+                sensors[start : start + DISPATCH_CHUNK_SIZE], now
+            )
+        _LOGGER.debug("Wrote %s of %s sensors", written, len(sensors))
+
+    @callback
+    def _write_chunk(self, sensors: list[PirateWeatherSensor], now: float) -> int:
+        """Write the sensors of a chunk that need it and return how many were."""
+        written = 0
+        for sensor in sensors:
+            # Skip sensors removed while an earlier chunk was yielding
+            if self._sensors.get(sensor.unique_id) is not sensor:
+                continue
+            if sensor.should_write(now):
+                sensor.async_write_ha_state()
+                written += 1
+        return written
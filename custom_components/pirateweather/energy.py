@@ -0,0 +1,20 @@
+"""Energy platform for the Pirate Weather solar production forecast."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, ENTRY_WEATHER_COORDINATOR
+
+
+async def async_get_solar_forecast(
+    hass: HomeAssistant, config_entry_id: str
+) -> dict[str, dict[str, float | int]] | None:
+    """Return the solar production forecast of an entry for the Energy dashboard."""
+    if (domain_data := hass.data.get(DOMAIN, {}).get(config_entry_id)) is None:
+        return None
+
+    coordinator = domain_data[ENTRY_WEATHER_COORDINATOR]
+    if (solar_forecast := coordinator.solar_forecast()) is None:
+        return None
+    return {"wh_hours": solar_forecast.wh_hours}
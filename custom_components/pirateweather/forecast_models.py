@@ -1,6 +1,10 @@
 """Taken from the fantastic Dark Sky library: https://github.com/ZeevG/python-forecast.io in October 2024. Updated in April 2025 using the Pirate Weather library: https://github.com/cloneofghosts/python-pirate-weather."""
 
 import datetime
+import sys
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
 
 import requests
 
@@ -8,6 +12,8 @@ import requests
 class UnicodeMixin:
     """Provide string representation for Python 2/3 compatibility."""
 
+    __slots__ = ()
+
     def __str__(self):
         """Return the unicode representation of the object for Python 2/3 compatibility."""
         return self.__unicode__()
@@ -15,24 +21,135 @@ class UnicodeMixin:
 
 """Models used in the Pirate Weather library."""
 
+# Blocks holding a list of data points
+DATA_BLOCKS = ("minutely", "hourly", "day_night", "daily")
+
+# Fields holding a compass bearing in degrees, which wrap at 360 so that halfway
+# from 350 to 10 degrees is 0 rather than 180
+CIRCULAR_FIELDS = frozenset({"windBearing", "nearestStormBearing"})
+
+
+@lru_cache(maxsize=64)
+def _field_index(fields):
+    """Return the position of each field, shared by points with the same layout."""
+    return {name: index for index, name in enumerate(fields)}
+
+
+def _compact(value, memo):
+    """Return a shared copy of a repeated string or float value."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, float):
+        return memo.setdefault(value, value)
+    return value
+
+
+def _column(values, memo):
+    """Pack the values of a field across a block into a compact column.
+
+    Fields that only hold floats or only hold integers are packed into arrays
+    without changing their type. Any other field is kept as a tuple.
+    """
+    for typecode, kind in (("d", float), ("q", int)):
+        if all(type(value) is kind for value in values):
+            try:
+                return array(typecode, values)
+            except OverflowError:
+                break
+    return tuple(_compact(value, memo) for value in values)
+
+
+def _is_number(value):
+    """Return if a value can be interpolated."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _interpolated(name):
+    """Return if a field varies between data points rather than holding a time.
+
+    Timestamps such as sunriseTime keep the value of the point before, since a
+    time between two sunrises is not a sunrise.
+    """
+    return name != "time" and not name.endswith("Time")
+
+
+def _interpolate(name, before, after, fraction):
+    """Return the value of a field a fraction of the way between two points.
+
+    Bearings turn along the shortest arc and are wrapped to 0-360 degrees.
+    """
+    if name in CIRCULAR_FIELDS:
+        turn = (after - before + 180) % 360 - 180
+        return (before + turn * fraction) % 360
+    return before + (after - before) * fraction
+
+
+def _missing_to_none(value):
+    """Return None for the -999 value the API uses for missing numbers."""
+    return None if _is_number(value) and value == -999 else value
+
+
+def _timestamp(value):
+    """Convert a unix timestamp to a timezone aware datetime."""
+    if value is None:
+        return None
+    return datetime.datetime.fromtimestamp(int(value), datetime.UTC)
+
+
+def _parse_block(key, value, memo):
+    """Parse a forecast block into data points, leaving other values as they are."""
+    if key == "currently":
+        return PirateWeatherDataPoint(value, memo)
+    if key in DATA_BLOCKS:
+        return PirateWeatherDataBlock(value, memo)
+    return value
+
 
 class Forecast(UnicodeMixin):
-    """Represent the forecast data and provide methods to access weather blocks."""
+    """Represent the forecast data and provide methods to access weather blocks.
+
+    Blocks are parsed into compact data points once, and the JSON document is
+    only rebuilt when it is needed again. Fields the integration adds to the
+    data are kept out of the rebuilt document.
+    """
+
+    __slots__ = ("_added", "_alerts", "_document", "http_headers", "response")
 
     def __init__(self, data, response, headers):
         """Initialize the Forecast with data, HTTP response, and headers."""
         self.response = response
         self.http_headers = headers
-        self.json = data
+        self._load(data)
+
+    def _load(self, data):
+        """Parse a forecast document."""
+        # Equal floats are shared between the points of a forecast
+        memo = {}
+        self._added = {}
+        self._document = {
+            key: _parse_block(key, value, memo) for key, value in data.items()
+        }
+        self._alerts = [
+            Alert(alert_json) for alert_json in self._document.get("alerts", [])
+        ]
+
+    @property
+    def json(self):
+        """Return the forecast as the API's JSON document.
 
-        self._alerts = []
-        for alert_json in self.json.get("alerts", []):
-            self._alerts.append(Alert(alert_json))
+        Fields added with add_fields are left out.
+        """
+        return {
+            key: value.as_dict(self.added_fields(key))
+            if isinstance(value, (PirateWeatherDataPoint, PirateWeatherDataBlock))
+            else value
+            for key, value in self._document.items()
+        }
 
     def update(self):
         """Update the forecast data by making a new request to the same URL."""
         r = requests.get(self.response.url)
-        self.json = r.json()
+        self._load(r.json())
         self.response = r
 
     def currently(self):
@@ -61,17 +178,89 @@ class Forecast(UnicodeMixin):
 
     def offset(self):
         """Return the time zone offset for the forecast location."""
-        return self.json["offset"]
+        return self._document["offset"]
 
     def alerts(self):
         """Return the list of alerts issued for this forecast."""
         return self._alerts
 
+    def currently_at(self, timestamp, fields):
+        """Return the current conditions advanced to a unix time.
+
+        Each numeric field is interpolated from the currently point towards the
+        next minutely or hourly point that has it, and then along that block.
+        Other fields keep their currently values.
+        """
+        currently = self.currently()
+        start = currently.utime
+        if start is None or timestamp <= start:
+            return currently
+
+        values = currently.as_dict()
+        for field in fields:
+            value = values.get(field)
+            if not _is_number(value) or value == -999 or not _interpolated(field):
+                continue
+
+            for name in ("minutely", "hourly"):
+                block = self._document.get(name)
+                if not isinstance(block, PirateWeatherDataBlock) or not any(
+                    field in point for point in block.data[:1]
+                ):
+                    continue
+
+                next_time = block.next_time(start)
+                if next_time is None:
+                    continue
+
+                if timestamp >= next_time:
+                    new_value = block.value_at(field, timestamp)
+                else:
+                    target = block.value_at(field, next_time)
+                    new_value = None
+                    if _is_number(target):
+                        fraction = (timestamp - start) / (next_time - start)
+                        new_value = _interpolate(field, value, target, fraction)
+
+                # Past the end of the minutely block the hourly block takes over
+                if new_value is not None:
+                    values[field] = new_value
+                    break
+
+        return PirateWeatherDataPoint(values)
+
+    def add_fields(self, key, columns):
+        """Add fields to the currently point or to every point of a block.
+
+        Columns hold the values of each field in row order. Fields the data
+        already has are left as they are, and the added fields are not part of
+        the JSON document.
+        """
+        value = self._document.get(key)
+        if isinstance(value, PirateWeatherDataPoint):
+            added = {
+                name: column[0] for name, column in columns.items() if name not in value
+            }
+            if added:
+                self._document[key] = PirateWeatherDataPoint(
+                    {**value.as_dict(), **added}
+                )
+        elif isinstance(value, PirateWeatherDataBlock):
+            added = value.add_columns(columns)
+        else:
+            return
+        self._added[key] = self.added_fields(key) | frozenset(added)
+
+    def added_fields(self, key):
+        """Return the names of the fields added to the currently point or a block."""
+        return self._added.get(key, frozenset())
+
     def _pirateweather_data(self, key):
         """Fetch and return specific weather data (currently, minutely, hourly, daily, flags and day_night)."""
         keys = ["minutely", "currently", "hourly", "daily", "flags", "day_night"]
         try:
-            if key not in self.json:
+            # Pushed forecasts have no request to repeat
+            if key not in self._document and self.response is not None:
                 keys.remove(key)
                 url = "{}&exclude={}{}".format(
                     self.response.url.split("&")[0],
@@ -80,13 +269,11 @@ class Forecast(UnicodeMixin):
                 )
 
                 response = requests.get(url).json()
-                self.json[key] = response[key]
+                self._document[key] = _parse_block(key, response[key], {})
 
-            if key == "currently":
-                return PirateWeatherDataPoint(self.json[key])
             if key == "flags":
-                return PirateWeatherFlagsBlock(self.json[key])
-            return PirateWeatherDataBlock(self.json[key])
+                return PirateWeatherFlagsBlock(self._document[key])
+            return self._document[key]
         except KeyError:
             if key == "currently":
                 return PirateWeatherDataPoint()
@@ -96,14 +283,165 @@ class Forecast(UnicodeMixin):
 class PirateWeatherDataBlock(UnicodeMixin):
     """Represent a block of weather data such as minutely, hourly, or daily summaries."""
 
-    def __init__(self, d=None):
+    __slots__ = ("_columns", "_fields", "_index", "_meta", "data")
+
+    def __init__(self, d=None, memo=None):
         """Initialize the data block with summary and icon information."""
         d = d or {}
-        self.summary = d.get("summary")
-        self.icon = d.get("icon")
+        memo = {} if memo is None else memo
+        self._index = None
+        self._meta = {
+            key: _compact(value, memo) for key, value in d.items() if key != "data"
+        }
+        points = d.get("data", [])
+        layout = tuple(points[0]) if points else ()
+        if all(tuple(point) == layout for point in points):
+            # Points with the same fields share columns holding the whole block
+            fields = _field_index(layout)
+            columns = tuple(
+                _column(values, memo)
+                for values in zip(*(point.values() for point in points), strict=True)
+            )
+            self.data = [
+                PirateWeatherDataPoint(fields=fields, columns=columns, row=row)
+                for row in range(len(points))
+            ]
+        else:
+            fields = columns = None
+            self.data = [PirateWeatherDataPoint(point, memo) for point in points]
+        self._fields = fields
+        self._columns = columns
+
+    @property
+    def summary(self):
+        """Return the summary of the block."""
+        return self._meta.get("summary")
+
+    @property
+    def icon(self):
+        """Return the icon of the block."""
+        return self._meta.get("icon")
+
+    def as_dict(self, exclude=()):
+        """Return the block as a JSON object, without the excluded fields."""
+        return {
+            **self._meta,
+            "data": [point.as_dict(exclude) for point in self.data],
+        }
+
+    def add_columns(self, columns, memo=None):
+        """Add fields to every data point from columns in row order.
+
+        Returns the names of the fields that were added.
+        """
+        memo = {} if memo is None else memo
+        if self._columns is None:
+            added = {
+                name for point in self.data for name in columns if name not in point
+            }
+            self.data = [
+                PirateWeatherDataPoint(
+                    {
+                        **point.as_dict(),
+                        **{
+                            name: column[row]
+                            for name, column in columns.items()
+                            if name not in point
+                        },
+                    },
+                    memo,
+                )
+                for row, point in enumerate(self.data)
+            ]
+            return added
+
+        added = {
+            name: column for name, column in columns.items() if name not in self._fields
+        }
+        if not added or not self.data:
+            return set()
+        fields = _field_index((*self._fields, *added))
+        self._columns = (
+            *self._columns,
+            *(_column(list(column), memo) for column in added.values()),
+        )
+        self._fields = fields
         self.data = [
-            PirateWeatherDataPoint(datapoint) for datapoint in d.get("data", [])
+            PirateWeatherDataPoint(fields=fields, columns=self._columns, row=row)
+            for row in range(len(self.data))
         ]
+        return set(added)
+
+    def column(self, name):
+        """Return the values of a property for every data point, in row order.
+
+        Blocks stored in columns return the shared column without copying it.
+        """
+        if self._columns is None:
+            return [point.get(name) for point in self.data]
+        index = self._fields.get(name)
+        if index is None:
+            return [None] * len(self.data)
+        return self._columns[index]
+
+    def _time_index(self):
+        """Return the unix times of the data points in order and their rows."""
+        if self._index is None:
+            timed = sorted(
+                (point.utime, row)
+                for row, point in enumerate(self.data)
+                if point.utime is not None
+            )
+            self._index = (
+                array("q", [point_time for point_time, _ in timed]),
+                array("q", [row for _, row in timed]),
+            )
+        return self._index
+
+    def row_at(self, timestamp):
+        """Return the row of the data point at or before a unix time, or -1."""
+        times, rows = self._time_index()
+        index = bisect_right(times, timestamp)
+        return rows[index - 1] if index else -1
+
+    def next_time(self, timestamp):
+        """Return the unix time of the first data point after a unix time."""
+        times, _ = self._time_index()
+        index = bisect_right(times, timestamp)
+        return times[index] if index < len(times) else None
+
+    def covers(self, timestamp):
+        """Return if a unix time falls between the first and last data points."""
+        times, _ = self._time_index()
+        return bool(times) and times[0] <= timestamp <= times[-1]
+
+    def value_at(self, name, timestamp):
+        """Return a weather property at a unix time.
+
+        Numeric properties are linearly interpolated between the surrounding data
+        points, bearings along the shortest arc. Timestamps and other properties
+        keep the value of the point at or before the time. Returns None outside
+        the block or where the property is missing.
+        """
+        times, rows = self._time_index()
+        index = bisect_right(times, timestamp)
+        if index == 0:
+            return None
+
+        before = self.data[rows[index - 1]].get(name)
+        if times[index - 1] == timestamp:
+            return _missing_to_none(before)
+        if index == len(times):
+            return None
+
+        after = self.data[rows[index]].get(name)
+        if not _interpolated(name) or not _is_number(before) or not _is_number(after):
+            return _missing_to_none(before)
+        if before == -999 or after == -999:
+            return None
+
+        fraction = (timestamp - times[index - 1]) / (times[index] - times[index - 1])
+        return _interpolate(name, before, after, fraction)
 
     def __unicode__(self):
         """Return a string representation of the data block."""
@@ -113,6 +451,19 @@ class PirateWeatherDataBlock(UnicodeMixin):
 class PirateWeatherFlagsBlock(UnicodeMixin):
     """Represent a block of flags data."""
 
+    __slots__ = (
+        "ingestVersion",
+        "nearestCity",
+        "nearestCountry",
+        "nearestStation",
+        "nearestSubNational",
+        "processTime",
+        "sourceTimes",
+        "sources",
+        "units",
+        "version",
+    )
+
     def __init__(self, d=None):
         """Initialize the data block with flags information."""
         d = d or {}
@@ -133,36 +484,85 @@ class PirateWeatherFlagsBlock(UnicodeMixin):
 
 
 class PirateWeatherDataPoint(UnicodeMixin):
-    """Represent a single data point in a weather forecast, such as an hourly or daily data point."""
-
-    def __init__(self, d=None):
-        """Initialize the data point with timestamp and weather information."""
-        self.d = d or {}
-
-        try:
-            self.time = datetime.datetime.fromtimestamp(int(self.d["time"]))
-            self.utime = self.d["time"]
-        except KeyError:
-            pass
-
-        try:
-            sr_time = int(self.d["sunriseTime"])
-            self.sunriseTime = datetime.datetime.fromtimestamp(sr_time)
-        except KeyError:
-            self.sunriseTime = None
-
-        try:
-            ss_time = int(self.d["sunsetTime"])
-            self.sunsetTime = datetime.datetime.fromtimestamp(ss_time)
-        except KeyError:
-            self.sunsetTime = None
+    """Represent a single data point in a weather forecast, such as an hourly or daily data point.
+
+    A block holds up to 168 points with the same fields, so points read their
+    values from columns shared with the other points of the block instead of
+    keeping a dict each. Timestamps are converted to timezone aware datetimes
+    when they are read.
+    """
+
+    __slots__ = ("_columns", "_fields", "_row")
+
+    def __init__(self, d=None, memo=None, fields=None, columns=None, row=0):
+        """Initialize the data point with timestamp and weather information.
+
+        Points of a block pass the block's fields and columns and their row
+        instead of a dict.
+        """
+        if columns is None:
+            d = d or {}
+            memo = {} if memo is None else memo
+            fields = _field_index(tuple(d))
+            columns = tuple((_compact(value, memo),) for value in d.values())
+        self._fields = fields
+        self._columns = columns
+        self._row = row
+
+    def get(self, name, default=None):
+        """Return a weather property, or default if it is missing."""
+        index = self._fields.get(name)
+        if index is None:
+            return default
+        return self._columns[index][self._row]
+
+    def __getitem__(self, name):
+        """Return a weather property, raising KeyError if it is missing."""
+        return self._columns[self._fields[name]][self._row]
+
+    def __contains__(self, name):
+        """Return if the data point has a weather property."""
+        return name in self._fields
 
     def __getattr__(self, name):
         """Return the weather property dynamically or return None if missing."""
-        try:
-            return self.d[name]
-        except KeyError:
-            return None
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get(name)
+
+    @property
+    def d(self):
+        """Return the weather properties as a dict."""
+        return self.as_dict()
+
+    def as_dict(self, exclude=()):
+        """Return the data point as a JSON object, without the excluded fields."""
+        row = self._row
+        return {
+            name: column[row]
+            for name, column in zip(self._fields, self._columns, strict=True)
+            if name not in exclude
+        }
+
+    @property
+    def utime(self):
+        """Return the unix time of the data point."""
+        return self.get("time")
+
+    @property
+    def time(self):
+        """Return the time of the data point."""
+        return _timestamp(self.get("time"))
+
+    @property
+    def sunriseTime(self):
+        """Return the sunrise time of the data point."""
+        return _timestamp(self.get("sunriseTime"))
+
+    @property
+    def sunsetTime(self):
+        """Return the sunset time of the data point."""
+        return _timestamp(self.get("sunsetTime"))
 
     def __unicode__(self):
         """Return a string representation of the data point."""
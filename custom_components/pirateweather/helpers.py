@@ -0,0 +1,11 @@
+"""Helpers shared by the Pirate Weather platforms and the rule engine."""
+
+
+def convert_to_camel(data):
+    """Convert snake case (foo_bar_bat) to camel case (fooBarBat).
+
+    This is not pythonic, but needed for certain situations.
+    """
+    components = data.split("_")
+    capital_components = "".join(x.title() for x in components[1:])
+    return f"{components[0]}{capital_components}"
@@ -0,0 +1,121 @@
+"""Precipitation nowcast computed from the minutely forecast."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .forecast_models import PirateWeatherDataBlock
+
+
+@dataclass(frozen=True, slots=True)
+class Nowcast:
+    """Precipitation over the rest of the minutely block.
+
+    Any minute with a positive intensity counts as precipitation. The onset is
+    only set when it is not precipitating yet, and the onset and end are None
+    when they fall beyond the minutely block. Intensities are a depth per hour
+    in the units requested from the API, and the accumulation is the matching
+    depth.
+    """
+
+    precipitating: bool = False
+    onset: datetime | None = None
+    end: datetime | None = None
+    peak_intensity: float | None = None
+    peak_time: datetime | None = None
+    accumulation: float | None = None
+    # Unix time, intensity and probability of each remaining minute
+    timeline: tuple[tuple[int, float | None, float | None], ...] = ()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the nowcast as a service response."""
+        return {
+            "precipitating": self.precipitating,
+            "onset": _isoformat(self.onset),
+            "end": _isoformat(self.end),
+            "peak_intensity": self.peak_intensity,
+            "peak_time": _isoformat(self.peak_time),
+            "accumulation": self.accumulation,
+            "timeline": [
+                {
+                    "time": dt_util.utc_from_timestamp(point_time).isoformat(),
+                    "intensity": intensity,
+                    "probability": probability,
+                }
+                for point_time, intensity, probability in self.timeline
+            ],
+        }
+
+
+def compute_nowcast(minutely: PirateWeatherDataBlock, now: float) -> Nowcast:
+    """Compute the nowcast of the minutely points from now on in one pass.
+
+    The columns of the block are read directly, so no data point is built.
+    """
+    start = max(minutely.row_at(now), 0)
+    times = minutely.column("time")[start:]
+    if not times:
+        return Nowcast()
+    intensities = [
+        _known(value) for value in minutely.column("precipIntensity")[start:]
+    ]
+    probabilities = [
+        _known(value) for value in minutely.column("precipProbability")[start:]
+    ]
+
+    precipitating = _wet(intensities[0])
+    onset = end = peak = peak_time = None
+    accumulation = 0.0
+    previous_time = previous_intensity = None
+    for point_time, intensity in zip(times, intensities, strict=True):
+        wet = _wet(intensity)
+        if wet and onset is None and not precipitating:
+            onset = point_time
+        elif not wet and end is None and (precipitating or onset is not None):
+            end = point_time
+
+        if intensity is not None:
+            if peak is None or intensity > peak:
+                peak, peak_time = intensity, point_time
+            if previous_intensity is not None:
+                # Trapezoids of the hourly rate over each interval give a depth
+                hours = (point_time - previous_time) / 3600
+                accumulation += (previous_intensity + intensity) / 2 * hours
+        previous_time, previous_intensity = point_time, intensity
+
+    return Nowcast(
+        precipitating=precipitating,
+        onset=_datetime(onset),
+        end=_datetime(end),
+        peak_intensity=peak,
+        peak_time=_datetime(peak_time),
+        accumulation=accumulation if peak is not None else None,
+        timeline=tuple(zip(times, intensities, probabilities, strict=True)),
+    )
+
+
+def _known(value: Any) -> float | None:
+    """Return None for missing values and the -999 the API uses for them."""
+    if value is None or value == -999:
+        return None
+    return value
+
+
+def _wet(intensity: float | None) -> bool:
+    """Return if an intensity is precipitation."""
+    return intensity is not None and intensity > 0
+
+
+def _datetime(timestamp: int | None) -> datetime | None:
+    """Convert a unix time to a datetime."""
+    return None if timestamp is None else dt_util.utc_from_timestamp(timestamp)
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    """Return a datetime as an ISO 8601 string."""
+    return None if value is None else value.isoformat()
@@ -0,0 +1,275 @@
+"""Declarative rules evaluated against each forecast."""
+
+from __future__ import annotations
+
+import logging
+import operator
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_RULE
+from .dispatcher import ForecastBlocks
+from .helpers import convert_to_camel
+from .sensor import SENSOR_TYPES
+
+if TYPE_CHECKING:
+    from .forecast_models import Forecast
+    from .weather_update_coordinator import WeatherUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Comparison of each comparator and the words naming it
+COMPARATORS: dict[str, tuple[Callable[[float, float], bool], str]] = {
+    "<": (operator.lt, "below"),
+    "<=": (operator.le, "at most"),
+    ">": (operator.gt, "above"),
+    ">=": (operator.ge, "at least"),
+}
+
+# Blocks rules are evaluated on, with the unit their horizon is counted in
+RULE_BLOCKS = {"currently": "", "minutely": "m", "hourly": "h", "daily": "d"}
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastRule:
+    """A comparison of a forecast field with a threshold.
+
+    The rule is active when any point of the block within the horizon meets
+    the comparison. The field is a condition name such as uv_index, the horizon
+    counts points from the one covering now, and the threshold is in the units
+    requested from the API.
+    """
+
+    field: str
+    block: str
+    horizon: int
+    comparator: str
+    threshold: float
+
+    @property
+    def key(self) -> str:
+        """Return a key identifying the rule."""
+        return "_".join(self.label.split()).lower()
+
+    @property
+    def label(self) -> str:
+        """Return the name of the rule."""
+        field = self.field.replace("_", " ")
+        words = COMPARATORS[self.comparator][1]
+        if self.block == "currently":
+            return f"{field} {words} {self.threshold:g} now"
+        return (
+            f"{field} {words} {self.threshold:g} "
+            f"{self.horizon}{RULE_BLOCKS[self.block]}"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RuleResult:
+    """Whether a rule is active, with the first point meeting it."""
+
+    active: bool = False
+    time: datetime | None = None
+    value: float | None = None
+
+
+def parse_rules(value: str | None) -> list[ForecastRule]:
+    """Parse comma separated rule definitions.
+
+    A definition is field:block:horizon:comparator:threshold, ex.
+    'temperature:hourly:12:<=:0,uv_index:daily:1:>=:8'. Invalid definitions
+    and duplicates of an earlier rule are logged and skipped.
+    """
+    rules: dict[str, ForecastRule] = {}
+    for definition in (value or "").split(","):
+        if not definition.strip():
+            continue
+        try:
+            rule = _parse_rule(definition)
+        except ValueError as err:
+            _LOGGER.warning("Ignoring rule %s: %s", definition.strip(), err)
+            continue
+        if rule.key in rules:
+            _LOGGER.warning(
+                "Ignoring rule %s: duplicate of an earlier rule", definition.strip()
+            )
+            continue
+        rules[rule.key] = rule
+    return list(rules.values())
+
+
+def _parse_rule(definition: str) -> ForecastRule:
+    """Parse one rule definition."""
+    parts = [part.strip() for part in definition.split(":")]
+    if len(parts) != 5:
+        raise ValueError("expected field:block:horizon:comparator:threshold")
+
+    field, block, horizon, comparator, threshold = parts
+    # Unknown fields have no column, so their rule would never be met
+    description = SENSOR_TYPES.get(field)
+    if description is None or not description.forecast_mode:
+        raise ValueError(f"{field} is not a forecast condition")
+    if block not in RULE_BLOCKS:
+        raise ValueError(f"block must be one of {', '.join(RULE_BLOCKS)}")
+    if comparator not in COMPARATORS:
+        raise ValueError(f"comparator must be one of {', '.join(COMPARATORS)}")
+    horizon = int(horizon)
+    if horizon < 1:
+        raise ValueError("the horizon must cover at least one point")
+    return ForecastRule(field, block, horizon, comparator, float(threshold))
+
+
+def evaluate_rule(forecast: Forecast, rule: ForecastRule, now: float) -> RuleResult:
+    """Return the result of a rule from the point of its block covering now.
+
+    The column of the field is read directly, so no data point is built.
+    Missing values never meet a rule.
+    """
+    field = convert_to_camel(rule.field)
+    if rule.block == "currently":
+        point = forecast.currently()
+        times = [point.get("time")]
+        values = [point.get(field)]
+    else:
+        block = getattr(forecast, rule.block)()
+        start = max(block.row_at(now), 0)
+        end = start + rule.horizon
+        times = block.column("time")[start:end]
+        values = block.column(field)[start:end]
+
+    compare = COMPARATORS[rule.comparator][0]
+    for point_time, value in zip(times, values, strict=True):
+        if (
+            isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and value != -999
+            and compare(value, rule.threshold)
+        ):
+            return RuleResult(
+                True,
+                None if point_time is None else dt_util.utc_from_timestamp(point_time),
+                value,
+            )
+    return RuleResult()
+
+
+class RuleEngine:
+    """Evaluate the rules of an entry on each forecast and as time moves on.
+
+    Every rule is evaluated in one pass over a new forecast, and again when the
+    current point of one of the rule blocks rolls over between polls, so the
+    horizons follow the clock. The rules whose result turned on or off fire an
+    event. Binary sensors listen to the engine rather than to the coordinator,
+    so they read the results after the engine updated them.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: WeatherUpdateCoordinator):
+        """Initialize the engine."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.rules: list[ForecastRule] = []
+        self.results: dict[str, RuleResult] = {}
+        self._blocks: ForecastBlocks | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back after each evaluation and return a remove callback."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_set_rules(self, rules: list[ForecastRule]) -> None:
+        """Replace the rules and evaluate them against the current forecast."""
+        self.rules = rules
+        self.results = {
+            key: result
+            for key, result in self.results.items()
+            if key in {rule.key for rule in rules}
+        }
+        self._blocks = None
+        self.async_update()
+
+    @callback
+    def async_update(self) -> None:
+        """Evaluate the rules against a new forecast."""
+        forecast = self.coordinator.data
+        if forecast is None or (
+            self._blocks is not None and self._blocks.forecast is forecast
+        ):
+            return
+        self._blocks = ForecastBlocks(forecast)
+        self._async_evaluate(time.time())
+        self._async_schedule_rollover()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop evaluating the rules between coordinator updates."""
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+
+    @callback
+    def _async_schedule_rollover(self) -> None:
+        """Schedule the next evaluation, when a rule block next rolls over.
+
+        Minutely rules roll over every minute, hourly and daily rules with the
+        hour or day. Rules on the current conditions only change with the data.
+        """
+        self.async_stop()
+        rule_blocks = {rule.block for rule in self.rules} - {"currently"}
+        if not rule_blocks or self._blocks is None:
+            return
+        if (next_time := self._blocks.next_rollover(rule_blocks, time.time())) is None:
+            return
+
+        self._unsub_rollover = async_track_point_in_utc_time(
+            self.hass, self._async_rollover, dt_util.utc_from_timestamp(next_time)
+        )
+
+    @callback
+    def _async_rollover(self, now: datetime) -> None:
+        """Evaluate the rules from the point that became current."""
+        self._unsub_rollover = None
+        self._async_evaluate(now.timestamp())
+        self._async_schedule_rollover()
+
+    @callback
+    def _async_evaluate(self, now: float) -> None:
+        """Evaluate every rule and fire the transitions."""
+        forecast = self._blocks.forecast
+        for rule in self.rules:
+            result = evaluate_rule(forecast, rule, now)
+            previous = self.results.get(rule.key)
+            self.results[rule.key] = result
+            # Rules are only known to change once they have been evaluated
+            if previous is not None and previous.active != result.active:
+                self.hass.bus.async_fire(EVENT_RULE, self._event_data(rule, result))
+
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _event_data(self, rule: ForecastRule, result: RuleResult) -> dict[str, Any]:
+        """Return the data of the event fired when a rule changes."""
+        return {
+            "config_entry_id": self.coordinator.config_entry.entry_id,
+            "rule": rule.key,
+            "field": rule.field,
+            "block": rule.block,
+            "active": result.active,
+            "time": None if result.time is None else result.time.isoformat(),
+            "value": result.value,
+        }
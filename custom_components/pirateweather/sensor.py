@@ -1,9 +1,14 @@
 """Support for Pirate Weather (Dark Sky Compatable) weather service."""
 
+from __future__ import annotations
+
+import asyncio
 import datetime
 import logging
+import time
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
-from typing import Literal, NamedTuple
+from typing import Any, Literal, NamedTuple
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
@@ -27,31 +32,54 @@ from homeassistant.const import (
     DEGREE,
     PERCENTAGE,
     UV_INDEX,
+    UnitOfEnergy,
     UnitOfIrradiance,
     UnitOfLength,
     UnitOfPressure,
     UnitOfSpeed,
     UnitOfTemperature,
+    UnitOfTime,
     UnitOfVolumetricFlux,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import DiscoveryInfoType, StateType
 from homeassistant.util import dt as dt_util
 
+from .aggregates import COUNT_REDUCTIONS, AggregateWindow
 from .const import (
     ALL_CONDITIONS,
+    CONF_AGGREGATES,
+    CONF_FORECAST_SERIES,
+    CONF_FORECAST_STATISTICS,
+    CONF_HORIZON_CUTOFF,
+    CONF_WINDOWS,
+    CONF_WRITE_POLICIES,
+    DEFAULT_HORIZON_CUTOFF,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENTRY_RECONFIGURE,
     ENTRY_WEATHER_COORDINATOR,
+    INTERPOLATED_FIELDS,
     MANUFACTURER,
     PW_PLATFORM,
     PW_PLATFORMS,
     PW_PREVPLATFORM,
     PW_ROUND,
 )
+from .dispatcher import (
+    FAR_HORIZON_DAYS,
+    FAR_HORIZON_HOURS,
+    ForecastBlocks,
+    SensorDispatcher,
+    WritePolicy,
+    get_write_policy,
+)
+from .helpers import convert_to_camel
 from .weather_update_coordinator import WeatherUpdateCoordinator
+from .windows import WindowQuery
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,6 +93,11 @@ CONF_UNITS = "units"
 DEFAULT_LANGUAGE = "en"
 DEFAULT_NAME = "Pirate Weather"
 
+ATTR_FORECAST_SERIES = "forecast"
+
+# Sensors handed to Home Assistant at once before yielding to the event loop
+ENTITY_CHUNK_SIZE = 200
+
 DEPRECATED_SENSOR_TYPES = {
     "apparent_temperature_max",
     "apparent_temperature_min",
@@ -72,6 +105,27 @@ DEPRECATED_SENSOR_TYPES = {
     "temperature_min",
 }
 
+# Forecast sensors of these conditions are added disabled
+RARELY_USED_FORECAST_CONDITIONS = DEPRECATED_SENSOR_TYPES | {"time"}
+
+# Degree hours are in the temperature scale of the unit system
+DEGREE_HOURS_CELSIUS = "°C·h"
+DEGREE_HOURS_FAHRENHEIT = "°F·h"
+
+# Nowcast attribute shown by each nowcast sensor
+NOWCAST_SENSOR_TYPES = {
+    "nowcast_onset": "onset",
+    "nowcast_end": "end",
+    "nowcast_peak_intensity": "peak_intensity",
+    "nowcast_accumulation": "accumulation",
+}
+
+# Days from today of each solar energy sensor
+SOLAR_ENERGY_SENSOR_TYPES = {
+    "solar_energy_today": 0,
+    "solar_energy_tomorrow": 1,
+}
+
 MAP_UNIT_SYSTEM: dict[
     Literal["si", "us", "ca", "uk", "uk2"],
     Literal["si_unit", "us_unit", "ca_unit", "uk_unit", "uk2_unit"],
@@ -317,6 +371,88 @@ SENSOR_TYPES: dict[str, PirateWeatherSensorEntityDescription] = {
         suggested_display_precision=2,
         forecast_mode=["currently", "hourly", "daily"],
     ),
+    "heat_index": PirateWeatherSensorEntityDescription(
+        key="heat_index",
+        name="Heat Index",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=2,
+        icon="mdi:sun-thermometer",
+        forecast_mode=["currently", "hourly", "daily"],
+    ),
+    "wind_chill": PirateWeatherSensorEntityDescription(
+        key="wind_chill",
+        name="Wind Chill",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=2,
+        icon="mdi:snowflake-thermometer",
+        forecast_mode=["currently", "hourly", "daily"],
+    ),
+    "humidex": PirateWeatherSensorEntityDescription(
+        key="humidex",
+        name="Humidex",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=2,
+        icon="mdi:water-thermometer",
+        forecast_mode=["currently", "hourly", "daily"],
+    ),
+    "wet_bulb": PirateWeatherSensorEntityDescription(
+        key="wet_bulb",
+        name="Wet Bulb Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=2,
+        icon="mdi:thermometer-water",
+        forecast_mode=["currently", "hourly", "daily"],
+    ),
+    "heating_degree_hours": PirateWeatherSensorEntityDescription(
+        key="heating_degree_hours",
+        name="Heating Degree Hours",
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=DEGREE_HOURS_CELSIUS,
+        us_unit=DEGREE_HOURS_FAHRENHEIT,
+        ca_unit=DEGREE_HOURS_CELSIUS,
+        uk_unit=DEGREE_HOURS_CELSIUS,
+        uk2_unit=DEGREE_HOURS_CELSIUS,
+        suggested_display_precision=1,
+        icon="mdi:radiator",
+        forecast_mode=["currently", "hourly", "daily"],
+    ),
+    "cooling_degree_hours": PirateWeatherSensorEntityDescription(
+        key="cooling_degree_hours",
+        name="Cooling Degree Hours",
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=DEGREE_HOURS_CELSIUS,
+        us_unit=DEGREE_HOURS_FAHRENHEIT,
+        ca_unit=DEGREE_HOURS_CELSIUS,
+        uk_unit=DEGREE_HOURS_CELSIUS,
+        uk2_unit=DEGREE_HOURS_CELSIUS,
+        suggested_display_precision=1,
+        icon="mdi:air-conditioner",
+        forecast_mode=["currently", "hourly", "daily"],
+    ),
     "wind_speed": PirateWeatherSensorEntityDescription(
         key="wind_speed",
         name="Wind Speed",
@@ -684,6 +820,32 @@ SENSOR_TYPES: dict[str, PirateWeatherSensorEntityDescription] = {
         icon="mdi:weather-sunny",
         forecast_mode=["daily"],
     ),
+    "solar_energy_today": PirateWeatherSensorEntityDescription(
+        key="solar_energy_today",
+        name="Solar Energy Today",
+        device_class=SensorDeviceClass.ENERGY,
+        si_unit=UnitOfEnergy.WATT_HOUR,
+        us_unit=UnitOfEnergy.WATT_HOUR,
+        ca_unit=UnitOfEnergy.WATT_HOUR,
+        uk_unit=UnitOfEnergy.WATT_HOUR,
+        uk2_unit=UnitOfEnergy.WATT_HOUR,
+        suggested_display_precision=0,
+        icon="mdi:solar-power",
+        forecast_mode=[],
+    ),
+    "solar_energy_tomorrow": PirateWeatherSensorEntityDescription(
+        key="solar_energy_tomorrow",
+        name="Solar Energy Tomorrow",
+        device_class=SensorDeviceClass.ENERGY,
+        si_unit=UnitOfEnergy.WATT_HOUR,
+        us_unit=UnitOfEnergy.WATT_HOUR,
+        ca_unit=UnitOfEnergy.WATT_HOUR,
+        uk_unit=UnitOfEnergy.WATT_HOUR,
+        uk2_unit=UnitOfEnergy.WATT_HOUR,
+        suggested_display_precision=0,
+        icon="mdi:solar-power",
+        forecast_mode=[],
+    ),
     "rain_intensity": PirateWeatherSensorEntityDescription(
         key="rain_intensity",
         name="Rain Intensity",
@@ -789,6 +951,48 @@ SENSOR_TYPES: dict[str, PirateWeatherSensorEntityDescription] = {
         device_class=SensorDeviceClass.TIMESTAMP,
         forecast_mode=["daily"],
     ),
+    "nowcast_onset": PirateWeatherSensorEntityDescription(
+        key="nowcast_onset",
+        name="Precip Onset",
+        icon="mdi:weather-rainy",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        forecast_mode=[],
+    ),
+    "nowcast_end": PirateWeatherSensorEntityDescription(
+        key="nowcast_end",
+        name="Precip End",
+        icon="mdi:weather-partly-rainy",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        forecast_mode=[],
+    ),
+    "nowcast_peak_intensity": PirateWeatherSensorEntityDescription(
+        key="nowcast_peak_intensity",
+        name="Next Hour Peak Precip Intensity",
+        device_class=SensorDeviceClass.PRECIPITATION_INTENSITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
+        us_unit=UnitOfVolumetricFlux.INCHES_PER_HOUR,
+        ca_unit=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
+        uk_unit=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
+        uk2_unit=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
+        suggested_display_precision=4,
+        icon="mdi:weather-pouring",
+        forecast_mode=[],
+    ),
+    "nowcast_accumulation": PirateWeatherSensorEntityDescription(
+        key="nowcast_accumulation",
+        name="Next Hour Precip Accumulation",
+        device_class=SensorDeviceClass.PRECIPITATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfLength.MILLIMETERS,
+        us_unit=UnitOfLength.INCHES,
+        ca_unit=UnitOfLength.MILLIMETERS,
+        uk_unit=UnitOfLength.MILLIMETERS,
+        uk2_unit=UnitOfLength.MILLIMETERS,
+        suggested_display_precision=4,
+        icon="mdi:weather-rainy",
+        forecast_mode=[],
+    ),
     "alerts": PirateWeatherSensorEntityDescription(
         key="alerts",
         name="Alerts",
@@ -853,6 +1057,15 @@ SENSOR_TYPES: dict[str, PirateWeatherSensorEntityDescription] = {
     ),
 }
 
+# Shared by the sensors of every forecast window
+WINDOW_DESCRIPTION = PirateWeatherSensorEntityDescription(
+    key="window",
+    name="Window",
+    icon="mdi:calendar-clock",
+    device_class=SensorDeviceClass.TIMESTAMP,
+    forecast_mode=[],
+)
+
 
 class ConditionPicture(NamedTuple):
     """Entity picture and icon for condition."""
@@ -861,6 +1074,15 @@ class ConditionPicture(NamedTuple):
     icon: str
 
 
+class SensorState(NamedTuple):
+    """State of a sensor, computed once per coordinator update."""
+
+    native_value: StateType
+    icon: str | None
+    entity_picture: str | None
+    extra_state_attributes: dict[str, Any]
+
+
 CONDITION_PICTURES: dict[str, ConditionPicture] = {
     "clear-day": ConditionPicture(
         entity_picture="/static/images/darksky/weather-sunny.svg",
@@ -965,6 +1187,21 @@ ALLOWED_UNITS = ["si", "us", "ca", "uk", "uk2"]
 
 ALERTS_ATTRS = ["time", "description", "expires", "severity", "uri", "regions", "title"]
 
+# Alert text is bulky and already kept by the issuing agency, so it is not recorded.
+# Keys get an index suffix when several alerts are active.
+UNRECORDED_ALERTS_ATTRS = ("description", "uri", "regions")
+MAX_UNRECORDED_ALERTS = 20
+UNRECORDED_ATTRIBUTES = frozenset(
+    [
+        *UNRECORDED_ALERTS_ATTRS,
+        *(
+            f"{attr}_{i}"
+            for attr in UNRECORDED_ALERTS_ATTRS
+            for i in range(MAX_UNRECORDED_ALERTS)
+        ),
+    ]
+)
+
 HOURS = list(range(168))
 DAYS = list(range(7))
 
@@ -1026,18 +1263,113 @@ async def async_setup_entry(
     """Set up Pirate Weather sensor entities based on a config entry."""
     domain_data = hass.data[DOMAIN][config_entry.entry_id]
 
+    name = domain_data[CONF_NAME]
+    weather_coordinator = domain_data[ENTRY_WEATHER_COORDINATOR]
+    service_id = config_entry.unique_id or config_entry.entry_id
+
+    # Every sensor of the entry shares the same device info
+    device_info = DeviceInfo(
+        entry_type=DeviceEntryType.SERVICE,
+        identifiers={(DOMAIN, service_id)},
+        manufacturer=MANUFACTURER,
+        name=name,
+    )
+
+    # A single coordinator listener decides which sensors to write
+    dispatcher = SensorDispatcher(
+        weather_coordinator, domain_data.get(CONF_WRITE_POLICIES)
+    )
+    config_entry.async_on_unload(
+        weather_coordinator.async_add_listener(dispatcher.async_update)
+    )
+    config_entry.async_on_unload(dispatcher.async_stop)
+
+    # Unique IDs of every sensor built for the current options
+    built: set[str] = set()
+
+    async def async_add_sensors(sensors: Iterable[PirateWeatherSensor]) -> None:
+        """Hand sensors to Home Assistant in chunks that yield in between."""
+        # Sensors disabled in the entity registry are not added at all, so look
+        # them up once instead of letting each add check the registry
+        entity_registry = er.async_get(hass)
+        disabled_unique_ids = {
+            entity.unique_id
+            for entity in er.async_entries_for_config_entry(
+                entity_registry, config_entry.entry_id
+            )
+            if entity.disabled
+        }
+
+        chunk: list[PirateWeatherSensor] = []
+        added = 0
+        for sensor in sensors:
+            built.add(sensor.unique_id)
+            if sensor.unique_id in disabled_unique_ids:
+                continue
+
+            chunk.append(sensor)
+            if len(chunk) >= ENTITY_CHUNK_SIZE:
+                async_add_entities(chunk)
+                added += len(chunk)
+                chunk = []
+                _LOGGER.debug("Added %s Pirate Weather sensors for %s", added, name)
+                await asyncio.sleep(0)
+
+        async_add_entities(chunk)
+        added += len(chunk)
+        _LOGGER.debug("Added %s Pirate Weather sensors for %s", added, name)
+
+    async def async_reconfigure(changed: set[str]) -> None:
+        """Add, remove and update sensors for changed options."""
+        dispatcher.write_policies = domain_data.get(CONF_WRITE_POLICIES) or {}
+        wanted = {
+            sensor.unique_id: sensor
+            for sensor in _build_sensors(
+                config_entry, domain_data, dispatcher, device_info
+            )
+        }
+
+        for unique_id in built - wanted.keys():
+            built.discard(unique_id)
+            if (sensor := dispatcher.get_sensor(unique_id)) is not None:
+                await sensor.async_remove()
+
+        for unique_id in built & wanted.keys():
+            if (sensor := dispatcher.get_sensor(unique_id)) is not None:
+                sensor.write_policy = wanted[unique_id].write_policy
+                sensor.async_update_from(wanted[unique_id])
+
+        await async_add_sensors(
+            sensor for unique_id, sensor in wanted.items() if unique_id not in built
+        )
+
+    domain_data.setdefault(ENTRY_RECONFIGURE, []).append(async_reconfigure)
+
+    await async_add_sensors(
+        _build_sensors(config_entry, domain_data, dispatcher, device_info)
+    )
+
+
+def _build_sensors(
+    config_entry: ConfigEntry,
+    domain_data: dict[str, Any],
+    dispatcher: SensorDispatcher,
+    device_info: DeviceInfo,
+) -> Iterator[PirateWeatherSensor]:
+    """Build the sensors for the options of a config entry."""
     name = domain_data[CONF_NAME]
     weather_coordinator = domain_data[ENTRY_WEATHER_COORDINATOR]
     conditions = domain_data[CONF_MONITORED_CONDITIONS]
     forecast_days = domain_data[CONF_FORECAST]
     forecast_hours = domain_data[CONF_HOURLY_FORECAST]
-    service_id = config_entry.unique_id or config_entry.entry_id
+    forecast_series = domain_data.get(CONF_FORECAST_SERIES, False)
+    horizon_cutoff = domain_data.get(CONF_HORIZON_CUTOFF, DEFAULT_HORIZON_CUTOFF)
+    # Forecast sensors only keep long-term statistics for conditions opted in
+    forecast_statistics = set(domain_data.get(CONF_FORECAST_STATISTICS) or [])
 
     # Round Output
     output_round = domain_data[PW_ROUND]
 
-    sensors: list[PirateWeatherSensor] = []
-
     for condition in conditions:
         # Save units for conversion later
         request_units = domain_data[CONF_UNITS]
@@ -1052,69 +1384,167 @@ async def async_setup_entry(
             or "currently" in sensor_description.forecast_mode
         ):
             unique_id = f"{config_entry.unique_id}-sensor-{condition}"
-            sensors.append(
-                PirateWeatherSensor(
+            yield PirateWeatherSensor(
+                weather_coordinator,
+                condition,
+                name,
+                unique_id,
+                forecast_day=None,
+                forecast_hour=None,
+                description=sensor_description,
+                request_units=request_units,
+                output_round=output_round,
+                device_info=device_info,
+                dispatcher=dispatcher,
+            )
+
+        # In series mode one sensor holds the whole block up to the furthest offset
+        if (
+            forecast_series
+            and forecast_days
+            and "daily" in sensor_description.forecast_mode
+        ):
+            yield PirateWeatherSeriesSensor(
+                weather_coordinator,
+                condition,
+                name,
+                f"{config_entry.unique_id}-sensor-{condition}-daily-series",
+                block="daily",
+                horizon=max(int(day) for day in forecast_days) + 1,
+                description=sensor_description,
+                request_units=request_units,
+                output_round=output_round,
+                device_info=device_info,
+                dispatcher=dispatcher,
+                statistics=condition in forecast_statistics,
+            )
+        elif forecast_days is not None and "daily" in sensor_description.forecast_mode:
+            for forecast_day in forecast_days:
+                unique_id = (
+                    f"{config_entry.unique_id}-sensor-{condition}-daily-{forecast_day}"
+                )
+                yield PirateWeatherSensor(
                     weather_coordinator,
                     condition,
                     name,
                     unique_id,
-                    forecast_day=None,
+                    forecast_day=int(forecast_day),
                     forecast_hour=None,
                     description=sensor_description,
                     request_units=request_units,
                     output_round=output_round,
-                    service_id=service_id,
+                    device_info=device_info,
+                    dispatcher=dispatcher,
+                    enabled_default=condition not in RARELY_USED_FORECAST_CONDITIONS,
+                    statistics=condition in forecast_statistics,
                 )
-            )
 
-        if forecast_days is not None and "daily" in sensor_description.forecast_mode:
-            for forecast_day in forecast_days:
-                unique_id = (
-                    f"{config_entry.unique_id}-sensor-{condition}-daily-{forecast_day}"
-                )
-                sensors.append(
-                    PirateWeatherSensor(
-                        weather_coordinator,
-                        condition,
-                        name,
-                        unique_id,
-                        forecast_day=int(forecast_day),
-                        forecast_hour=None,
-                        description=sensor_description,
-                        request_units=request_units,
-                        output_round=output_round,
-                        service_id=service_id,
-                    )
-                )
-
-        if forecast_hours is not None and "hourly" in sensor_description.forecast_mode:
+        if (
+            forecast_series
+            and forecast_hours
+            and "hourly" in sensor_description.forecast_mode
+        ):
+            yield PirateWeatherSeriesSensor(
+                weather_coordinator,
+                condition,
+                name,
+                f"{config_entry.unique_id}-sensor-{condition}-hourly-series",
+                block="hourly",
+                horizon=max(int(hour) for hour in forecast_hours) + 1,
+                description=sensor_description,
+                request_units=request_units,
+                output_round=output_round,
+                device_info=device_info,
+                dispatcher=dispatcher,
+                statistics=condition in forecast_statistics,
+            )
+        elif (
+            forecast_hours is not None and "hourly" in sensor_description.forecast_mode
+        ):
             for forecast_h in forecast_hours:
                 unique_id = (
                     f"{config_entry.unique_id}-sensor-{condition}-hourly-{forecast_h}"
                 )
-                sensors.append(
-                    PirateWeatherSensor(
-                        weather_coordinator,
-                        condition,
-                        name,
-                        unique_id,
-                        forecast_day=None,
-                        forecast_hour=int(forecast_h),
-                        description=sensor_description,
-                        request_units=request_units,
-                        output_round=output_round,
-                        service_id=service_id,
-                    )
+                yield PirateWeatherSensor(
+                    weather_coordinator,
+                    condition,
+                    name,
+                    unique_id,
+                    forecast_day=None,
+                    forecast_hour=int(forecast_h),
+                    description=sensor_description,
+                    request_units=request_units,
+                    output_round=output_round,
+                    device_info=device_info,
+                    dispatcher=dispatcher,
+                    # Sensors past the cutoff are only evaluated once enabled
+                    enabled_default=int(forecast_h) < horizon_cutoff
+                    and condition not in RARELY_USED_FORECAST_CONDITIONS,
+                    statistics=condition in forecast_statistics,
                 )
 
-    async_add_entities(sensors)
+    # Aggregates are independent of the monitored conditions
+    for window in domain_data.get(CONF_AGGREGATES) or []:
+        sensor_description = SENSOR_TYPES.get(window.condition)
+        if (
+            sensor_description is None
+            or "hourly" not in sensor_description.forecast_mode
+        ):
+            _LOGGER.warning("There is no hourly forecast of %s", window.condition)
+            continue
+
+        yield PirateWeatherAggregateSensor(
+            weather_coordinator,
+            window,
+            name,
+            f"{config_entry.unique_id}-sensor-aggregate-{window.key}",
+            description=sensor_description,
+            request_units=domain_data[CONF_UNITS],
+            output_round=output_round,
+            device_info=device_info,
+            dispatcher=dispatcher,
+            statistics=window.condition in forecast_statistics,
+        )
+
+    for query in domain_data.get(CONF_WINDOWS) or []:
+        yield PirateWeatherWindowSensor(
+            weather_coordinator,
+            query,
+            name,
+            f"{config_entry.unique_id}-sensor-window-{query.key}",
+            request_units=domain_data[CONF_UNITS],
+            output_round=output_round,
+            device_info=device_info,
+            dispatcher=dispatcher,
+        )
 
 
 class PirateWeatherSensor(SensorEntity):
-    """Class for an Pirate Weather sensor."""
+    """Class for an Pirate Weather sensor.
+
+    Entries can have thousands of sensors, so sensors share their description
+    and device info and keep their own fields in slots.
+    """
+
+    __slots__ = (
+        "_dispatcher",
+        "_state",
+        "_state_source",
+        "_weather_coordinator",
+        "_written_at",
+        "_written_meta",
+        "_written_value",
+        "forecast_day",
+        "forecast_hour",
+        "output_round",
+        "request_units",
+        "type",
+        "write_policy",
+    )
 
     # _attr_should_poll = False
     _attr_attribution = ATTRIBUTION
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
     entity_description: PirateWeatherSensorEntityDescription
 
     def __init__(  # noqa: PLR0917
@@ -1128,43 +1558,52 @@ class PirateWeatherSensor(SensorEntity):
         description: PirateWeatherSensorEntityDescription,
         request_units: str,
         output_round: str,
-        service_id: str,
+        device_info: DeviceInfo,
+        dispatcher: SensorDispatcher,
+        enabled_default: bool = True,
+        statistics: bool = True,
     ) -> None:
         """Initialize the sensor."""
-        self.client_name = name
+        self._attr_entity_registry_enabled_default = enabled_default
+        # Without a state class the recorder compiles no long-term statistics
+        if not statistics:
+            self._attr_state_class = None
 
         self.entity_description = description
-        self.description = description
 
         self._weather_coordinator = weather_coordinator
 
         self._attr_unique_id = unique_id
-        self._attr_name = name
-        self._attr_device_info = DeviceInfo(
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(DOMAIN, service_id)},
-            manufacturer=MANUFACTURER,
-            name=name,
-        )
+        if forecast_day is not None:
+            self._attr_name = f"{name} {description.name} {forecast_day}d"
+        elif forecast_hour is not None:
+            self._attr_name = f"{name} {description.name} {forecast_hour}h"
+        else:
+            self._attr_name = f"{name} {description.name}"
+        self._attr_device_info = device_info
 
         self.forecast_day = forecast_day
         self.forecast_hour = forecast_hour
         self.request_units = request_units
         self.output_round = output_round
         self.type = condition
-        self._icon = None
-        self._alerts = None
+        self.update_unit_of_measurement()
 
-        self._name = description.name
+        self._state_source: ForecastBlocks | None = None
+        self._state: SensorState | None = None
 
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        if self.forecast_day is not None:
-            return f"{self.client_name} {self._name} {self.forecast_day}d"
-        if self.forecast_hour is not None:
-            return f"{self.client_name} {self._name} {self.forecast_hour}h"
-        return f"{self.client_name} {self._name}"
+        self._dispatcher = dispatcher
+        # Alert details live in the attributes, so every update is written
+        self.write_policy: WritePolicy | None = (
+            None
+            if condition == "alerts"
+            else get_write_policy(
+                condition, description.device_class, dispatcher.write_policies
+            )
+        )
+        self._written_at: float | None = None
+        self._written_value: StateType = None
+        self._written_meta: tuple[bool, str | None, dict[str, Any]] | None = None
 
     @property
     def available(self) -> bool:
@@ -1176,15 +1615,6 @@ class PirateWeatherSensor(SensorEntity):
         """Return the attribution."""
         return ATTRIBUTION
 
-    @property
-    def native_unit_of_measurement(self):
-        """Return the unit of measurement of this entity, if any."""
-        unit_key = MAP_UNIT_SYSTEM.get(self.unit_system, "si_unit")
-        self._attr_native_unit_of_measurement = getattr(
-            self.entity_description, unit_key
-        )
-        return self._attr_native_unit_of_measurement
-
     @property
     def unit_system(self):
         """Return the unit system of this entity."""
@@ -1193,13 +1623,7 @@ class PirateWeatherSensor(SensorEntity):
     @property
     def entity_picture(self) -> str | None:
         """Return the entity picture to use in the frontend, if any."""
-        if self._icon is None or "summary" not in self.entity_description.key:
-            return None
-
-        if self._icon in CONDITION_PICTURES:
-            return CONDITION_PICTURES[self._icon].entity_picture
-
-        return None
+        return self.state_bundle.entity_picture
 
     def update_unit_of_measurement(self) -> None:
         """Update units based on unit system."""
@@ -1211,36 +1635,66 @@ class PirateWeatherSensor(SensorEntity):
     @property
     def icon(self) -> str | None:
         """Icon to use in the frontend, if any."""
-        if (
-            "summary" in self.entity_description.key
-            and self._icon in CONDITION_PICTURES
-        ):
-            return CONDITION_PICTURES[self._icon].icon
-
-        return self.entity_description.icon
+        return self.state_bundle.icon
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        if self.type == "alerts":
-            extra_attr = self._alerts
-            extra_attr[ATTR_ATTRIBUTION] = ATTRIBUTION
-        else:
-            extra_attr = {ATTR_ATTRIBUTION: ATTRIBUTION}
-        return extra_attr
+        return self.state_bundle.extra_state_attributes
 
     @property
     def native_value(self) -> StateType:
         """Return the state of the device."""
-        self.update_unit_of_measurement()
+        return self.state_bundle.native_value
+
+    @property
+    def state_bundle(self) -> SensorState:
+        """Return the state of the sensor for the current coordinator data."""
+        # The entity registry reads the icon before registering the entity, so
+        # nothing is computed until then and disabled sensors are never evaluated
+        if self._weather_coordinator.data is None or self.registry_entry is None:
+            return SensorState(
+                None,
+                self.entity_description.icon,
+                None,
+                {ATTR_ATTRIBUTION: ATTRIBUTION},
+            )
+
+        blocks = self._dispatcher.blocks
+        if self._state_source is not blocks:
+            self._state = self.compute_state(blocks)
+            self._state_source = blocks
+        return self._state
+
+    def compute_state(self, blocks: ForecastBlocks) -> SensorState:
+        """Compute the state of the sensor from the forecast blocks."""
+        native_val, condition, extra_attr = self.compute_value(blocks)
+        extra_attr[ATTR_ATTRIBUTION] = ATTRIBUTION
+
+        picture = None
+        if "summary" in self.entity_description.key:
+            picture = CONDITION_PICTURES.get(condition)
+
+        return SensorState(
+            native_val,
+            picture.icon if picture else self.entity_description.icon,
+            picture.entity_picture if picture else None,
+            extra_attr,
+        )
+
+    def compute_value(
+        self, blocks: ForecastBlocks
+    ) -> tuple[StateType, str | None, dict[str, Any]]:
+        """Return the value, condition icon and extra attributes of the sensor."""
+        condition = None
+        extra_attr: dict[str, Any] = {}
 
         if self.type == "alerts":
-            data = self._weather_coordinator.data.alerts()
+            data = blocks.alerts
 
             alerts = {}
             if data is None:
-                self._alerts = alerts
-                return data
+                return data, condition, alerts
 
             multiple_alerts = len(data) > 1
             for i, alert in enumerate(data):
@@ -1259,7 +1713,7 @@ class PirateWeatherSensor(SensorEntity):
 
                     alerts[dkey] = alerts_attr
 
-            self._alerts = alerts
+            extra_attr = alerts
             native_val = len(data)
 
         elif self.type in [
@@ -1272,7 +1726,7 @@ class PirateWeatherSensor(SensorEntity):
             "gefs_update_time",
         ]:
             try:
-                flags = self._weather_coordinator.data.flags()
+                flags = blocks.flags
                 model_time_string = flags.sourceTimes[self.entity_description.key]
                 native_val = datetime.datetime.strptime(
                     model_time_string[0:-1], "%Y-%m-%d %H"
@@ -1280,39 +1734,51 @@ class PirateWeatherSensor(SensorEntity):
             except KeyError:
                 native_val = None
 
-        elif self.type == "minutely_summary":
-            native_val = getattr(
-                self._weather_coordinator.data.minutely(), "summary", ""
+        elif self.type in NOWCAST_SENSOR_TYPES:
+            nowcast = self._weather_coordinator.nowcast()
+            native_val = getattr(nowcast, NOWCAST_SENSOR_TYPES[self.type])
+            if isinstance(native_val, float):
+                native_val = round(native_val, 2 if self.output_round == "Yes" else 4)
+
+        elif self.type in SOLAR_ENERGY_SENSOR_TYPES:
+            solar_forecast = self._weather_coordinator.solar_forecast()
+            day = dt_util.now().date() + datetime.timedelta(
+                days=SOLAR_ENERGY_SENSOR_TYPES[self.type]
             )
-            self._icon = getattr(self._weather_coordinator.data.minutely(), "icon", "")
+            if solar_forecast is not None:
+                native_val = solar_forecast.wh_days.get(day.isoformat())
+
+        elif self.type == "minutely_summary":
+            native_val = getattr(blocks.minutely, "summary", "")
+            condition = getattr(blocks.minutely, "icon", "")
         elif self.type == "hourly_summary":
-            native_val = getattr(self._weather_coordinator.data.hourly(), "summary", "")
-            self._icon = getattr(self._weather_coordinator.data.hourly(), "icon", "")
+            native_val = getattr(blocks.hourly, "summary", "")
+            condition = getattr(blocks.hourly, "icon", "")
 
         elif self.forecast_hour is not None:
-            hourly = self._weather_coordinator.data.hourly()
-            if hasattr(hourly, "data"):
-                native_val = self.get_state(hourly.data[self.forecast_hour].d)
+            hourly = blocks.hourly
+            row = blocks.base_row("hourly") + self.forecast_hour
+            if row < len(hourly.data):
+                native_val = self.get_state(hourly.data[row])
             else:
-                native_val = 0
+                native_val = None
 
         elif self.type == "daily_summary":
-            native_val = getattr(self._weather_coordinator.data.daily(), "summary", "")
-            self._icon = getattr(self._weather_coordinator.data.daily(), "icon", "")
+            native_val = getattr(blocks.daily, "summary", "")
+            condition = getattr(blocks.daily, "icon", "")
 
         elif self.forecast_day is not None:
-            daily = self._weather_coordinator.data.daily()
-            if hasattr(daily, "data"):
-                native_val = self.get_state(daily.data[self.forecast_day].d)
+            daily = blocks.daily
+            row = blocks.base_row("daily") + self.forecast_day
+            if row < len(daily.data):
+                native_val = self.get_state(daily.data[row])
             else:
-                native_val = 0
+                native_val = None
         else:
-            currently = self._weather_coordinator.data.currently()
-            native_val = self.get_state(currently.d)
-
-        # self._state = native_val
+            # Current conditions may be advanced between polls by the coordinator
+            native_val = self.get_state(self._weather_coordinator.current_conditions())
 
-        return native_val
+        return native_val, condition, extra_attr
 
     def get_state(self, data):
         """Return a new state based on the type.
@@ -1338,9 +1804,6 @@ class PirateWeatherSensor(SensorEntity):
         if state is None:
             return state
 
-        if "summary" in self.type:
-            self._icon = getattr(data, "icon", "")
-
         # If output rounding is requested, round to nearest integer
         if self.output_round == "Yes":
             rounding_val = 0
@@ -1372,6 +1835,12 @@ class PirateWeatherSensor(SensorEntity):
             "dew_point",
             "temperature",
             "apparent_temperature",
+            "heat_index",
+            "wind_chill",
+            "humidex",
+            "wet_bulb",
+            "heating_degree_hours",
+            "cooling_degree_hours",
             "temperature_low",
             "apparent_temperature_low",
             "temperature_min",
@@ -1430,25 +1899,326 @@ class PirateWeatherSensor(SensorEntity):
 
         return out_state
 
-    async def async_added_to_hass(self) -> None:
-        """Connect to dispatcher listening for entity data notifications."""
-        self.async_on_remove(
-            self._weather_coordinator.async_add_listener(self.async_write_ha_state)
+    @property
+    def far_horizon(self) -> bool:
+        """Return if the sensor forecasts far enough ahead to be written less often."""
+        return (
+            self.forecast_hour is not None and self.forecast_hour >= FAR_HORIZON_HOURS
+        ) or (self.forecast_day is not None and self.forecast_day >= FAR_HORIZON_DAYS)
+
+    @property
+    def relative_block(self) -> str | None:
+        """Return the block a forecast sensor counts hours or days ahead in.
+
+        Nowcast sensors start at the current minute.
+        """
+        if self.type in NOWCAST_SENSOR_TYPES:
+            return "minutely"
+        if self.forecast_hour is not None:
+            return "hourly"
+        if self.forecast_day is not None:
+            return "daily"
+        return None
+
+    @property
+    def interpolated(self) -> bool:
+        """Return if the sensor shows a current condition advanced between polls."""
+        return (
+            self.forecast_hour is None
+            and self.forecast_day is None
+            and convert_to_camel(self.type) in INTERPOLATED_FIELDS
         )
 
+    def should_write(self, now: float) -> bool:
+        """Return if the latest value should be written, and record it if so.
+
+        The write policy only applies to the state, so changes to the
+        availability, icon or attributes are always written.
+        """
+        available = self.available
+        value = self.native_value if available else None
+        meta = (available, self.icon, self.extra_state_attributes)
+
+        if (
+            self.write_policy is None
+            or self._written_at is None
+            or meta != self._written_meta
+            or self.write_policy.should_write(
+                self._written_value, value, now - self._written_at, self.far_horizon
+            )
+        ):
+            self._written_at = now
+            self._written_value = value
+            self._written_meta = meta
+            return True
+        return False
+
+    @callback
+    def async_update_from(self, sensor: PirateWeatherSensor) -> None:
+        """Apply the settings of a sensor built from changed options."""
+        if (
+            sensor.output_round == self.output_round
+            and sensor.state_class == self.state_class
+        ):
+            return
+
+        self.output_round = sensor.output_round
+        self._attr_state_class = sensor.state_class
+        self.async_rewrite_state()
+
+    @callback
+    def async_update_state(self, now: float) -> bool:
+        """Recompute the state between coordinator updates and write it if worth it.
+
+        Used for interpolated current conditions and when the forecast rolls over.
+        """
+        self._state_source = None
+        if self.should_write(now):
+            self.async_write_ha_state()
+            return True
+        return False
+
+    @callback
+    def async_rewrite_state(self) -> None:
+        """Recompute and write the state after a settings change."""
+        self._state_source = None
+        self._written_at = None
+        self.should_write(time.monotonic())
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Register with the dispatcher writing entity data updates."""
+        self.async_on_remove(self._dispatcher.async_add_sensor(self))
+        # Record the initial state Home Assistant writes once the entity is added
+        self.should_write(time.monotonic())
+
     # async def async_update(self) -> None:
     #    """Get the latest data from PW and updates the states."""
     #    await self._weather_coordinator.async_request_refresh()
 
 
-def convert_to_camel(data):
-    """Convert snake case (foo_bar_bat) to camel case (fooBarBat).
+class PirateWeatherSeriesSensor(PirateWeatherSensor):
+    """Pirate Weather sensor holding a whole hourly or daily forecast series.
+
+    The state is the value for the current hour or day and the series is kept in
+    a compact attribute of [time, value] pairs that is not recorded.
+    """
+
+    __slots__ = ("block", "horizon")
+
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES | {ATTR_FORECAST_SERIES}
+
+    def __init__(  # noqa: PLR0917
+        self,
+        weather_coordinator: WeatherUpdateCoordinator,
+        condition: str,
+        name: str,
+        unique_id,
+        block: str,
+        horizon: int,
+        description: PirateWeatherSensorEntityDescription,
+        request_units: str,
+        output_round: str,
+        device_info: DeviceInfo,
+        dispatcher: SensorDispatcher,
+        statistics: bool = True,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            weather_coordinator,
+            condition,
+            name,
+            unique_id,
+            forecast_day=0 if block == "daily" else None,
+            forecast_hour=0 if block == "hourly" else None,
+            description=description,
+            request_units=request_units,
+            output_round=output_round,
+            device_info=device_info,
+            dispatcher=dispatcher,
+            statistics=statistics,
+        )
+        self.block = block
+        self.horizon = horizon
+        self._attr_name = f"{name} {description.name} {block.title()}"
+
+    def compute_value(
+        self, blocks: ForecastBlocks
+    ) -> tuple[StateType, str | None, dict[str, Any]]:
+        """Return the value for the current hour or day and the series attribute.
+
+        The series starts at the current hour or day, and its values are native
+        values like the state, in the native unit of the sensor.
+        """
+        base = blocks.base_row(self.block)
+        block = getattr(blocks, self.block)
+        series = [
+            [point.utime, self.get_state(point)]
+            for point in block.data[base : base + self.horizon]
+        ]
+
+        value = series[0][1] if series else None
+        return value, None, {ATTR_FORECAST_SERIES: series}
+
+    @callback
+    def async_update_from(self, sensor: PirateWeatherSensor) -> None:
+        """Apply the settings of a sensor built from changed options."""
+        if (
+            sensor.output_round == self.output_round
+            and sensor.horizon == self.horizon
+            and sensor.state_class == self.state_class
+        ):
+            return
+
+        self.output_round = sensor.output_round
+        self.horizon = sensor.horizon
+        self._attr_state_class = sensor.state_class
+        self.async_rewrite_state()
+
+
+class PirateWeatherAggregateSensor(PirateWeatherSensor):
+    """Pirate Weather sensor reducing an hourly condition over the next hours.
 
-    This is not pythonic, but needed for certain situations.
+    The aggregates of all windows over a condition share one pass over the
+    hourly forecast, and move with the current hour between polls.
     """
-    components = data.split("_")
-    capital_components = "".join(x.title() for x in components[1:])
-    return f"{components[0]}{capital_components}"
+
+    __slots__ = ("window",)
+
+    def __init__(  # noqa: PLR0917
+        self,
+        weather_coordinator: WeatherUpdateCoordinator,
+        window: AggregateWindow,
+        name: str,
+        unique_id,
+        description: PirateWeatherSensorEntityDescription,
+        request_units: str,
+        output_round: str,
+        device_info: DeviceInfo,
+        dispatcher: SensorDispatcher,
+        statistics: bool = True,
+    ) -> None:
+        """Initialize the sensor."""
+        if window.reduction in COUNT_REDUCTIONS:
+            # Counts are in hours rather than in the units of the condition
+            description = PirateWeatherSensorEntityDescription(
+                key=window.key,
+                name=description.name,
+                device_class=SensorDeviceClass.DURATION,
+                state_class=SensorStateClass.MEASUREMENT,
+                si_unit=UnitOfTime.HOURS,
+                us_unit=UnitOfTime.HOURS,
+                ca_unit=UnitOfTime.HOURS,
+                uk_unit=UnitOfTime.HOURS,
+                uk2_unit=UnitOfTime.HOURS,
+                suggested_display_precision=0,
+                icon=description.icon,
+            )
+
+        super().__init__(
+            weather_coordinator,
+            window.condition,
+            name,
+            unique_id,
+            forecast_day=None,
+            forecast_hour=None,
+            description=description,
+            request_units=request_units,
+            output_round=output_round,
+            device_info=device_info,
+            dispatcher=dispatcher,
+            statistics=statistics,
+        )
+        self.window = window
+        self._attr_name = f"{name} {description.name} {window.label}"
+
+    @property
+    def interpolated(self) -> bool:
+        """Return False, aggregates are only recomputed from the forecast."""
+        return False
+
+    @property
+    def relative_block(self) -> str:
+        """Return the block the windows start at the current hour of."""
+        return "hourly"
+
+    def compute_value(
+        self, blocks: ForecastBlocks
+    ) -> tuple[StateType, str | None, dict[str, Any]]:
+        """Return the aggregate of the window."""
+        field_name = convert_to_camel(self.type)
+        value = blocks.aggregate(field_name, self.window)
+        if value is not None and self.window.reduction not in COUNT_REDUCTIONS:
+            value = self.get_state({field_name: value})
+        return value, None, {}
+
+    @callback
+    def async_update_from(self, sensor: PirateWeatherSensor) -> None:
+        """Apply the settings of a sensor built from changed options."""
+        if (
+            sensor.output_round == self.output_round
+            and sensor.state_class == self.state_class
+        ):
+            return
+
+        self.output_round = sensor.output_round
+        self._attr_state_class = sensor.state_class
+        self.async_rewrite_state()
+
+
+class PirateWeatherWindowSensor(PirateWeatherSensor):
+    """Pirate Weather sensor showing when the next window of a query starts.
+
+    The window and its end are looked up from the coordinator, which searches
+    each query once per forecast and hour.
+    """
+
+    __slots__ = ("query",)
+
+    def __init__(  # noqa: PLR0917
+        self,
+        weather_coordinator: WeatherUpdateCoordinator,
+        query: WindowQuery,
+        name: str,
+        unique_id,
+        request_units: str,
+        output_round: str,
+        device_info: DeviceInfo,
+        dispatcher: SensorDispatcher,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            weather_coordinator,
+            WINDOW_DESCRIPTION.key,
+            name,
+            unique_id,
+            forecast_day=None,
+            forecast_hour=None,
+            description=WINDOW_DESCRIPTION,
+            request_units=request_units,
+            output_round=output_round,
+            device_info=device_info,
+            dispatcher=dispatcher,
+        )
+        self.query = query
+        self._attr_name = f"{name} {WINDOW_DESCRIPTION.name} {query.label}"
+
+    @property
+    def interpolated(self) -> bool:
+        """Return False, windows are only searched in the forecast."""
+        return False
+
+    @property
+    def relative_block(self) -> str:
+        """Return the block windows are searched from the current hour of."""
+        return "hourly"
+
+    def compute_value(
+        self, blocks: ForecastBlocks
+    ) -> tuple[StateType, str | None, dict[str, Any]]:
+        """Return the start of the next window, with its end as an attribute."""
+        window = self._weather_coordinator.find_window(self.query)
+        return window.start, None, {"end": window.as_dict()["end"]}
 
 
 def fire_index(fire_index):
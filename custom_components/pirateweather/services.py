@@ -0,0 +1,155 @@
+"""Services for the Pirate Weather integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, ENTRY_WEATHER_COORDINATOR
+from .weather_update_coordinator import WeatherUpdateCoordinator
+from .windows import WINDOW_BLOCKS, WINDOW_CONSTRAINTS, WindowQuery, points_in
+
+SERVICE_FIND_WINDOW = "find_window"
+SERVICE_NOWCAST = "nowcast"
+SERVICE_VALUE_AT = "value_at"
+
+ATTR_BLOCK = "block"
+ATTR_DURATION = "duration"
+ATTR_FIELDS = "fields"
+ATTR_HORIZON = "horizon"
+ATTR_TIMES = "times"
+
+# Blocks searched for a time, finest first
+INDEXED_BLOCKS = ("minutely", "hourly", "daily")
+
+VALUE_AT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FIELDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_TIMES): vol.All(cv.ensure_list, [cv.datetime]),
+        vol.Optional(ATTR_BLOCK): vol.In(INDEXED_BLOCKS),
+    }
+)
+
+NOWCAST_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+FIND_WINDOW_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Required(ATTR_DURATION): cv.positive_time_period,
+            vol.Optional(ATTR_BLOCK, default="hourly"): vol.In(WINDOW_BLOCKS),
+            vol.Optional(ATTR_HORIZON): cv.positive_time_period,
+            **{
+                vol.Optional(constraint): vol.Coerce(float)
+                for constraint in WINDOW_CONSTRAINTS
+            },
+        }
+    ),
+    cv.has_at_least_one_key(*WINDOW_CONSTRAINTS),
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Pirate Weather services."""
+
+    async def async_value_at(call: ServiceCall) -> ServiceResponse:
+        """Return forecast fields at arbitrary times."""
+        forecast = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID]).data
+        blocks = [call.data[ATTR_BLOCK]] if ATTR_BLOCK in call.data else INDEXED_BLOCKS
+
+        values = []
+        for when in call.data[ATTR_TIMES]:
+            when = dt_util.as_utc(when)
+            timestamp = when.timestamp()
+            value = {"time": when.isoformat(), ATTR_BLOCK: None}
+            value.update(dict.fromkeys(call.data[ATTR_FIELDS]))
+
+            for name in blocks:
+                block = getattr(forecast, name)()
+                if not block.covers(timestamp):
+                    continue
+                value[ATTR_BLOCK] = name
+                for field in call.data[ATTR_FIELDS]:
+                    value[field] = block.value_at(field, timestamp)
+                break
+
+            values.append(value)
+
+        return {"values": values}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_VALUE_AT,
+        async_value_at,
+        schema=VALUE_AT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_nowcast(call: ServiceCall) -> ServiceResponse:
+        """Return the precipitation nowcast of the latest forecast."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        return coordinator.nowcast().as_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NOWCAST,
+        async_nowcast,
+        schema=NOWCAST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_find_window(call: ServiceCall) -> ServiceResponse:
+        """Return the next window of weather meeting every constraint."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        block = call.data[ATTR_BLOCK]
+        horizon = call.data.get(ATTR_HORIZON)
+        query = WindowQuery(
+            points_in(block, call.data[ATTR_DURATION].total_seconds()),
+            tuple(
+                (constraint, call.data[constraint])
+                for constraint in WINDOW_CONSTRAINTS
+                if constraint in call.data
+            ),
+            block,
+            None if horizon is None else points_in(block, horizon.total_seconds()),
+        )
+        return coordinator.find_window(query).as_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_WINDOW,
+        async_find_window,
+        schema=FIND_WINDOW_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> WeatherUpdateCoordinator:
+    """Return the coordinator of a loaded Pirate Weather entry with a forecast."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"{entry_id} is not a Pirate Weather entry")
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            f"Pirate Weather entry {entry.title} is not loaded"
+        )
+
+    coordinator = hass.data[DOMAIN][entry_id][ENTRY_WEATHER_COORDINATOR]
+    if coordinator.data is None:
+        raise ServiceValidationError(
+            f"No forecast available for Pirate Weather entry {entry.title}"
+        )
+    return coordinator
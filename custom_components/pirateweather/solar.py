@@ -0,0 +1,153 @@
+"""Solar production forecast from the hourly irradiance of the forecast."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .forecast_models import PirateWeatherDataBlock
+
+# Extraterrestrial irradiance in W/m²
+SOLAR_CONSTANT = 1367
+# Share of the plane of array irradiance delivered as AC energy
+SYSTEM_EFFICIENCY = 0.85
+# Share of the irradiance reflected by the ground in front of the array
+GROUND_ALBEDO = 0.2
+# Below this cosine of the zenith (about 5° elevation) there is no direct beam
+MIN_COS_ZENITH = 0.087
+
+
+@dataclass(frozen=True, slots=True)
+class SolarArray:
+    """A solar array, with its peak power in W and orientation in degrees.
+
+    The azimuth is measured clockwise from north, so 180 faces south.
+    """
+
+    capacity: float
+    tilt: float = 30
+    azimuth: float = 180
+
+
+@dataclass(frozen=True, slots=True)
+class SolarForecast:
+    """Expected production of an array in Wh per hour and per local day."""
+
+    wh_hours: dict[str, int] = field(default_factory=dict)
+    wh_days: dict[str, int] = field(default_factory=dict)
+
+
+def compute_solar_forecast(
+    hourly: PirateWeatherDataBlock,
+    latitude: float,
+    longitude: float,
+    array: SolarArray,
+) -> SolarForecast:
+    """Integrate the hourly irradiance on the array into Wh per hour and day.
+
+    The irradiance of each hourly point is taken as the mean of the hour it
+    starts, with the sun at the middle of the hour. Hours are keyed by their
+    start in ISO format, and days by their local date.
+    """
+    wh_hours: dict[str, int] = {}
+    wh_days: dict[str, int] = {}
+    for point_time, irradiance in zip(
+        hourly.column("time"), hourly.column("solar"), strict=True
+    ):
+        if point_time is None or irradiance is None or irradiance < 0:
+            continue
+
+        zenith, azimuth = solar_position(point_time + 1800, latitude, longitude)
+        energy = round(
+            array.capacity
+            * plane_of_array_irradiance(irradiance, zenith, azimuth, array)
+            / 1000
+            * SYSTEM_EFFICIENCY
+        )
+
+        start = dt_util.utc_from_timestamp(point_time)
+        wh_hours[start.isoformat()] = energy
+        day = dt_util.as_local(start).date().isoformat()
+        wh_days[day] = wh_days.get(day, 0) + energy
+
+    return SolarForecast(wh_hours, wh_days)
+
+
+def solar_position(
+    timestamp: float, latitude: float, longitude: float
+) -> tuple[float, float]:
+    """Return the zenith and azimuth of the sun in radians at a unix time.
+
+    Uses the low precision formulas of the Astronomical Almanac, accurate to
+    about 0.01° between 1950 and 2050. The azimuth is clockwise from north.
+    """
+    days = timestamp / 86400 - 10957.5
+    anomaly = math.radians(357.529 + 0.98560028 * days)
+    mean_longitude = 280.459 + 0.98564736 * days
+    ecliptic_longitude = math.radians(
+        mean_longitude + 1.915 * math.sin(anomaly) + 0.020 * math.sin(2 * anomaly)
+    )
+    obliquity = math.radians(23.439 - 0.00000036 * days)
+
+    right_ascension = math.atan2(
+        math.cos(obliquity) * math.sin(ecliptic_longitude),
+        math.cos(ecliptic_longitude),
+    )
+    declination = math.asin(math.sin(obliquity) * math.sin(ecliptic_longitude))
+    sidereal_hours = (18.697374558 + 24.06570982441908 * days) % 24
+    hour_angle = math.radians(sidereal_hours * 15 + longitude) - right_ascension
+
+    lat = math.radians(latitude)
+    cos_zenith = math.sin(lat) * math.sin(declination) + math.cos(lat) * math.cos(
+        declination
+    ) * math.cos(hour_angle)
+    zenith = math.acos(max(-1.0, min(1.0, cos_zenith)))
+    azimuth = math.atan2(
+        -math.sin(hour_angle),
+        math.tan(declination) * math.cos(lat) - math.sin(lat) * math.cos(hour_angle),
+    )
+    return zenith, azimuth % (2 * math.pi)
+
+
+def plane_of_array_irradiance(
+    irradiance: float, zenith: float, azimuth: float, array: SolarArray
+) -> float:
+    """Return the irradiance on the array in W/m² from the global irradiance.
+
+    The global irradiance is split into beam and diffuse parts with the Erbs
+    model and transposed onto the array with an isotropic sky.
+    """
+    tilt = math.radians(array.tilt)
+    cos_zenith = math.cos(zenith)
+    diffuse = irradiance
+    beam = 0.0
+    if cos_zenith > MIN_COS_ZENITH:
+        clearness = min(irradiance / (SOLAR_CONSTANT * cos_zenith), 1.0)
+        diffuse = irradiance * _diffuse_fraction(clearness)
+        cos_incidence = cos_zenith * math.cos(tilt) + math.sin(zenith) * math.sin(
+            tilt
+        ) * math.cos(azimuth - math.radians(array.azimuth))
+        beam = (irradiance - diffuse) / cos_zenith * max(cos_incidence, 0.0)
+
+    sky = diffuse * (1 + math.cos(tilt)) / 2
+    ground = irradiance * GROUND_ALBEDO * (1 - math.cos(tilt)) / 2
+    return beam + sky + ground
+
+
+def _diffuse_fraction(clearness: float) -> float:
+    """Return the diffuse share of the global irradiance (Erbs et al. 1982)."""
+    if clearness <= 0.22:
+        return 1 - 0.09 * clearness
+    if clearness <= 0.8:
+        return (
+            0.9511
+            - 0.1604 * clearness
+            + 4.388 * clearness**2
+            - 16.638 * clearness**3
+            + 12.336 * clearness**4
+        )
+    return 0.165
@@ -0,0 +1,116 @@
+"""HTTP views for the Pirate Weather integration."""
+
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+
+import voluptuous as vol
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView, require_admin
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_PUSH_UPDATES,
+    CONF_SHARE_FORECAST,
+    DOMAIN,
+    ENTRY_WEATHER_COORDINATOR,
+    FORECAST_BLOCKS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_VIEWS_REGISTERED = "views_registered"
+
+
+@callback
+def async_register_views(hass: HomeAssistant) -> None:
+    """Register the Pirate Weather HTTP views once per Home Assistant instance."""
+    if hass.data[DOMAIN].get(DATA_VIEWS_REGISTERED):
+        return
+
+    if hass.http is None:
+        _LOGGER.warning(
+            "The HTTP integration is not loaded, Pirate Weather views are unavailable"
+        )
+        return
+
+    hass.http.register_view(PirateWeatherForecastView())
+    hass.data[DOMAIN][DATA_VIEWS_REGISTERED] = True
+
+
+class PirateWeatherForecastView(HomeAssistantView):
+    """Exchange forecast documents for a Pirate Weather config entry."""
+
+    url = "/api/pirateweather/{entry_id}/forecast"
+    name = "api:pirateweather:forecast"
+    requires_auth = True
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Serve the cached forecast to clients on the local network.
+
+        The optional ``blocks`` query parameter limits the document to a comma
+        separated list of blocks. Responses carry a strong ETag so clients can
+        revalidate with If-None-Match and receive 304 Not Modified.
+        """
+        hass = request.app[KEY_HASS]
+        domain_data = hass.data.get(DOMAIN, {}).get(entry_id)
+
+        if not domain_data or not domain_data.get(CONF_SHARE_FORECAST):
+            return self.json_message(
+                "Forecast sharing is not enabled for this entry", HTTPStatus.NOT_FOUND
+            )
+
+        coordinator = domain_data[ENTRY_WEATHER_COORDINATOR]
+        if coordinator.data is None:
+            return self.json_message(
+                "No forecast available", HTTPStatus.SERVICE_UNAVAILABLE
+            )
+
+        blocks = None
+        if requested := request.query.get("blocks"):
+            blocks = tuple(
+                sorted({block.strip() for block in requested.split(",")} - {""})
+            )
+            if unknown := [block for block in blocks if block not in FORECAST_BLOCKS]:
+                return self.json_message(
+                    f"Unknown forecast blocks: {', '.join(unknown)}",
+                    HTTPStatus.BAD_REQUEST,
+                )
+
+        etag, body = coordinator.serialized_forecast(blocks)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag
+            in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        ):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    @require_admin
+    async def post(self, request: web.Request, entry_id: str) -> web.Response:
+        """Accept a forecast document pushed by a Pirate Weather compatible backend."""
+        hass = request.app[KEY_HASS]
+        domain_data = hass.data.get(DOMAIN, {}).get(entry_id)
+
+        if not domain_data or not domain_data.get(CONF_PUSH_UPDATES):
+            return self.json_message(
+                "Push updates are not enabled for this entry", HTTPStatus.NOT_FOUND
+            )
+
+        try:
+            data = await request.json()
+        except ValueError:
+            return self.json_message("Invalid JSON", HTTPStatus.BAD_REQUEST)
+
+        coordinator = domain_data[ENTRY_WEATHER_COORDINATOR]
+        try:
+            coordinator.async_push_forecast(data)
+        except vol.Invalid as err:
+            return self.json_message(f"Invalid forecast: {err}", HTTPStatus.BAD_REQUEST)
+
+        return self.json_message("Forecast accepted", HTTPStatus.ACCEPTED)
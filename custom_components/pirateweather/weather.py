@@ -49,6 +49,7 @@ from .const import (
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENTRY_RECONFIGURE,
     ENTRY_WEATHER_COORDINATOR,
     FORECAST_MODES,
     MANUFACTURER,
@@ -173,36 +174,38 @@ def _get_precip(forecast, unit_system: str) -> float | None:
 
 
 def _map_daily_forecast(forecast, unit_system) -> Forecast:
+    # Points build their dict on access, so read it once
+    data = forecast.d
     precip = _get_precip(forecast, unit_system)
     return {
-        "datetime": utc_from_timestamp(forecast.d.get("time")).isoformat(),
-        "condition": MAP_CONDITION.get(forecast.d.get("icon")),
-        "native_temperature": forecast.d.get("temperatureHigh"),
-        "native_templow": forecast.d.get("temperatureLow"),
+        "datetime": utc_from_timestamp(data.get("time")).isoformat(),
+        "condition": MAP_CONDITION.get(data.get("icon")),
+        "native_temperature": data.get("temperatureHigh"),
+        "native_templow": data.get("temperatureLow"),
         "native_precipitation": precip,
-        "precipitation_probability": round(
-            forecast.d.get("precipProbability") * 100, 0
-        ),
-        "humidity": round(forecast.d.get("humidity") * 100, 2),
-        "cloud_coverage": round(forecast.d.get("cloudCover") * 100, 0),
-        "native_wind_speed": round(forecast.d.get("windSpeed"), 2),
-        "native_wind_gust_speed": round(forecast.d.get("windGust"), 2),
-        "wind_bearing": round(forecast.d.get("windBearing"), 0),
-        "native_dew_point": forecast.d.get("dewPoint"),
-        "native_pressure": forecast.d.get("pressure"),
-        "uv_index": round(forecast.d.get("uvIndex"), 2),
+        "precipitation_probability": round(data.get("precipProbability") * 100, 0),
+        "humidity": round(data.get("humidity") * 100, 2),
+        "cloud_coverage": round(data.get("cloudCover") * 100, 0),
+        "native_wind_speed": round(data.get("windSpeed"), 2),
+        "native_wind_gust_speed": round(data.get("windGust"), 2),
+        "wind_bearing": round(data.get("windBearing"), 0),
+        "native_dew_point": data.get("dewPoint"),
+        "native_pressure": data.get("pressure"),
+        "uv_index": round(data.get("uvIndex"), 2),
     }
 
 
 def _map_day_night_forecast(
     forecast, unit_system, is_day: bool | None = None
 ) -> Forecast:
+    # Points build their dict on access, so read it once
+    data = forecast.d
     precip = _get_precip(forecast, unit_system)
     # If caller provided an `is_day` hint (we'll pass parity from the list),
     # prefer that. Otherwise fall back to a minimal inference from the icon.
     is_daytime: bool | None = is_day
     if is_daytime is None:
-        icon = forecast.d.get("icon")
+        icon = data.get("icon")
         if isinstance(icon, str):
             if "night" in icon:
                 is_daytime = False
@@ -211,44 +214,42 @@ def _map_day_night_forecast(
 
     return {
         "is_daytime": is_daytime,
-        "datetime": utc_from_timestamp(forecast.d.get("time")).isoformat(),
-        "condition": MAP_CONDITION.get(forecast.d.get("icon")),
-        "native_temperature": forecast.d.get("temperature"),
-        "native_apparent_temperature": forecast.d.get("apparentTemperature"),
-        "native_dew_point": forecast.d.get("dewPoint"),
-        "native_pressure": forecast.d.get("pressure"),
-        "native_wind_speed": round(forecast.d.get("windSpeed"), 2),
-        "wind_bearing": round(forecast.d.get("windBearing"), 0),
-        "native_wind_gust_speed": round(forecast.d.get("windGust"), 2),
-        "humidity": round(forecast.d.get("humidity") * 100, 2),
+        "datetime": utc_from_timestamp(data.get("time")).isoformat(),
+        "condition": MAP_CONDITION.get(data.get("icon")),
+        "native_temperature": data.get("temperature"),
+        "native_apparent_temperature": data.get("apparentTemperature"),
+        "native_dew_point": data.get("dewPoint"),
+        "native_pressure": data.get("pressure"),
+        "native_wind_speed": round(data.get("windSpeed"), 2),
+        "wind_bearing": round(data.get("windBearing"), 0),
+        "native_wind_gust_speed": round(data.get("windGust"), 2),
+        "humidity": round(data.get("humidity") * 100, 2),
         "native_precipitation": precip,
-        "precipitation_probability": round(
-            forecast.d.get("precipProbability") * 100, 0
-        ),
-        "cloud_coverage": round(forecast.d.get("cloudCover") * 100, 0),
-        "uv_index": round(forecast.d.get("uvIndex"), 2),
+        "precipitation_probability": round(data.get("precipProbability") * 100, 0),
+        "cloud_coverage": round(data.get("cloudCover") * 100, 0),
+        "uv_index": round(data.get("uvIndex"), 2),
     }
 
 
 def _map_hourly_forecast(forecast, unit_system) -> Forecast:
+    # Points build their dict on access, so read it once
+    data = forecast.d
     precip = _get_precip(forecast, unit_system)
     return {
-        "datetime": utc_from_timestamp(forecast.d.get("time")).isoformat(),
-        "condition": MAP_CONDITION.get(forecast.d.get("icon")),
-        "native_temperature": forecast.d.get("temperature"),
-        "native_apparent_temperature": forecast.d.get("apparentTemperature"),
-        "native_dew_point": forecast.d.get("dewPoint"),
-        "native_pressure": forecast.d.get("pressure"),
-        "native_wind_speed": round(forecast.d.get("windSpeed"), 2),
-        "wind_bearing": round(forecast.d.get("windBearing"), 0),
-        "native_wind_gust_speed": round(forecast.d.get("windGust"), 2),
-        "humidity": round(forecast.d.get("humidity") * 100, 2),
+        "datetime": utc_from_timestamp(data.get("time")).isoformat(),
+        "condition": MAP_CONDITION.get(data.get("icon")),
+        "native_temperature": data.get("temperature"),
+        "native_apparent_temperature": data.get("apparentTemperature"),
+        "native_dew_point": data.get("dewPoint"),
+        "native_pressure": data.get("pressure"),
+        "native_wind_speed": round(data.get("windSpeed"), 2),
+        "wind_bearing": round(data.get("windBearing"), 0),
+        "native_wind_gust_speed": round(data.get("windGust"), 2),
+        "humidity": round(data.get("humidity") * 100, 2),
         "native_precipitation": precip,
-        "precipitation_probability": round(
-            forecast.d.get("precipProbability") * 100, 0
-        ),
-        "cloud_coverage": round(forecast.d.get("cloudCover") * 100, 0),
-        "uv_index": round(forecast.d.get("uvIndex"), 2),
+        "precipitation_probability": round(data.get("precipProbability") * 100, 0),
+        "cloud_coverage": round(data.get("cloudCover") * 100, 0),
+        "uv_index": round(data.get("uvIndex"), 2),
     }
 
 
@@ -273,6 +274,17 @@ async def async_setup_entry(
         name, unique_id, forecast_mode, weather_coordinator, output_round, service_id
     )
 
+    async def async_reconfigure(changed: set[str]) -> None:
+        """Apply changed rounding without recreating the entity."""
+        if PW_ROUND not in changed or pw_weather.hass is None:
+            return
+
+        pw_weather.output_round = domain_data[PW_ROUND]
+        pw_weather.async_write_ha_state()
+        await pw_weather.async_update_listeners(None)
+
+    domain_data.setdefault(ENTRY_RECONFIGURE, []).append(async_reconfigure)
+
     async_add_entities([pw_weather], False)
     # _LOGGER.info(pw_weather.__dict__)
 
@@ -326,6 +338,15 @@ class PirateWeather(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinator]):
         self._attr_native_precipitation_unit = units["precipitation"]
         self._attr_native_visibility_unit = units["visibility"]
 
+    async def async_added_to_hass(self) -> None:
+        """Write current conditions interpolated between coordinator updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._weather_coordinator.async_add_current_listener(
+                self.async_write_ha_state
+            )
+        )
+
     @property
     def unique_id(self):
         """Return a unique_id for this entity."""
@@ -349,15 +370,15 @@ class PirateWeather(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinator]):
     @property
     def native_temperature(self):
         """Return the temperature."""
-        temperature = self._weather_coordinator.data.currently().d.get("temperature")
+        temperature = self._weather_coordinator.current_conditions().get("temperature")
 
         return round(temperature, 2) if temperature != -999 else None
 
     @property
     def native_apparent_temperature(self):
         """Return the apparent temperature."""
-        native_apparent_temperature = self._weather_coordinator.data.currently().d.get(
-            "apparentTemperature"
+        native_apparent_temperature = (
+            self._weather_coordinator.current_conditions().get("apparentTemperature")
         )
 
         return (
@@ -369,7 +390,7 @@ class PirateWeather(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinator]):
     @property
     def cloud_coverage(self):
         """Return the cloud coverage."""
-        cloud_cover = self._weather_coordinator.data.currently().d.get("cloudCover")
+        cloud_cover = self._weather_coordinator.current_conditions().get("cloudCover")
 
         return (
             round(cloud_cover * 100, 2)
@@ -380,56 +401,60 @@ class PirateWeather(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinator]):
     @property
     def humidity(self):
         """Return the humidity."""
-        humidity = self._weather_coordinator.data.currently().d.get("humidity") * 100.0
+        humidity = (
+            self._weather_coordinator.current_conditions().get("humidity") * 100.0
+        )
 
         return round(humidity, 2) if humidity != -999 else None
 
     @property
     def native_dew_point(self):
         """Return the dew point."""
-        native_dew_point = self._weather_coordinator.data.currently().d.get("dewPoint")
+        native_dew_point = self._weather_coordinator.current_conditions().get(
+            "dewPoint"
+        )
 
         return round(native_dew_point, 2) if native_dew_point != -999 else None
 
     @property
     def native_wind_speed(self):
         """Return the wind speed."""
-        windspeed = self._weather_coordinator.data.currently().d.get("windSpeed")
+        windspeed = self._weather_coordinator.current_conditions().get("windSpeed")
 
         return round(windspeed, 2) if windspeed != -999 else None
 
     @property
     def native_wind_gust_speed(self):
         """Return the wind gust speed."""
-        wind_gust = self._weather_coordinator.data.currently().d.get("windGust")
+        wind_gust = self._weather_coordinator.current_conditions().get("windGust")
 
         return round(wind_gust, 2) if wind_gust != -999 else None
 
     @property
     def wind_bearing(self):
         """Return the wind bearing."""
-        wind_bearing = self._weather_coordinator.data.currently().d.get("windBearing")
+        wind_bearing = self._weather_coordinator.current_conditions().get("windBearing")
 
         return wind_bearing if wind_bearing != -999 else None
 
     @property
     def ozone(self):
         """Return the ozone level."""
-        ozone = self._weather_coordinator.data.currently().d.get("ozone")
+        ozone = self._weather_coordinator.current_conditions().get("ozone")
 
         return round(ozone, 2) if ozone != -999 else None
 
     @property
     def native_pressure(self):
         """Return the pressure."""
-        pressure = self._weather_coordinator.data.currently().d.get("pressure")
+        pressure = self._weather_coordinator.current_conditions().get("pressure")
 
         return round(pressure, 2) if pressure != -999 else None
 
     @property
     def native_visibility(self):
         """Return the visibility."""
-        visibility = self._weather_coordinator.data.currently().d.get("visibility")
+        visibility = self._weather_coordinator.current_conditions().get("visibility")
 
         return round(visibility, 2) if visibility != -999 else None
 
@@ -437,7 +462,7 @@ class PirateWeather(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinator]):
     def condition(self):
         """Return the weather condition."""
         return MAP_CONDITION.get(
-            self._weather_coordinator.data.currently().d.get("icon")
+            self._weather_coordinator.current_conditions().get("icon")
         )
 
     @callback
@@ -1,23 +1,124 @@
 """Weather data coordinator for the Pirate Weather service."""
 
 import asyncio
+import hashlib
 import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
 
+import voluptuous as vol
 from aiohttp import ClientError
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .cache import (
+    SharedResponseCache,
+    async_get_response_cache,
+    request_cache_key,
+)
 from .const import (
     DOMAIN,
+    FORECAST_BLOCKS,
+    INTERPOLATED_FIELDS,
+    INTERPOLATION_INTERVAL,
 )
-from .forecast_models import Forecast
+from .derived import derive_fields
+from .forecast_models import Forecast, PirateWeatherDataPoint
+from .nowcast import Nowcast, compute_nowcast
+from .solar import SolarArray, SolarForecast, compute_solar_forecast
+from .windows import Window, WindowQuery, find_window
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTRIBUTION = "Powered by Pirate Weather"
 
 
+class ResponseInfo(NamedTuple):
+    """The parts of an API response a forecast needs after the request is done.
+
+    Forecasts keep this instead of the aiohttp response, which would keep the
+    connection and raw headers of every retained forecast alive.
+    """
+
+    url: str
+    status: int
+
+
+def _changed(previous: Any, value: Any, threshold: float) -> bool:
+    """Return if a value moved by at least threshold from the previous value."""
+    if isinstance(previous, (int, float)) and isinstance(value, (int, float)):
+        return abs(value - previous) >= threshold
+    return value != previous
+
+
+def build_forecast_url(  # noqa: PLR0917
+    endpoint: str,
+    api_key: str,
+    latitude: float,
+    longitude: float,
+    units: str,
+    language: str,
+    models: str | None,
+) -> str:
+    """Return the forecast request URL for a location and its options."""
+    forecast_string = (
+        endpoint
+        + "/forecast/"
+        + api_key
+        + "/"
+        + str(latitude)
+        + ","
+        + str(longitude)
+        + "?units="
+        + units
+        + "&extend=hourly"
+        + "&version=2"
+        + "&lang="
+        + language
+        + "&include=day_night_forecast"
+    )
+    if models:
+        exclusions = ",".join(m.strip() for m in models.split(",") if m.strip())
+        if exclusions:
+            forecast_string += "&exclude=" + exclusions
+    return forecast_string
+
+
+def snap_to_grid(value: float, grid: float | None) -> float:
+    """Quantize a coordinate to the nearest point of a grid in degrees."""
+    if not grid:
+        return value
+    return round(round(value / grid) * grid, 6)
+
+
+DATA_POINT_SCHEMA = vol.Schema({vol.Required("time"): int}, extra=vol.ALLOW_EXTRA)
+DATA_BLOCK_SCHEMA = vol.Schema(
+    {vol.Required("data"): [DATA_POINT_SCHEMA]}, extra=vol.ALLOW_EXTRA
+)
+
+# Documents pushed to the integration must be in the Pirate Weather API format
+FORECAST_DOCUMENT_SCHEMA = vol.Schema(
+    {
+        vol.Required("currently"): DATA_POINT_SCHEMA,
+        vol.Required("hourly"): DATA_BLOCK_SCHEMA,
+        vol.Required("daily"): DATA_BLOCK_SCHEMA,
+        vol.Optional("minutely"): DATA_BLOCK_SCHEMA,
+        vol.Optional("day_night"): DATA_BLOCK_SCHEMA,
+        vol.Optional("alerts"): list,
+        vol.Required("flags"): vol.Schema(
+            {vol.Required("sources"): list, vol.Required("units"): str},
+            extra=vol.ALLOW_EXTRA,
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
 class WeatherUpdateCoordinator(DataUpdateCoordinator):
     """Weather data update coordinator."""
 
@@ -33,6 +134,9 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         hass,
         config_entry: ConfigEntry,
         models: str | None,
+        shared_cache: SharedResponseCache | None = None,
+        location_grid: float | None = None,
+        interpolate_current: bool = False,
     ):
         """Initialize coordinator."""
         self._api_key = api_key
@@ -43,6 +147,8 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         self.endpoint = endpoint
         self.requested_units = units or "si"
         self.models = models
+        self.shared_cache = shared_cache
+        self.location_grid = location_grid
 
         self.data = None
         self.currently = None
@@ -50,6 +156,38 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         self.daily = None
         self._connect_error = False
 
+        # Refreshes requested by the user fetch a new forecast instead of a
+        # cached one
+        self._refresh_requested = False
+
+        # Serialized forecast documents, only valid for the forecast they were built from
+        self._serialized_source = None
+        self._serialized: dict[tuple[str, ...], tuple[str, bytes]] = {}
+
+        # Current conditions advanced between polls, valid for the forecast they
+        # were interpolated from
+        self.interpolate_current = interpolate_current
+        self._current: PirateWeatherDataPoint | None = None
+        self._current_source = None
+        self._current_listeners: list[CALLBACK_TYPE] = []
+        self._unsub_interpolation: CALLBACK_TYPE | None = None
+
+        # Precipitation nowcast, valid for the forecast and minutely point it was
+        # computed from
+        self._nowcast: Nowcast | None = None
+        self._nowcast_source: tuple[Forecast, int] | None = None
+
+        # Production forecast of the solar array, valid for the forecast and
+        # array it was computed for
+        self.solar_array: SolarArray | None = None
+        self._solar: SolarForecast | None = None
+        self._solar_source: tuple[Forecast, SolarArray] | None = None
+
+        # Windows found by each query from the point covering the time searched,
+        # valid for the forecast they were found in
+        self._windows: dict[tuple[WindowQuery, int], Window] = {}
+        self._windows_source = None
+
         super().__init__(
             hass,
             _LOGGER,
@@ -66,8 +204,228 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
                 data = await self._get_pw_weather()
             except ClientError as err:
                 raise UpdateFailed(f"Error communicating with API: {err}") from err
+        derive_fields(data, self.requested_units)
         return data
 
+    async def async_request_refresh(self) -> None:
+        """Request a refresh that bypasses the response caches."""
+        self._refresh_requested = True
+        await super().async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes and release the retained forecast."""
+        await super().async_shutdown()
+        self._async_stop_interpolation()
+        self.data = None
+        self._serialized_source = None
+        self._serialized = {}
+        self._current_source = None
+        self._current = None
+        self._nowcast_source = None
+        self._nowcast = None
+        self._solar_source = None
+        self._solar = None
+        self._windows_source = None
+        self._windows = {}
+
+    def nowcast(self) -> Nowcast:
+        """Return the precipitation nowcast from the current minute.
+
+        The nowcast is computed once per forecast and minutely point, so it
+        moves on with the clock between polls.
+        """
+        now = time.time()
+        minutely = self.data.minutely()
+        source = (self.data, minutely.row_at(now))
+        if self._nowcast_source != source:
+            self._nowcast_source = source
+            self._nowcast = compute_nowcast(minutely, now)
+        return self._nowcast
+
+    def find_window(self, query: WindowQuery) -> Window:
+        """Return the next window of a query, searched once per forecast and point.
+
+        Searches from the same point of the same forecast share their result,
+        so sensors and repeated service calls cost a single lookup.
+        """
+        if self._windows_source is not self.data:
+            self._windows_source = self.data
+            self._windows = {}
+
+        now = time.time()
+        block = getattr(self.data, query.block)()
+        key = (query, block.row_at(now))
+        if key not in self._windows:
+            self._windows[key] = find_window(block, query, now)
+        return self._windows[key]
+
+    def solar_forecast(self) -> SolarForecast | None:
+        """Return the production forecast of the solar array, if there is one.
+
+        The forecast is computed once per forecast and array.
+        """
+        if self.solar_array is None or self.data is None:
+            return None
+
+        source = self._solar_source
+        if (
+            source is None
+            or source[0] is not self.data
+            or source[1] != self.solar_array
+        ):
+            self._solar_source = (self.data, self.solar_array)
+            self._solar = compute_solar_forecast(
+                self.data.hourly(),
+                self.hass.config.latitude if self.latitude is None else self.latitude,
+                self.hass.config.longitude
+                if self.longitude is None
+                else self.longitude,
+                self.solar_array,
+            )
+        return self._solar
+
+    def current_conditions(self) -> PirateWeatherDataPoint:
+        """Return the current conditions, advanced between polls when enabled."""
+        if not self.interpolate_current:
+            return self.data.currently()
+
+        if self._current_source is not self.data:
+            self._current_source = self.data
+            self._current = self.data.currently_at(time.time(), INTERPOLATED_FIELDS)
+        return self._current
+
+    @callback
+    def async_add_current_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for interpolated current conditions and return a remove callback.
+
+        Listeners are only called between polls, when an interpolated field has
+        changed by more than its threshold.
+        """
+        self._current_listeners.append(update_callback)
+        self._async_start_interpolation()
+
+        @callback
+        def remove_listener() -> None:
+            self._current_listeners.remove(update_callback)
+            if not self._current_listeners:
+                self._async_stop_interpolation()
+
+        return remove_listener
+
+    @callback
+    def async_set_interpolation(self, interpolate_current: bool) -> None:
+        """Turn interpolated current conditions on or off."""
+        if interpolate_current == self.interpolate_current:
+            return
+
+        self.interpolate_current = interpolate_current
+        self._current_source = None
+        if interpolate_current:
+            self._async_start_interpolation()
+        else:
+            self._async_stop_interpolation()
+
+        for update_callback in list(self._current_listeners):
+            update_callback()
+
+    @callback
+    def _async_start_interpolation(self) -> None:
+        """Start the local timer advancing the current conditions."""
+        if (
+            self.interpolate_current
+            and self._current_listeners
+            and self._unsub_interpolation is None
+        ):
+            self._unsub_interpolation = async_track_time_interval(
+                self.hass,
+                self._async_interpolate,
+                timedelta(seconds=INTERPOLATION_INTERVAL),
+                name="pirateweather current conditions",
+            )
+
+    @callback
+    def _async_stop_interpolation(self) -> None:
+        """Stop the local timer advancing the current conditions."""
+        if self._unsub_interpolation is not None:
+            self._unsub_interpolation()
+            self._unsub_interpolation = None
+
+    @callback
+    def _async_interpolate(self, now: datetime) -> None:
+        """Advance the current conditions and notify listeners of real changes."""
+        if self.data is None:
+            return
+
+        previous = self.current_conditions()
+        current = self.data.currently_at(now.timestamp(), INTERPOLATED_FIELDS)
+        if not any(
+            _changed(previous.get(field), current.get(field), threshold)
+            for field, threshold in INTERPOLATED_FIELDS.items()
+        ):
+            return
+
+        self._current = current
+        for update_callback in list(self._current_listeners):
+            update_callback()
+
+    @callback
+    def async_push_forecast(
+        self, data: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> None:
+        """Validate a pushed forecast document and update listeners with it.
+
+        Raises vol.Invalid if the document is not a usable forecast.
+        """
+        data = FORECAST_DOCUMENT_SCHEMA(data)
+
+        # Sensors and derived fields assume the units the entry requests
+        units = data["flags"]["units"]
+        if units != self.requested_units:
+            raise vol.Invalid(
+                f"Pushed forecast is in {units} units, expected {self.requested_units}"
+            )
+
+        if self.data is not None:
+            current_time = self.data.currently().utime
+            if current_time is not None and data["currently"]["time"] < current_time:
+                raise vol.Invalid("Pushed forecast is older than the current forecast")
+
+        _LOGGER.debug("Pirate Weather data pushed for: %s", self.config_entry.title)
+        forecast = Forecast(data, None, headers or {})
+        derive_fields(forecast, self.requested_units)
+        self.async_set_updated_data(forecast)
+
+    def serialized_forecast(
+        self, blocks: tuple[str, ...] | None = None
+    ) -> tuple[str, bytes]:
+        """Return the strong ETag and JSON body of the latest forecast.
+
+        The body is the API's document, without the fields derived from it, and
+        the ETag is the hash of the body. If blocks are given, only those
+        forecast blocks are included alongside the location metadata. Documents
+        are serialized once per forecast.
+        """
+        if self._serialized_source is not self.data:
+            self._serialized_source = self.data
+            self._serialized = {}
+
+        key = blocks or ()
+        if key not in self._serialized:
+            document = self.data.json
+            if blocks:
+                document = {
+                    name: value
+                    for name, value in document.items()
+                    if name in blocks or name not in FORECAST_BLOCKS
+                }
+            body = json_bytes(document)
+            etag = f'"{hashlib.sha256(body).hexdigest()}"'
+            self._serialized[key] = (etag, body)
+
+        return self._serialized[key]
+
     async def _get_pw_weather(self):
         """Poll weather data from PW."""
 
@@ -81,37 +439,88 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         else:
             request_longitude = self.longitude
 
+        # Entries in the same grid cell make identical requests and share them
+        request_latitude = snap_to_grid(request_latitude, self.location_grid)
+        request_longitude = snap_to_grid(request_longitude, self.location_grid)
+
         _LOGGER.debug(
             "Request coordinates: %s, %s", request_latitude, request_longitude
         )
 
-        forecast_string = (
-            self.endpoint
-            + "/forecast/"
-            + self._api_key
-            + "/"
-            + str(request_latitude)
-            + ","
-            + str(request_longitude)
-            + "?units="
-            + self.requested_units
-            + "&extend=hourly"
-            + "&version=2"
-            + "&lang="
-            + self.language
-            + "&include=day_night_forecast"
+        forecast_string = build_forecast_url(
+            self.endpoint,
+            self._api_key,
+            request_latitude,
+            request_longitude,
+            self.requested_units,
+            self.language,
+            self.models,
         )
-        if self.models:
-            exclusions = ",".join(
-                m.strip() for m in self.models.split(",") if m.strip()
-            )
-            if exclusions:
-                forecast_string += "&exclude=" + exclusions
 
+        # Responses are shared while younger than half a scan interval, so an entry
+        # never mistakes its own previous fetch for a fresh one
+        cache_key = request_cache_key(forecast_string, self._api_key)
+        max_age = self.scan_interval.total_seconds() / 2
+        response_cache = async_get_response_cache(self.hass)
+        refresh_requested = self._refresh_requested
+        self._refresh_requested = False
+
+        if not self.location_grid and self.shared_cache is None:
+            # Entries that share nothing only take over the config flow's
+            # validation response on their first refresh
+            cached = None
+            if self.data is None and not refresh_requested:
+                cached = response_cache.get(cache_key, max_age)
+            if cached is not None:
+                return Forecast(cached, None, {})
+            return await self._fetch_forecast(forecast_string)
+
+        async with response_cache.lock(cache_key):
+            cached = None
+            if not refresh_requested:
+                cached = response_cache.get(cache_key, max_age)
+            if cached is not None:
+                _LOGGER.debug("Pirate Weather data shared with another entry")
+                return Forecast(cached, None, {})
+
+            if self.shared_cache is None:
+                forecast = await self._fetch_forecast(forecast_string)
+            else:
+                forecast = await self._get_shared_forecast(
+                    forecast_string, cache_key, max_age, refresh_requested
+                )
+
+            response_cache.set(cache_key, forecast.json, max_age)
+            return forecast
+
+    async def _get_shared_forecast(
+        self,
+        forecast_string: str,
+        cache_key: str,
+        max_age: float,
+        refresh_requested: bool,
+    ) -> Forecast:
+        """Return a forecast from the shared cache directory or fetch and store it."""
+        async with self.shared_cache.async_lock(cache_key):
+            cached = None
+            if not refresh_requested:
+                cached = await self.shared_cache.async_get(cache_key, max_age)
+            if cached is not None:
+                _LOGGER.debug("Pirate Weather data loaded from shared cache")
+                return Forecast(cached, None, {})
+
+            forecast = await self._fetch_forecast(forecast_string)
+            await self.shared_cache.async_set(cache_key, forecast.json)
+            return forecast
+
+    async def _fetch_forecast(self, forecast_string: str) -> Forecast:
+        """Fetch a forecast from the API."""
         session = async_get_clientsession(self.hass)
         async with session.get(forecast_string) as resp:
             resp.raise_for_status()
             json_text = await resp.json()
-            headers = resp.headers
+            headers = dict(resp.headers)
             _LOGGER.debug("Pirate Weather data update from: %s", self.endpoint)
-            return Forecast(json_text, resp, headers)
+            return Forecast(
+                json_text, ResponseInfo(str(resp.url), resp.status), headers
+            )
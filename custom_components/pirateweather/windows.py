@@ -0,0 +1,179 @@
+"""Search the forecast for the next window of weather meeting constraints."""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .forecast_models import PirateWeatherDataBlock
+
+_LOGGER = logging.getLogger(__name__)
+
+# Forecast field and bound of each constraint, in the units requested from the
+# API. Maximums are inclusive upper bounds and minimums inclusive lower bounds.
+WINDOW_CONSTRAINTS = {
+    "max_precip_probability": ("precipProbability", "max"),
+    "max_precip_intensity": ("precipIntensity", "max"),
+    "max_wind_speed": ("windSpeed", "max"),
+    "max_wind_gust": ("windGust", "max"),
+    "min_temperature": ("temperature", "min"),
+    "max_temperature": ("temperature", "max"),
+    "max_cloud_cover": ("cloudCover", "max"),
+    "max_humidity": ("humidity", "max"),
+}
+
+# Seconds covered by each point of the blocks windows are searched in
+WINDOW_BLOCKS = {"minutely": 60, "hourly": 3600}
+
+# Setting of a window definition limiting the hours searched
+HORIZON_SETTING = "horizon"
+
+
+@dataclass(frozen=True, slots=True)
+class WindowQuery:
+    """Consecutive points of a block that all meet every constraint.
+
+    The duration and horizon are in points of the block, and the constraints
+    are pairs of a WINDOW_CONSTRAINTS key and its bound.
+    """
+
+    duration: int
+    constraints: tuple[tuple[str, float], ...]
+    block: str = "hourly"
+    horizon: int | None = None
+
+    @property
+    def key(self) -> str:
+        """Return a key identifying the query of an hourly sensor."""
+        bounds = "_".join(f"{name}_{bound:g}" for name, bound in self.constraints)
+        if self.horizon is None:
+            return f"{self.duration}h_{bounds}"
+        return f"{self.duration}h_{bounds}_within_{self.horizon}h"
+
+    @property
+    def label(self) -> str:
+        """Return the name of the query of an hourly sensor."""
+        bounds = " ".join(
+            f"{name.replace('_', ' ').title()} {bound:g}"
+            for name, bound in self.constraints
+        )
+        if self.horizon is None:
+            return f"{self.duration}h {bounds}"
+        return f"{self.duration}h {bounds} Within {self.horizon}h"
+
+
+@dataclass(frozen=True, slots=True)
+class Window:
+    """A window found by a query, ending with the end of its last point."""
+
+    start: datetime | None = None
+    end: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the window as a service response."""
+        return {
+            "start": None if self.start is None else self.start.isoformat(),
+            "end": None if self.end is None else self.end.isoformat(),
+        }
+
+
+def find_window(
+    block: PirateWeatherDataBlock, query: WindowQuery, now: float
+) -> Window:
+    """Return the first window of the query from the point covering now.
+
+    The columns of the constraints are read directly and scanned once, counting
+    the run of consecutive points meeting every constraint, so the search is
+    linear in the horizon whatever the duration. Points with a missing value
+    never meet a constraint.
+    """
+    start = max(block.row_at(now), 0)
+    end = len(block.data)
+    if query.horizon is not None:
+        end = min(end, start + query.horizon)
+
+    times = block.column("time")
+    checks = [
+        (block.column(WINDOW_CONSTRAINTS[name][0]), WINDOW_CONSTRAINTS[name][1], bound)
+        for name, bound in query.constraints
+    ]
+    run = 0
+    for row in range(start, end):
+        if all(_meets(column[row], kind, bound) for column, kind, bound in checks):
+            run += 1
+        else:
+            run = 0
+        if run == query.duration:
+            first = times[row - run + 1]
+            return Window(
+                dt_util.utc_from_timestamp(first),
+                dt_util.utc_from_timestamp(times[row] + WINDOW_BLOCKS[query.block]),
+            )
+    return Window()
+
+
+def points_in(block: str, seconds: float) -> int:
+    """Return the number of points of a block covering a number of seconds."""
+    return max(math.ceil(seconds / WINDOW_BLOCKS[block]), 1)
+
+
+def parse_queries(value: str | None) -> list[WindowQuery]:
+    """Parse comma separated hourly window definitions.
+
+    A definition is hours followed by constraint=bound pairs, separated by
+    colons, ex. '3:max_precip_probability=0.2:max_wind_speed=10'. An optional
+    horizon=hours pair limits the search to the next hours, ex.
+    '3:max_precip_probability=0.2:horizon=12'. Invalid definitions are logged
+    and skipped.
+    """
+    queries = []
+    for definition in (value or "").split(","):
+        if not definition.strip():
+            continue
+        try:
+            queries.append(_parse_query(definition))
+        except ValueError as err:
+            _LOGGER.warning("Ignoring window %s: %s", definition.strip(), err)
+    return queries
+
+
+def _parse_query(definition: str) -> WindowQuery:
+    """Parse one window definition."""
+    hours, *parts = (part.strip() for part in definition.split(":"))
+    duration = int(hours)
+    if duration < 1:
+        raise ValueError("the window must cover at least one hour")
+    if not parts:
+        raise ValueError("expected hours:constraint=bound[:constraint=bound]")
+
+    constraints = []
+    horizon = None
+    for part in parts:
+        name, _, bound = part.partition("=")
+        name = name.strip()
+        if name == HORIZON_SETTING:
+            horizon = int(bound)
+            if horizon < duration:
+                raise ValueError("the horizon must cover the whole window")
+            continue
+        if name not in WINDOW_CONSTRAINTS:
+            raise ValueError(
+                f"constraint must be one of {', '.join(WINDOW_CONSTRAINTS)}"
+            )
+        constraints.append((name, float(bound)))
+    if not constraints:
+        raise ValueError("expected at least one constraint=bound")
+    return WindowQuery(duration, tuple(constraints), horizon=horizon)
+
+
+def _meets(value: Any, kind: str, bound: float) -> bool:
+    """Return whether a known value is within the bound of a constraint."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value == -999:
+        return False
+    return value <= bound if kind == "max" else value >= bound
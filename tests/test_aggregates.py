@@ -0,0 +1,48 @@
+"""Test the Pirate Weather hourly forecast aggregates."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.pirateweather.aggregates import (
+    AggregateWindow,
+    PrefixAggregates,
+    parse_windows,
+)
+
+
+def test_parse_windows(caplog: pytest.LogCaptureFixture) -> None:
+    """Test window definitions are parsed and invalid ones are skipped."""
+    windows = parse_windows(
+        "temperature:max:12, precip_accumulation:sum:24,,temperature:below:12:0,"
+        "temperature:max:0,temperature:median:12,temperature:above:12,"
+        "summary:max:12,wind_bearing:mean:12,fire_risk_level:above:12:3"
+    )
+
+    assert windows == [
+        AggregateWindow("temperature", "max", 12),
+        AggregateWindow("precip_accumulation", "sum", 24),
+        AggregateWindow("temperature", "below", 12, 0.0),
+    ]
+    assert windows[2].key == "temperature_below_0_12h"
+    assert windows[2].label == "Below 0 12h"
+    assert caplog.text.count("Ignoring aggregate") == 6
+    assert "wind_bearing cannot be aggregated" in caplog.text
+    assert parse_windows(None) == []
+
+
+def test_prefix_aggregates() -> None:
+    """Test every reduction reads the prefixes and skips missing values."""
+    aggregates = PrefixAggregates([3.0, -999, 1.0, 5.0, None, 2.0])
+
+    assert aggregates.reduce(AggregateWindow("t", "sum", 4)) == 9.0
+    assert aggregates.reduce(AggregateWindow("t", "mean", 4)) == 3.0
+    assert aggregates.reduce(AggregateWindow("t", "min", 3)) == 1.0
+    assert aggregates.reduce(AggregateWindow("t", "max", 3)) == 3.0
+    assert aggregates.reduce(AggregateWindow("t", "above", 6, 2.0)) == 2
+    assert aggregates.reduce(AggregateWindow("t", "below", 6, 2.5)) == 2
+    # Windows longer than the forecast cover the hours available
+    assert aggregates.reduce(AggregateWindow("t", "max", 48)) == 5.0
+
+    assert PrefixAggregates([]).reduce(AggregateWindow("t", "max", 3)) is None
+    assert PrefixAggregates([-999]).reduce(AggregateWindow("t", "mean", 3)) is None
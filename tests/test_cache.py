@@ -0,0 +1,130 @@
+"""Test the Pirate Weather response caches."""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.pirateweather.cache import (
+    ResponseCache,
+    SharedResponseCache,
+    request_cache_key,
+)
+
+
+def test_request_cache_key_hides_api_key(mock_api_key) -> None:
+    """Test cache keys depend on the request but not on the API key."""
+    url = f"https://api.pirateweather.net/forecast/{mock_api_key}/1,2?units=si"
+
+    key = request_cache_key(url, mock_api_key)
+
+    assert mock_api_key not in key
+    assert key == request_cache_key(url.replace(mock_api_key, "other"), "other")
+    assert key != request_cache_key(url.replace("units=si", "units=us"), mock_api_key)
+
+
+def test_response_cache_expiry_without_lock() -> None:
+    """Test expired responses stored without taking their lock are dropped."""
+    cache = ResponseCache()
+    data = {"currently": {"time": 1}}
+    now = time.monotonic()
+
+    # The config flow stores its response without taking the lock
+    cache.set("setup", data, 60)
+    assert cache.get("setup", 60) == data
+
+    with patch(
+        "custom_components.pirateweather.cache.time.monotonic",
+        return_value=now + 120,
+    ):
+        cache.lock("other")
+        cache.set("other", data, 60)
+        assert cache.get("setup", 60) is None
+        assert cache.get("other", 60) == data
+
+
+async def test_shared_cache_roundtrip(hass: HomeAssistant, tmp_path) -> None:
+    """Test responses are stored and expire after their maximum age."""
+    cache = SharedResponseCache(hass, str(tmp_path / "shared"))
+    data = {"currently": {"time": 1, "temperature": 10.5}}
+
+    assert await cache.async_get("key", 60) is None
+
+    async with cache.async_lock("key"):
+        await cache.async_set("key", data)
+
+    assert await cache.async_get("key", 60) == data
+    assert not list((tmp_path / "shared").glob("*.tmp*"))
+
+    with patch(
+        "custom_components.pirateweather.cache.time.time",
+        return_value=time.time() + 120,
+    ):
+        assert await cache.async_get("key", 60) is None
+
+
+async def test_shared_cache_corrupt_entry(hass: HomeAssistant, tmp_path) -> None:
+    """Test unreadable entries are treated as missing."""
+    cache = SharedResponseCache(hass, str(tmp_path))
+    (tmp_path / "key.json").write_text("{not json")
+
+    assert await cache.async_get("key", 60) is None
+
+
+async def test_shared_cache_lock_waits_on_event_loop(
+    hass: HomeAssistant, tmp_path
+) -> None:
+    """Test waiting for another instance's lock does not hold an executor thread."""
+    cache = SharedResponseCache(hass, str(tmp_path))
+    with (tmp_path / "key.lock").open("a") as other:
+        fcntl.flock(other, fcntl.LOCK_EX)
+
+        with patch("custom_components.pirateweather.cache.LOCK_POLL_INTERVAL", 0.01):
+            waiter = hass.async_create_task(_hold_lock(cache))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            fcntl.flock(other, fcntl.LOCK_UN)
+            assert await waiter
+
+        # Without the lock in time the fetch goes ahead unlocked
+        fcntl.flock(other, fcntl.LOCK_EX)
+        with patch("custom_components.pirateweather.cache.LOCK_TIMEOUT", 0):
+            assert await _hold_lock(cache)
+
+
+async def test_shared_cache_lock_cancelled(hass: HomeAssistant, tmp_path) -> None:
+    """Test a lock taken after its waiter was cancelled is given back."""
+    cache = SharedResponseCache(hass, str(tmp_path))
+    entered = threading.Event()
+    proceed = threading.Event()
+    try_lock = SharedResponseCache.__dict__["_try_lock"]
+
+    def slow_try_lock(self, lock_file):
+        entered.set()
+        proceed.wait(5)
+        return try_lock(self, lock_file)
+
+    with patch.object(SharedResponseCache, "_try_lock", slow_try_lock):
+        waiter = hass.async_create_task(_hold_lock(cache))
+        await hass.async_add_executor_job(entered.wait, 5)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        proceed.set()
+        await hass.async_block_till_done()
+
+    with (tmp_path / "key.lock").open("a") as other:
+        fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+async def _hold_lock(cache: SharedResponseCache) -> bool:
+    """Take and release the lock of a cache entry."""
+    async with cache.async_lock("key"):
+        return True
@@ -5,6 +5,7 @@ from __future__ import annotations
 from unittest.mock import AsyncMock, Mock, patch
 
 from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
@@ -159,3 +160,34 @@ async def test_options_flow(
     result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
     assert result["type"] is FlowResultType.FORM
     assert result["step_id"] == "init"
+
+
+async def test_form_response_reused_for_first_refresh(
+    hass: HomeAssistant,
+    mock_get_clientsession_config_flow,
+    mock_get_clientsession,
+    mock_api_key,
+    mock_latitude,
+) -> None:
+    """Test the validation response is handed to the new entry's coordinator."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_API_KEY: mock_api_key,
+            CONF_LATITUDE: mock_latitude,
+            CONF_LONGITUDE: -122.4233,
+            CONF_NAME: DEFAULT_NAME,
+            CONF_ENDPOINT: DEFAULT_ENDPOINT,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result2["type"] is FlowResultType.CREATE_ENTRY
+    entry = hass.config_entries.async_get_entry(result2["result"].entry_id)
+    assert entry.state is ConfigEntryState.LOADED
+    # Setting up the entry only cost the validation request
+    assert mock_get_clientsession.return_value.get.call_count == 1
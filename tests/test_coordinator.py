@@ -8,9 +8,11 @@ from unittest.mock import AsyncMock, Mock, patch
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.pirateweather.cache import SharedResponseCache
 from custom_components.pirateweather.const import DEFAULT_ENDPOINT, DOMAIN
 from custom_components.pirateweather.weather_update_coordinator import (
     WeatherUpdateCoordinator,
+    snap_to_grid,
 )
 
 
@@ -150,3 +152,116 @@ async def test_coordinator_with_models_exclusion(
     mock_get_clientsession.return_value.get.assert_called()
     call_args = mock_get_clientsession.return_value.get.call_args
     assert "exclude=" in call_args[0][0]
+
+
+async def test_coordinator_shared_cache(  # noqa: PLR0917
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_api_key,
+    mock_latitude,
+    mock_longitude,
+    tmp_path,
+) -> None:
+    """Test coordinators sharing a cache directory only fetch once."""
+    coordinators = []
+    for unique_id in ("production", "staging"):
+        entry = MockConfigEntry(
+            version=2,
+            domain=DOMAIN,
+            data={},
+            unique_id=unique_id,
+        )
+        coordinators.append(
+            WeatherUpdateCoordinator(
+                api_key=mock_api_key,
+                latitude=mock_latitude,
+                longitude=mock_longitude,
+                scan_interval=timedelta(seconds=300),
+                language="en",
+                endpoint=DEFAULT_ENDPOINT,
+                units="us",
+                hass=hass,
+                config_entry=entry,
+                models=None,
+                shared_cache=SharedResponseCache(hass, str(tmp_path)),
+            )
+        )
+
+    for coordinator in coordinators:
+        await coordinator.async_refresh()
+
+    assert mock_get_clientsession.return_value.get.call_count == 1
+    assert coordinators[0].data.json == coordinators[1].data.json
+
+
+def test_snap_to_grid() -> None:
+    """Test coordinates are quantized to the configured grid."""
+    assert snap_to_grid(37.8267, None) == 37.8267
+    assert snap_to_grid(37.8267, 0.25) == 37.75
+    assert snap_to_grid(-122.4233, 0.25) == -122.5
+    assert snap_to_grid(37.8267, 0.03) == 37.83
+
+
+async def test_coordinators_in_same_grid_cell_share_fetch(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_api_key,
+) -> None:
+    """Test nearby entries snapped to the same grid point make one request."""
+    coordinators = [
+        WeatherUpdateCoordinator(
+            api_key=mock_api_key,
+            latitude=latitude,
+            longitude=longitude,
+            scan_interval=timedelta(seconds=300),
+            language="en",
+            endpoint=DEFAULT_ENDPOINT,
+            units="us",
+            hass=hass,
+            config_entry=MockConfigEntry(version=2, domain=DOMAIN, data={}),
+            models=None,
+            location_grid=0.25,
+        )
+        for latitude, longitude in ((37.8267, -122.4233), (37.80, -122.45))
+    ]
+
+    for coordinator in coordinators:
+        await coordinator.async_refresh()
+
+    mock_get = mock_get_clientsession.return_value.get
+    assert mock_get.call_count == 1
+    assert "/37.75,-122.5?" in mock_get.call_args[0][0]
+    assert coordinators[1].data.currently().temperature == 62.64
+    # Each entry parses and derives its own forecast from the shared response
+    assert coordinators[0].data is not coordinators[1].data
+
+    # A refresh requested by the user fetches a new forecast
+    await coordinators[1].async_request_refresh()
+    assert mock_get.call_count == 2
+
+
+async def test_coordinator_without_sharing_fetches_each_refresh(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_api_key,
+    mock_latitude,
+    mock_longitude,
+) -> None:
+    """Test entries that share nothing never serve a cached response."""
+    coordinator = WeatherUpdateCoordinator(
+        api_key=mock_api_key,
+        latitude=mock_latitude,
+        longitude=mock_longitude,
+        scan_interval=timedelta(seconds=300),
+        language="en",
+        endpoint=DEFAULT_ENDPOINT,
+        units="us",
+        hass=hass,
+        config_entry=MockConfigEntry(version=2, domain=DOMAIN, data={}),
+        models=None,
+    )
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert mock_get_clientsession.return_value.get.call_count == 2
@@ -0,0 +1,78 @@
+"""Test the Pirate Weather derived indices."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from custom_components.pirateweather.derived import (
+    DERIVED_FIELDS,
+    derive_fields,
+    heat_index,
+    humidex,
+    wet_bulb_temperature,
+    wind_chill,
+)
+from custom_components.pirateweather.forecast_models import Forecast
+
+
+def test_indices() -> None:
+    """Test the indices against published reference values."""
+    # NWS heat index table: 90 °F at 70 % humidity feels like 106 °F
+    assert heat_index(32.22, 0.7) * 9 / 5 + 32 == pytest.approx(106, abs=0.5)
+    # Environment Canada wind chill table: -10 °C with 20 km/h wind is -18 °C
+    assert wind_chill(-10, 20) == pytest.approx(-18, abs=0.5)
+    assert wind_chill(15, 20) == 15
+    assert humidex(30, 15) == pytest.approx(34, abs=0.5)
+    # Stull 2011: 20 °C at 50 % humidity has a wet-bulb temperature of 13.7 °C
+    assert wet_bulb_temperature(20, 0.5) == pytest.approx(13.7, abs=0.1)
+
+
+def test_derive_fields(mock_pirate_weather_response) -> None:
+    """Test the indices are added to every block in the entry's units."""
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    payload["hourly"]["data"].append(
+        {**payload["hourly"]["data"][0], "temperature": -999}
+    )
+    forecast = Forecast(payload, None, {})
+
+    derive_fields(forecast, "us")
+
+    currently = forecast.currently()
+    assert currently.windChill == currently.temperature
+    assert currently.heatingDegreeHours == pytest.approx(65 - currently.temperature)
+    assert currently.coolingDegreeHours == 0
+    # Daily points use their high and low over the whole day
+    daily = forecast.daily().data[0]
+    mean = (daily.temperatureHigh + daily.temperatureLow) / 2
+    assert daily.heatingDegreeHours == pytest.approx((65 - mean) * 24)
+    # Missing inputs give missing indices
+    hourly = forecast.hourly().data
+    assert all(hourly[0].get(name) is not None for name in DERIVED_FIELDS)
+    assert hourly[1].heatIndex is None
+    assert hourly[1].humidity == hourly[0].humidity
+
+    # The API document is unchanged and deriving again changes nothing
+    assert forecast.json == payload
+    assert forecast.added_fields("hourly") == set(DERIVED_FIELDS)
+    derive_fields(forecast, "us")
+    assert forecast.json == payload
+    assert forecast.hourly().data[0].heatIndex == hourly[0].heatIndex
+
+    # A forecast parsed from the document derives the same indices
+    reparsed = Forecast(forecast.json, None, {})
+    derive_fields(reparsed, "us")
+    assert reparsed.currently().as_dict() == currently.as_dict()
+
+
+def test_derive_fields_metric(mock_pirate_weather_response) -> None:
+    """Test metric entries derive from °C and wind speeds in m/s."""
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    payload["currently"].update(temperature=-10, windSpeed=20 / 3.6)
+    forecast = Forecast(payload, None, {})
+
+    derive_fields(forecast, "si")
+
+    assert forecast.currently().windChill == pytest.approx(-18, abs=0.5)
+    assert forecast.currently().heatingDegreeHours == 28
@@ -0,0 +1,412 @@
+"""Test the Pirate Weather sensor dispatcher and write policies."""
+
+from __future__ import annotations
+
+import copy
+from unittest.mock import patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import CONF_MONITORED_CONDITIONS, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.pirateweather.const import (
+    CONF_FORECAST_SERIES,
+    CONF_INTERPOLATE_CURRENT,
+    CONF_UNITS,
+    CONF_WRITE_POLICIES,
+    DOMAIN,
+    ENTRY_WEATHER_COORDINATOR,
+    PW_PLATFORM,
+)
+from custom_components.pirateweather.dispatcher import (
+    DEFAULT_WRITE_POLICY,
+    WritePolicy,
+    get_write_policy,
+    parse_write_policies,
+)
+from custom_components.pirateweather.forecast_models import Forecast
+
+
+def test_write_policy_deadbands() -> None:
+    """Test absolute and relative deadbands."""
+    absolute = WritePolicy(absolute=0.5)
+    assert not absolute.should_write(20.0, 20.3, 60, False)
+    assert absolute.should_write(20.0, 20.5, 60, False)
+
+    relative = WritePolicy(relative=0.1)
+    assert not relative.should_write(10.0, 10.5, 60, False)
+    assert relative.should_write(10.0, 11.0, 60, False)
+
+    assert not DEFAULT_WRITE_POLICY.should_write(1.0, 1.0, 60, False)
+    assert DEFAULT_WRITE_POLICY.should_write(1.0, 1.01, 60, False)
+    assert DEFAULT_WRITE_POLICY.should_write("Clear", "Rain", 60, False)
+    assert DEFAULT_WRITE_POLICY.should_write(1.0, None, 60, False)
+
+
+def test_write_policy_intervals() -> None:
+    """Test far horizon minimum and forced maximum write intervals."""
+    policy = WritePolicy(absolute=1, min_interval=3600, max_interval=21600)
+
+    assert not policy.should_write(10.0, 15.0, 600, True)
+    assert policy.should_write(10.0, 15.0, 3600, True)
+    assert not policy.should_write(10.0, 10.1, 3600, False)
+    assert policy.should_write(10.0, 10.1, 21600, False)
+
+
+def test_get_write_policy() -> None:
+    """Test conditions take precedence over device classes."""
+    assert get_write_policy("wind_bearing", None).absolute == 5
+    assert (
+        get_write_policy("temperature", SensorDeviceClass.TEMPERATURE).absolute == 0.1
+    )
+    assert get_write_policy("summary", None) is DEFAULT_WRITE_POLICY
+
+
+def test_parse_write_policies(caplog: pytest.LogCaptureFixture) -> None:
+    """Test overrides keep the default settings they leave out."""
+    policies = parse_write_policies(
+        "temperature:absolute=0.5, precipitation:relative=0.1:max_interval=3600,"
+        "humidity,wind_bearing:deadband=1,cape:absolute=-1"
+    )
+
+    assert policies == {
+        "temperature": WritePolicy(absolute=0.5),
+        "precipitation": WritePolicy(
+            absolute=0.001, relative=0.1, max_interval=3600
+        ),
+    }
+    assert caplog.text.count("Ignoring write policy") == 3
+    assert parse_write_policies(None) == {}
+
+    # Overrides of a condition come before its device class
+    assert get_write_policy("dew_point", SensorDeviceClass.TEMPERATURE, policies) == (
+        WritePolicy(absolute=0.5)
+    )
+    assert (
+        get_write_policy("wind_bearing", None, {"wind_bearing": DEFAULT_WRITE_POLICY})
+        is DEFAULT_WRITE_POLICY
+    )
+
+
+async def test_dispatcher_write_policy_option(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test write policies of the options override the defaults."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+    config_data[CONF_WRITE_POLICIES] = "temperature:absolute=5"
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_dispatcher_policy_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    initial = hass.states.get("sensor.pirateweather_temperature")
+
+    data = copy.deepcopy(mock_pirate_weather_response)
+    data["currently"]["temperature"] += 2
+    freezer.tick(60)
+    coordinator.async_set_updated_data(Forecast(data, None, {}))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.pirateweather_temperature")
+    assert state.last_reported == initial.last_reported
+
+    # Removing the override restores the default deadband without a reload
+    hass.config_entries.async_update_entry(
+        entry, options={**config_data, CONF_WRITE_POLICIES: ""}
+    )
+    await hass.async_block_till_done()
+
+    data = copy.deepcopy(data)
+    data["currently"]["temperature"] += 2
+    freezer.tick(60)
+    coordinator.async_set_updated_data(Forecast(data, None, {}))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.pirateweather_temperature")
+    assert state.last_reported > initial.last_reported
+    assert state.state != initial.state
+
+
+async def test_dispatcher_applies_deadband(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test insignificant changes are not written after a coordinator update."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_dispatcher_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    initial = hass.states.get("sensor.pirateweather_temperature")
+
+    data = copy.deepcopy(mock_pirate_weather_response)
+    data["currently"]["temperature"] += 0.01
+    freezer.tick(60)
+    coordinator.async_set_updated_data(Forecast(data, None, {}))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.pirateweather_temperature")
+    assert state.last_reported == initial.last_reported
+
+    data = copy.deepcopy(data)
+    data["currently"]["temperature"] += 2
+    freezer.tick(60)
+    coordinator.async_set_updated_data(Forecast(data, None, {}))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.pirateweather_temperature")
+    assert state.last_reported > initial.last_reported
+    assert state.state != initial.state
+
+
+async def test_dispatcher_writes_attribute_changes(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test attribute changes are written when the state stays within its deadband."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly.append({**hourly[0], "time": start + 3600, "temperature": 66.0})
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature"]
+    config_data["hourly_forecast"] = "0,1"
+    config_data[CONF_FORECAST_SERIES] = True
+    config_data[PW_PLATFORM] = ["Sensor"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_dispatcher_attributes_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    initial = hass.states.get("sensor.pirateweather_temperature_hourly")
+
+    # Only the next hour of the series changes
+    data = copy.deepcopy(mock_pirate_weather_response)
+    data["hourly"]["data"][1]["temperature"] = 70.0
+    freezer.tick(60)
+    coordinator.async_set_updated_data(Forecast(data, None, {}))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.pirateweather_temperature_hourly")
+    assert state.state == initial.state
+    assert state.last_reported > initial.last_reported
+    assert state.attributes["forecast"][1] == [start + 3600, 70.0]
+
+
+async def test_dispatcher_writes_in_chunks(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test a large entry is written in chunks from a single parse of the blocks."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = [
+        "temperature",
+        "humidity",
+        "pressure",
+        "dew_point",
+    ]
+    config_data["hourly_forecast"] = "0"
+    config_data[PW_PLATFORM] = ["Sensor"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_dispatcher_chunks_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    temperature = hass.states.get("sensor.pirateweather_temperature").state
+
+    data = copy.deepcopy(mock_pirate_weather_response)
+    data["currently"]["temperature"] += 2
+    data["hourly"]["data"][0]["humidity"] -= 0.1
+    freezer.tick(60)
+
+    with (
+        patch("custom_components.pirateweather.dispatcher.DISPATCH_CHUNK_SIZE", 2),
+        patch.object(
+            Forecast, "hourly", autospec=True, side_effect=Forecast.hourly
+        ) as mock_hourly,
+    ):
+        coordinator.async_set_updated_data(Forecast(data, None, {}))
+        await hass.async_block_till_done()
+
+    assert mock_hourly.call_count == 1
+    assert hass.states.get("sensor.pirateweather_temperature").state != temperature
+    assert hass.states.get("sensor.pirateweather_humidity_0h").state == "70"
+
+
+async def test_dispatcher_rolls_over_relative_sensors(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test relative sensors move to the next hour between polls."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly.extend(
+        {**hourly[0], "time": start + hour * 3600, "temperature": 64.02 + hour * 2}
+        for hour in (1, 2)
+    )
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "humidity"]
+    config_data["hourly_forecast"] = "0,1"
+    config_data[CONF_SCAN_INTERVAL] = 86400
+    config_data[PW_PLATFORM] = ["Sensor"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_dispatcher_rollover_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    current = hass.states.get("sensor.pirateweather_temperature")
+    hour_0 = hass.states.get("sensor.pirateweather_temperature_0h").state
+    hour_1 = hass.states.get("sensor.pirateweather_temperature_1h").state
+    humidity = hass.states.get("sensor.pirateweather_humidity_0h")
+
+    freezer.move_to(dt_util.utc_from_timestamp(start + 3600))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.pirateweather_temperature_0h").state == hour_1
+    assert hass.states.get("sensor.pirateweather_temperature_1h").state not in {
+        hour_0,
+        hour_1,
+    }
+    # Sensors for the current conditions are not rewritten
+    state = hass.states.get("sensor.pirateweather_temperature")
+    assert state.last_reported == current.last_reported
+    # Relative sensors whose value did not change are not rewritten either
+    state = hass.states.get("sensor.pirateweather_humidity_0h")
+    assert state.last_reported == humidity.last_reported
+    # Only the initial refresh should have hit the API
+    assert mock_get_clientsession.return_value.get.call_count == 1
+
+    freezer.move_to(dt_util.utc_from_timestamp(start + 7200))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.pirateweather_temperature_1h").state == "unknown"
+
+
+async def test_dispatcher_writes_interpolated_current_conditions(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test current conditions advance between polls when interpolation is on."""
+    currently = mock_pirate_weather_response["currently"]
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    # The next hour is 780 seconds after the currently point and 4 degrees warmer
+    next_hour = hourly[0]["time"] + 3600
+    hourly.append({**hourly[0], "time": next_hour, "temperature": 66.64})
+    freezer.move_to(dt_util.utc_from_timestamp(currently["time"]))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "dew_point"]
+    config_data[CONF_SCAN_INTERVAL] = 86400
+    config_data[PW_PLATFORM] = ["Sensor", "Weather"]
+    config_data[CONF_INTERPOLATE_CURRENT] = True
+    # Metric units keep the states equal to the API values
+    config_data[CONF_UNITS] = "si"
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_dispatcher_interpolation_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.pirateweather_temperature").state) == 62.64
+    dew_point = hass.states.get("sensor.pirateweather_dew_point")
+
+    for minute in range(1, 8):
+        freezer.move_to(dt_util.utc_from_timestamp(currently["time"] + minute * 60))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    expected = 62.64 + 4 * 420 / 780
+    temperature = hass.states.get("sensor.pirateweather_temperature")
+    assert float(temperature.state) == pytest.approx(expected, abs=0.01)
+    weather = hass.states.get("weather.pirateweather")
+    assert weather.attributes["temperature"] == pytest.approx(expected, abs=0.1)
+    # Conditions that are not interpolated are left alone
+    state = hass.states.get("sensor.pirateweather_dew_point")
+    assert state.last_reported == dew_point.last_reported
+    # Only the initial refresh should have hit the API
+    assert mock_get_clientsession.return_value.get.call_count == 1
+
+    # Without interpolation the current conditions are shown again
+    hass.config_entries.async_update_entry(
+        entry, options={**config_data, CONF_INTERPOLATE_CURRENT: False}
+    )
+    await hass.async_block_till_done()
+
+    temperature = hass.states.get("sensor.pirateweather_temperature")
+    assert float(temperature.state) == 62.64
+    assert mock_get_clientsession.return_value.get.call_count == 1
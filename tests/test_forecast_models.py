@@ -0,0 +1,183 @@
+"""Test the Pirate Weather forecast models."""
+
+from __future__ import annotations
+
+import copy
+import datetime
+import gc
+import tracemalloc
+
+import pytest
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from custom_components.pirateweather.forecast_models import (
+    Forecast,
+    PirateWeatherDataPoint,
+)
+
+
+def _full_payload(response: dict) -> dict:
+    """Return the fixture extended to a full extend=hourly payload."""
+
+    def series(point: dict, count: int, step: int) -> list[dict]:
+        points = []
+        for i in range(count):
+            new_point = {}
+            for key, value in point.items():
+                if key == "time" or key.endswith("Time"):
+                    value += i * step
+                elif isinstance(value, float) and value:
+                    # Realistic values differ from point to point
+                    value = round(value + (i % 24) * 0.37 - i * 0.013, 2)
+                new_point[key] = value
+            points.append(new_point)
+        return points
+
+    payload = copy.deepcopy(response)
+    payload["minutely"]["data"] = series(response["minutely"]["data"][0], 61, 60)
+    payload["hourly"]["data"] = series(response["hourly"]["data"][0], 168, 3600)
+    payload["daily"]["data"] = series(response["daily"]["data"][0], 8, 86400)
+    return payload
+
+
+def _allocated(factory) -> tuple[int, object]:
+    """Return the memory still allocated by the object a factory builds."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = factory()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return size, result
+
+
+def test_data_point_fields(mock_pirate_weather_response) -> None:
+    """Test data points expose their fields like the raw JSON objects."""
+    forecast = Forecast(copy.deepcopy(mock_pirate_weather_response), None, {})
+    raw = mock_pirate_weather_response["hourly"]["data"][0]
+    point = forecast.hourly().data[0]
+
+    assert point.temperature == raw["temperature"]
+    assert point.get("temperature") == raw["temperature"]
+    assert point["icon"] == raw["icon"]
+    assert "humidity" in point
+    assert point.notAField is None
+    assert point.get("notAField", 1) == 1
+    assert point.d == raw
+
+    assert point.utime == raw["time"]
+    assert point.time == datetime.datetime.fromtimestamp(raw["time"], datetime.UTC)
+    assert point.time.tzinfo is not None
+    assert point.sunriseTime is None
+    assert forecast.daily().data[0].sunriseTime.tzinfo is not None
+
+    empty = PirateWeatherDataPoint()
+    assert empty.time is None
+    assert empty.temperature is None
+
+
+def test_forecast_round_trip(mock_pirate_weather_response) -> None:
+    """Test a forecast rebuilds the document it was parsed from."""
+    forecast = Forecast(copy.deepcopy(mock_pirate_weather_response), None, {})
+
+    assert forecast.json == mock_pirate_weather_response
+    assert forecast.currently() is forecast.currently()
+    assert forecast.offset() == mock_pirate_weather_response["offset"]
+
+    # Added fields are readable from the points but not part of the document
+    hours = len(forecast.hourly().data)
+    forecast.add_fields("currently", {"extra": [1.5]})
+    forecast.add_fields("hourly", {"extra": [2.5] * hours})
+    assert forecast.currently().extra == 1.5
+    assert forecast.hourly().data[0].extra == 2.5
+    assert forecast.json == mock_pirate_weather_response
+
+
+def test_forecast_shares_layout_and_values(mock_pirate_weather_response) -> None:
+    """Test points of a block share strings without changing value types."""
+    forecast = Forecast(_full_payload(mock_pirate_weather_response), None, {})
+    first, last = forecast.hourly().data[0], forecast.hourly().data[-1]
+
+    assert first.icon is last.icon
+    assert type(first.windBearing) is int
+    assert type(first.precipIntensity) is float
+
+
+def test_forecast_memory_footprint(mock_pirate_weather_response) -> None:
+    """Test a parsed forecast is several times smaller than its JSON document."""
+    body = json_bytes(_full_payload(mock_pirate_weather_response))
+
+    raw_size, _ = _allocated(lambda: json_loads(body))
+    forecast_size, forecast = _allocated(lambda: Forecast(json_loads(body), None, {}))
+
+    assert len(forecast.hourly().data) == 168
+    assert forecast_size * 4 < raw_size
+
+
+def test_block_value_at(mock_pirate_weather_response) -> None:
+    """Test values are looked up by time and interpolated between points."""
+    forecast = Forecast(_full_payload(mock_pirate_weather_response), None, {})
+    hourly = forecast.hourly()
+    first, second = hourly.data[0], hourly.data[1]
+
+    assert hourly.covers(first.utime)
+    assert not hourly.covers(first.utime - 1)
+    assert hourly.value_at("temperature", first.utime) == first.temperature
+    assert hourly.value_at("temperature", first.utime + 900) == pytest.approx(
+        first.temperature + (second.temperature - first.temperature) / 4
+    )
+    assert hourly.value_at("icon", first.utime + 900) == first.icon
+    assert hourly.value_at("notAField", first.utime + 900) is None
+    assert hourly.value_at("temperature", first.utime - 1) is None
+    assert hourly.value_at("temperature", hourly.data[-1].utime + 1) is None
+
+
+def test_block_value_at_bearings_and_times(mock_pirate_weather_response) -> None:
+    """Test bearings turn along the shortest arc and timestamps are held."""
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    hourly = payload["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly[0].update(windBearing=350, nearestStormBearing=10, sunriseTime=start)
+    hourly.append(
+        {
+            **hourly[0],
+            "time": start + 3600,
+            "windBearing": 10,
+            "nearestStormBearing": 330,
+            "sunriseTime": start + 86400,
+        }
+    )
+    block = Forecast(payload, None, {}).hourly()
+
+    assert block.value_at("windBearing", start + 1800) == pytest.approx(0)
+    assert block.value_at("windBearing", start + 900) == pytest.approx(355)
+    assert block.value_at("windBearing", start + 2700) == pytest.approx(5)
+    assert block.value_at("nearestStormBearing", start + 1800) == pytest.approx(350)
+    assert block.value_at("sunriseTime", start + 1800) == start
+    assert block.value_at("time", start + 1800) == start
+
+
+def test_currently_at(mock_pirate_weather_response) -> None:
+    """Test current conditions are advanced towards the following points."""
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    currently = payload["currently"]
+    hourly = payload["hourly"]["data"]
+    next_hour = hourly[0]["time"] + 3600
+    hourly.append({**hourly[0], "time": next_hour, "temperature": 66.64})
+    forecast = Forecast(payload, None, {})
+    fields = ("temperature", "precipIntensity", "icon")
+
+    assert forecast.currently_at(currently["time"], fields) is forecast.currently()
+
+    halfway = (currently["time"] + next_hour) / 2
+    point = forecast.currently_at(halfway, fields)
+    assert point.temperature == pytest.approx(64.64)
+    assert point.icon == currently["icon"]
+    assert point.precipIntensity == currently["precipIntensity"]
+
+    later = forecast.currently_at(next_hour + 1, fields)
+    assert later.temperature == currently["temperature"]
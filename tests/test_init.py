@@ -2,15 +2,39 @@
 
 from __future__ import annotations
 
+import gc
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
+import pytest
 from aiohttp import ClientError
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    CONF_MONITORED_CONDITIONS,
+    CONF_SCAN_INTERVAL,
+    STATE_UNAVAILABLE,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntryType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.pirateweather.const import DOMAIN
+from custom_components import pirateweather
+from custom_components.pirateweather.cache import DATA_RESPONSE_CACHE
+from custom_components.pirateweather.const import (
+    CONF_UNITS,
+    DOMAIN,
+    ENTRY_WEATHER_COORDINATOR,
+    PW_PLATFORM,
+    PW_ROUND,
+)
+from custom_components.pirateweather.forecast_models import Forecast
+from custom_components.pirateweather.sensor import PirateWeatherSensor
+from custom_components.pirateweather.weather_update_coordinator import (
+    WeatherUpdateCoordinator,
+)
 
 
 async def test_setup_entry(
@@ -97,3 +121,140 @@ async def test_setup_entry_with_coordinator_error(
         await hass.async_block_till_done()
 
         assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_update_options_without_reload(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test sensor and rounding options are applied without reloading the entry."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "humidity"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_options_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    temperature = hass.states.get("sensor.pirateweather_temperature")
+    assert float(temperature.state) == pytest.approx(17.02, abs=0.01)
+
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            CONF_MONITORED_CONDITIONS: ["temperature", "pressure"],
+            PW_ROUND: "Yes",
+            CONF_SCAN_INTERVAL: 1800,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR] is coordinator
+    assert coordinator.update_interval == timedelta(seconds=1800)
+    assert mock_get_clientsession.return_value.get.call_count == 1
+
+    assert hass.states.get("sensor.pirateweather_pressure") is not None
+    # Removed sensors are left unavailable, as after a reload
+    assert hass.states.get("sensor.pirateweather_humidity").state == STATE_UNAVAILABLE
+    # 62.64°F is now rounded to 63°F before conversion
+    temperature = hass.states.get("sensor.pirateweather_temperature")
+    assert float(temperature.state) == pytest.approx(17.22, abs=0.01)
+
+
+async def test_update_options_reload(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry,
+) -> None:
+    """Test options that change the API request reload the entry."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    domain_data = hass.data[DOMAIN][mock_config_entry.entry_id]
+    coordinator = domain_data[ENTRY_WEATHER_COORDINATOR]
+
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_UNITS: "si"}
+    )
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    domain_data = hass.data[DOMAIN][mock_config_entry.entry_id]
+    assert domain_data[ENTRY_WEATHER_COORDINATOR] is not coordinator
+    assert domain_data[CONF_UNITS] == "si"
+
+
+async def test_reload_releases_coordinators(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test repeated reloads keep memory and object counts flat."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "humidity"]
+    config_data[PW_PLATFORM] = ["Sensor", "Weather"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_reload_unique_id",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    def live(cls: type) -> int:
+        return sum(isinstance(obj, cls) for obj in gc.get_objects())
+
+    async def reload(times: int) -> None:
+        for _ in range(times):
+            assert await hass.config_entries.async_reload(entry.entry_id)
+            await hass.async_block_till_done()
+            # The mock session would otherwise keep every request URL
+            mock_get_clientsession.return_value.reset_mock()
+
+    # Warm up caches before measuring
+    await reload(20)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        await reload(200)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    # Only count memory allocated by the integration, not by the test harness
+    integration = [tracemalloc.Filter(True, f"{Path(pirateweather.__file__).parent}/*")]
+    grown = sum(
+        stat.size_diff
+        for stat in after.filter_traces(integration).compare_to(
+            before.filter_traces(integration), "filename"
+        )
+    )
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert live(WeatherUpdateCoordinator) == 1
+    assert live(Forecast) <= 1
+    assert live(PirateWeatherSensor) == 2
+    assert set(hass.data[DOMAIN]) <= {entry.entry_id, DATA_RESPONSE_CACHE}
+    # The live forecast was parsed while tracing, a leak would grow with each reload
+    assert grown < 32 * 1024
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert coordinator.data is None
+    assert hass.data[DOMAIN] == {}
@@ -0,0 +1,71 @@
+"""Test the Pirate Weather precipitation nowcast."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.pirateweather.forecast_models import Forecast
+from custom_components.pirateweather.nowcast import compute_nowcast
+
+
+def _minutely(response: dict, intensities: list[float]) -> Forecast:
+    """Return a forecast whose minutely block has the given intensities."""
+    payload = copy.deepcopy(response)
+    first = payload["minutely"]["data"][0]
+    payload["minutely"]["data"] = [
+        {
+            **first,
+            "time": first["time"] + minute * 60,
+            "precipIntensity": intensity,
+            "precipProbability": 0.9 if intensity else 0.0,
+        }
+        for minute, intensity in enumerate(intensities)
+    ]
+    return Forecast(payload, None, {})
+
+
+def test_nowcast_onset_and_end(mock_pirate_weather_response) -> None:
+    """Test precipitation starting and ending within the hour."""
+    forecast = _minutely(mock_pirate_weather_response, [0.0, 0.0, 1.2, 3.6, 0.0, 0.0])
+    start = forecast.minutely().data[0].utime
+
+    nowcast = compute_nowcast(forecast.minutely(), start + 30)
+
+    assert not nowcast.precipitating
+    assert nowcast.onset == dt_util.utc_from_timestamp(start + 120)
+    assert nowcast.end == dt_util.utc_from_timestamp(start + 240)
+    assert nowcast.peak_intensity == 3.6
+    assert nowcast.peak_time == dt_util.utc_from_timestamp(start + 180)
+    # Trapezoids of 0.6, 2.4 and 1.8 intensity over one minute each
+    assert nowcast.accumulation == pytest.approx(4.8 / 60)
+    assert len(nowcast.timeline) == 6
+
+    # Points before the current minute are skipped
+    nowcast = compute_nowcast(forecast.minutely(), start + 180)
+    assert nowcast.precipitating
+    assert nowcast.onset is None
+    assert nowcast.end == dt_util.utc_from_timestamp(start + 240)
+    assert len(nowcast.timeline) == 3
+
+
+def test_nowcast_without_precipitation(mock_pirate_weather_response) -> None:
+    """Test an hour without precipitation and a missing minutely block."""
+    forecast = _minutely(mock_pirate_weather_response, [0.0, 0.0, -999])
+    start = forecast.minutely().data[0].utime
+
+    nowcast = compute_nowcast(forecast.minutely(), start)
+    assert not nowcast.precipitating
+    assert nowcast.onset is None
+    assert nowcast.end is None
+    assert nowcast.peak_intensity == 0.0
+    assert nowcast.accumulation == 0.0
+    assert nowcast.as_dict()["timeline"][-1]["intensity"] is None
+
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    del payload["minutely"]
+    nowcast = compute_nowcast(Forecast(payload, None, {}).minutely(), start)
+    assert nowcast.peak_intensity is None
+    assert nowcast.as_dict()["timeline"] == []
@@ -0,0 +1,245 @@
+"""Test the Pirate Weather forecast rules."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.pirateweather.const import (
+    CONF_RULES,
+    CONF_UNITS,
+    DOMAIN,
+    ENTRY_WEATHER_COORDINATOR,
+    EVENT_RULE,
+    PW_PLATFORM,
+)
+from custom_components.pirateweather.forecast_models import Forecast
+from custom_components.pirateweather.rules import (
+    ForecastRule,
+    evaluate_rule,
+    parse_rules,
+)
+
+
+def test_parse_rules(caplog: pytest.LogCaptureFixture) -> None:
+    """Test rule definitions are parsed and invalid ones are skipped."""
+    rules = parse_rules(
+        "temperature:hourly:12:<=:0, uv_index:daily:1:>=:8,,temperature:now:1:<:0,"
+        "temperature:hourly:12:=:0,temperature:hourly:0:<:0,temperature:hourly:12,"
+        "temperature:hourly:12:<=:0.0,uv_idx:hourly:6:>:5,alerts:currently:1:>:0"
+    )
+
+    assert rules == [
+        ForecastRule("temperature", "hourly", 12, "<=", 0.0),
+        ForecastRule("uv_index", "daily", 1, ">=", 8.0),
+    ]
+    assert rules[0].label == "temperature at most 0 12h"
+    assert rules[0].key == "temperature_at_most_0_12h"
+    assert rules[1].label == "uv index at least 8 1d"
+    assert rules[1].key == "uv_index_at_least_8_1d"
+    assert ForecastRule("wind_gust", "currently", 1, ">", 60).label == (
+        "wind gust above 60 now"
+    )
+    assert caplog.text.count("Ignoring rule") == 7
+    assert "duplicate of an earlier rule" in caplog.text
+    assert "uv_idx is not a forecast condition" in caplog.text
+    assert parse_rules(None) == []
+
+
+def test_evaluate_rule(mock_pirate_weather_response) -> None:
+    """Test rules are met by the first known point within their horizon."""
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    hourly = payload["hourly"]["data"]
+    start = hourly[0]["time"]
+    payload["hourly"]["data"] = [
+        {**hourly[0], "time": start + hour * 3600, "windGust": gust}
+        for hour, gust in enumerate([20.0, -999, 45.0, 70.0])
+    ]
+    forecast = Forecast(payload, None, {})
+
+    result = evaluate_rule(
+        forecast, ForecastRule("wind_gust", "hourly", 4, ">", 40), start + 600
+    )
+    assert result.active
+    assert result.time == dt_util.utc_from_timestamp(start + 2 * 3600)
+    assert result.value == 45.0
+
+    # The horizon counts from the point covering now
+    rule = ForecastRule("wind_gust", "hourly", 2, ">", 40)
+    assert not evaluate_rule(forecast, rule, start).active
+    assert evaluate_rule(forecast, rule, start + 3600).active
+    # Missing values and fields never meet a rule
+    assert not evaluate_rule(
+        forecast, ForecastRule("wind_gust", "hourly", 2, "<", 0), start
+    ).active
+    assert not evaluate_rule(
+        forecast, ForecastRule("snow_depth", "hourly", 4, ">=", 0), start
+    ).active
+
+    currently = payload["currently"]
+    result = evaluate_rule(
+        forecast, ForecastRule("temperature", "currently", 1, ">", 60), start
+    )
+    assert result.active
+    assert result.value == currently["temperature"]
+
+
+async def test_rule_binary_sensors(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test rules are binary sensors that fire events when they change."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly.append({**hourly[0], "time": start + 3600, "temperature": 0.5})
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[PW_PLATFORM] = ["Weather"]
+    # Metric units keep the values equal to the API values
+    config_data[CONF_UNITS] = "si"
+    config_data[CONF_RULES] = "temperature:hourly:2:<=:0, uv_index:daily:1:>=:5"
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_rules_unique_id",
+    )
+    entry.add_to_hass(hass)
+    events = async_capture_events(hass, EVENT_RULE)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    frost = hass.states.get("binary_sensor.pirateweather_temperature_at_most_0_2h")
+    assert frost.state == "off"
+    uv = hass.states.get("binary_sensor.pirateweather_uv_index_at_least_5_1d")
+    assert uv.state == "on"
+    assert (
+        uv.attributes["value"]
+        == mock_pirate_weather_response["daily"]["data"][0]["uvIndex"]
+    )
+    # Rules are only evaluated against new forecasts, and the first one sets them
+    assert events == []
+
+    data = copy.deepcopy(mock_pirate_weather_response)
+    data["hourly"]["data"][1]["temperature"] = -1.0
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    coordinator.async_set_updated_data(Forecast(data, None, {}))
+    await hass.async_block_till_done()
+
+    frost = hass.states.get("binary_sensor.pirateweather_temperature_at_most_0_2h")
+    assert frost.state == "on"
+    assert dt_util.parse_datetime(frost.attributes["time"]) == (
+        dt_util.utc_from_timestamp(start + 3600)
+    )
+    assert len(events) == 1
+    assert events[0].data["rule"] == "temperature_at_most_0_2h"
+    assert events[0].data["active"]
+    assert events[0].data["value"] == -1.0
+
+    # Rules are added and removed without reloading the entry
+    hass.config_entries.async_update_entry(
+        entry, options={**config_data, CONF_RULES: "wind_speed:currently:1:>:100"}
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(
+        "binary_sensor.pirateweather_wind_speed_above_100_now"
+    ).state == ("off")
+    uv = hass.states.get("binary_sensor.pirateweather_uv_index_at_least_5_1d")
+    assert uv.state == "unavailable"
+
+
+async def test_rules_follow_the_clock(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test rules are evaluated again when the current hour rolls over."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly[0]["temperature"] = 5.0
+    hourly.append({**hourly[0], "time": start + 3600, "temperature": -1.0})
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[PW_PLATFORM] = ["Weather"]
+    config_data[CONF_UNITS] = "si"
+    config_data[CONF_RULES] = "temperature:hourly:1:<=:0"
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_rules_clock_unique_id",
+    )
+    entry.add_to_hass(hass)
+    events = async_capture_events(hass, EVENT_RULE)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = "binary_sensor.pirateweather_temperature_at_most_0_1h"
+    assert hass.states.get(entity_id).state == "off"
+
+    # The next hour becomes current without a new forecast
+    freezer.move_to(dt_util.utc_from_timestamp(start + 3600))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == "on"
+    assert len(events) == 1
+    assert events[0].data["active"]
+    assert events[0].data["value"] == -1.0
+
+
+async def test_rule_platform_only_for_entries_with_rules(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test the binary sensor platform is only set up once rules are configured."""
+    config_data = mock_config_entry_data.copy()
+    config_data[PW_PLATFORM] = ["Weather"]
+    config_data[CONF_UNITS] = "si"
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_rules_platform_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert [platform.domain for platform in async_get_platforms(hass, DOMAIN)] == [
+        "weather"
+    ]
+
+    # Adding the first rule sets the platform up
+    hass.config_entries.async_update_entry(
+        entry, options={**config_data, CONF_RULES: "wind_speed:currently:1:>:100"}
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.pirateweather_wind_speed_above_100_now")
+    assert await hass.config_entries.async_unload(entry.entry_id)
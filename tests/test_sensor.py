@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import gc
+import tracemalloc
+from unittest.mock import patch
+
 import pytest
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.const import (
     CONF_API_KEY,
     CONF_LATITUDE,
@@ -13,13 +18,23 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import DeviceEntryType
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.pirateweather.const import (
+    CONF_AGGREGATES,
     CONF_ENDPOINT,
+    CONF_FORECAST_SERIES,
+    CONF_FORECAST_STATISTICS,
+    CONF_HORIZON_CUTOFF,
     CONF_LANGUAGE,
     CONF_UNITS,
+    CONF_WINDOWS,
     DEFAULT_ENDPOINT,
     DEFAULT_LANGUAGE,
     DEFAULT_NAME,
@@ -27,6 +42,12 @@ from custom_components.pirateweather.const import (
     PW_PLATFORM,
     PW_ROUND,
 )
+from custom_components.pirateweather.dispatcher import SensorDispatcher
+from custom_components.pirateweather.sensor import (
+    CONDITION_PICTURES,
+    SENSOR_TYPES,
+    PirateWeatherSensor,
+)
 
 
 async def test_sensor_setup(
@@ -263,3 +284,411 @@ async def test_sensor_unit_system(
     assert temp_sensor is not None
     # Check unit is correct for SI
     assert temp_sensor.attributes.get("unit_of_measurement") == "°C"
+
+
+async def test_sensor_forecast_series(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test series mode creates one sensor per condition and block."""
+    # The hour before the current one has already passed
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly.insert(0, {**hourly[0], "time": start - 3600, "temperature": 50})
+    hourly.extend(
+        {**hourly[1], "time": start + hour * 3600, "temperature": temperature}
+        for hour, temperature in ((1, 64.05), (2, 70.0))
+    )
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+    config_data["hourly_forecast"] = "0,1,2"
+    config_data[CONF_FORECAST_SERIES] = True
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_series_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    sensor_ids = {s.entity_id for s in hass.states.async_all("sensor")}
+    assert sensor_ids == {
+        "sensor.pirateweather_temperature",
+        "sensor.pirateweather_temperature_hourly",
+    }
+
+    series_sensor = hass.states.get("sensor.pirateweather_temperature_hourly")
+    # The series starts at the current hour at 64.02°F, shown in °C like the state
+    assert float(series_sensor.state) == pytest.approx(17.79, abs=0.01)
+    # Forecasts only keep statistics for the conditions opted in
+    assert series_sensor.attributes.get("state_class") is None
+    # Home Assistant only converts the state, so the series keeps native values
+    assert series_sensor.attributes["forecast"] == [
+        [start, 64.02],
+        [start + 3600, 64.05],
+        [start + 7200, 70.0],
+    ]
+
+    # The state barely changes in the next hour, but the series moves on with it
+    freezer.move_to(dt_util.utc_from_timestamp(start + 3600))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    series_sensor = hass.states.get("sensor.pirateweather_temperature_hourly")
+    assert series_sensor.attributes["forecast"] == [
+        [start + 3600, 64.05],
+        [start + 7200, 70.0],
+    ]
+
+
+async def test_sensor_state_computed_once(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test each sensor computes its state once per coordinator update."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "hourly_summary"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_state_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    with patch.object(
+        PirateWeatherSensor,
+        "compute_value",
+        autospec=True,
+        side_effect=PirateWeatherSensor.compute_value,
+    ) as mock_compute:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_compute.call_count == 2
+
+    summary = hass.states.get("sensor.pirateweather_hourly_summary")
+    assert summary.attributes.get("icon") == CONDITION_PICTURES["clear-day"].icon
+    assert (
+        summary.attributes.get("entity_picture")
+        == CONDITION_PICTURES["clear-day"].entity_picture
+    )
+
+
+async def test_sensor_horizon_cutoff(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test forecast sensors past the cutoff are added disabled and not evaluated."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "time"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+    config_data["hourly_forecast"] = "0,30"
+    config_data[CONF_HORIZON_CUTOFF] = 24
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_cutoff_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    for entity_id, disabled in (
+        ("sensor.pirateweather_temperature_0h", False),
+        ("sensor.pirateweather_temperature_30h", True),
+        ("sensor.pirateweather_time_0h", True),
+    ):
+        entity = entity_registry.async_get(entity_id)
+        assert entity.disabled is disabled
+        assert (hass.states.get(entity_id) is None) is disabled
+
+
+async def test_sensor_statistics_policy(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test forecast sensors only keep statistics for conditions opted in."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "humidity", "alerts"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+    config_data["hourly_forecast"] = "0"
+    config_data[CONF_AGGREGATES] = "temperature:max:2, humidity:max:2"
+    config_data[CONF_FORECAST_STATISTICS] = ["humidity"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_statistics_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    for entity_id, state_class in (
+        ("sensor.pirateweather_temperature", "measurement"),
+        ("sensor.pirateweather_temperature_0h", None),
+        ("sensor.pirateweather_humidity_0h", "measurement"),
+        ("sensor.pirateweather_temperature_max_2h", None),
+        ("sensor.pirateweather_humidity_max_2h", "measurement"),
+    ):
+        state = hass.states.get(entity_id)
+        assert state.attributes.get("state_class") == state_class
+
+    # Alert text is excluded from the recorder, however many alerts are active
+    unrecorded = hass.states.get("sensor.pirateweather_alerts").state_info[
+        "unrecorded_attributes"
+    ]
+    assert {"description", "description_1", "regions_2", "uri"} <= unrecorded
+    assert "title" not in unrecorded
+
+
+async def test_sensor_aggregates(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test aggregate sensors reduce the hourly forecast from the current hour."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly.extend(
+        {**hourly[0], "time": start + hour * 3600, "temperature": temperature}
+        for hour, temperature in ((1, 66.02), (2, 63.02))
+    )
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[PW_PLATFORM] = ["Sensor"]
+    # Metric units keep the states equal to the API values
+    config_data[CONF_UNITS] = "si"
+    config_data[CONF_AGGREGATES] = (
+        "temperature:max:3, temperature:below:3:65, humidity:mean:12, not:a:window"
+    )
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_aggregates_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.pirateweather_temperature_max_3h").state) == (
+        66.02
+    )
+    below = hass.states.get("sensor.pirateweather_temperature_below_65_3h")
+    assert below.state == "2"
+    assert below.attributes["unit_of_measurement"] == "h"
+    # Windows past the end of the forecast reduce the hours available
+    assert hass.states.get("sensor.pirateweather_humidity_mean_12h").state == "80"
+
+    # New windows are added without reloading the entry
+    hass.config_entries.async_update_entry(
+        entry,
+        options={**config_data, CONF_AGGREGATES: "temperature:min:2"},
+    )
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.pirateweather_temperature_min_2h").state) == (
+        64.02
+    )
+    # Removed windows leave their registry entry behind like removed conditions
+    state = hass.states.get("sensor.pirateweather_temperature_max_3h")
+    assert state.state == "unavailable"
+    assert mock_get_clientsession.return_value.get.call_count == 1
+
+
+async def test_sensor_windows(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test window sensors show the next window from the current hour."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly.extend(
+        {**hourly[0], "time": start + hour * 3600, "windSpeed": wind_speed}
+        for hour, wind_speed in ((1, 20.0), (2, 4.0))
+    )
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[PW_PLATFORM] = ["Sensor"]
+    config_data[CONF_WINDOWS] = (
+        "1:max_wind_speed=10, 1:max_temperature=-40, 1:max_wind_speed=10:horizon=1"
+    )
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_windows_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    calm = hass.states.get("sensor.pirateweather_window_1h_max_wind_speed_10")
+    assert dt_util.parse_datetime(calm.state) == dt_util.utc_from_timestamp(start)
+    assert dt_util.parse_datetime(calm.attributes["end"]) == (
+        dt_util.utc_from_timestamp(start + 3600)
+    )
+    cold = hass.states.get("sensor.pirateweather_window_1h_max_temperature_40")
+    assert cold.state == "unknown"
+
+    # The search moves with the current hour between polls
+    freezer.move_to(dt_util.utc_from_timestamp(start + 3600))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    calm = hass.states.get("sensor.pirateweather_window_1h_max_wind_speed_10")
+    assert dt_util.parse_datetime(calm.state) == dt_util.utc_from_timestamp(
+        start + 7200
+    )
+    # Windows with a horizon only search the next hours
+    soon = hass.states.get(
+        "sensor.pirateweather_window_1h_max_wind_speed_10_within_1h"
+    )
+    assert soon.state == "unknown"
+
+
+async def test_sensor_derived_indices(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test derived indices are available as current and forecast conditions."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["wet_bulb", "heating_degree_hours"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+    config_data["hourly_forecast"] = "0"
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_derived_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    currently = mock_pirate_weather_response["currently"]
+    degree_hours = hass.states.get("sensor.pirateweather_heating_degree_hours")
+    assert float(degree_hours.state) == round(65 - currently["temperature"], 2)
+    assert degree_hours.attributes["unit_of_measurement"] == "°F·h"
+    assert hass.states.get("sensor.pirateweather_heating_degree_hours_0h") is not None
+
+    wet_bulb = hass.states.get("sensor.pirateweather_wet_bulb_temperature")
+    temperature = (currently["temperature"] - 32) * 5 / 9
+    assert float(wet_bulb.state) < temperature
+
+
+async def test_sensor_chunked_setup(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test sensors are added in chunks and registry disabled sensors are skipped."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = ["temperature", "humidity", "pressure"]
+    config_data[PW_PLATFORM] = ["Sensor"]
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_sensor_chunks_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    entity_registry = er.async_get(hass)
+    entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "test_sensor_chunks_unique_id-sensor-humidity",
+        config_entry=entry,
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+
+    with patch("custom_components.pirateweather.sensor.ENTITY_CHUNK_SIZE", 1):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    sensor_ids = {s.entity_id for s in hass.states.async_all("sensor")}
+    assert sensor_ids == {
+        "sensor.pirateweather_temperature",
+        "sensor.pirateweather_pressure",
+    }
+
+
+def test_sensor_memory_budget() -> None:
+    """Test sensors of an entry stay within a per-entity memory budget."""
+    device_info = DeviceInfo(
+        entry_type=DeviceEntryType.SERVICE,
+        identifiers={(DOMAIN, "test_sensor_memory_unique_id")},
+        name=DEFAULT_NAME,
+    )
+    count = 1000
+    dispatcher = SensorDispatcher(None)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        sensors = [
+            PirateWeatherSensor(
+                None,
+                "temperature",
+                DEFAULT_NAME,
+                f"test_sensor_memory_unique_id-sensor-temperature-hourly-{hour}",
+                forecast_day=None,
+                forecast_hour=hour,
+                description=SENSOR_TYPES["temperature"],
+                request_units="si",
+                output_round="No",
+                device_info=device_info,
+                dispatcher=dispatcher,
+            )
+            for hour in range(count)
+        ]
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    assert len(sensors) == count
+    assert used / count < 800
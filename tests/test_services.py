@@ -0,0 +1,248 @@
+"""Test the Pirate Weather services."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+import voluptuous as vol
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.pirateweather.const import DOMAIN, ENTRY_WEATHER_COORDINATOR
+from custom_components.pirateweather.services import (
+    SERVICE_FIND_WINDOW,
+    SERVICE_NOWCAST,
+    SERVICE_VALUE_AT,
+)
+from custom_components.pirateweather.windows import WindowQuery
+
+
+async def _setup_entry(hass: HomeAssistant, config_data: dict) -> MockConfigEntry:
+    """Set up a Pirate Weather entry."""
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_services_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_value_at(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test fields are interpolated between the points of the finest block."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    hourly.append({**hourly[0], "time": hourly[0]["time"] + 3600, "temperature": 66.02})
+    entry = await _setup_entry(hass, mock_config_entry_data)
+
+    start = hourly[0]["time"]
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_VALUE_AT,
+        {
+            ATTR_CONFIG_ENTRY_ID: entry.entry_id,
+            "fields": ["temperature", "icon"],
+            "times": [
+                datetime.fromtimestamp(start + 1800, UTC).isoformat(),
+                datetime.fromtimestamp(start + 7200, UTC).isoformat(),
+            ],
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    halfway, beyond = response["values"]
+    assert halfway["block"] == "hourly"
+    assert halfway["temperature"] == pytest.approx(65.02)
+    assert halfway["icon"] == hourly[0]["icon"]
+    assert beyond["block"] is None
+    assert beyond["temperature"] is None
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_VALUE_AT,
+        {
+            ATTR_CONFIG_ENTRY_ID: entry.entry_id,
+            "fields": "temperatureHigh",
+            "times": datetime.fromtimestamp(
+                mock_pirate_weather_response["daily"]["data"][0]["time"], UTC
+            ).isoformat(),
+            "block": "daily",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    daily = mock_pirate_weather_response["daily"]["data"][0]
+    assert response["values"][0]["temperatureHigh"] == daily["temperatureHigh"]
+
+
+async def test_value_at_unknown_entry(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test entries that are not loaded Pirate Weather entries are rejected."""
+    await _setup_entry(hass, mock_config_entry_data)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_VALUE_AT,
+            {
+                ATTR_CONFIG_ENTRY_ID: "not_an_entry",
+                "fields": ["temperature"],
+                "times": ["2025-10-05 17:30:00"],
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_nowcast(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test the nowcast is returned with its minute by minute timeline."""
+    minutely = mock_pirate_weather_response["minutely"]["data"]
+    start = minutely[0]["time"]
+    minutely.append({**minutely[0], "time": start + 60, "precipIntensity": 0.5})
+    freezer.move_to(dt_util.utc_from_timestamp(start))
+
+    config_data = mock_config_entry_data.copy()
+    config_data["monitored_conditions"] = [
+        "nowcast_onset",
+        "nowcast_end",
+        "nowcast_accumulation",
+    ]
+    config_data["pw_platform"] = ["Sensor"]
+    # Metric units keep the states equal to the API values
+    config_data["units"] = "si"
+    entry = await _setup_entry(hass, config_data)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_NOWCAST,
+        {ATTR_CONFIG_ENTRY_ID: entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert not response["precipitating"]
+    assert response["onset"] == datetime.fromtimestamp(start + 60, UTC).isoformat()
+    assert response["end"] is None
+    assert response["peak_intensity"] == 0.5
+    assert response["accumulation"] == pytest.approx(0.25 / 60)
+    assert [point["intensity"] for point in response["timeline"]] == [0.0, 0.5]
+
+    # The sensors show the same nowcast
+    onset = hass.states.get("sensor.pirateweather_precip_onset")
+    assert dt_util.parse_datetime(onset.state) == datetime.fromtimestamp(
+        start + 60, UTC
+    )
+    accumulation = hass.states.get("sensor.pirateweather_next_hour_precip_accumulation")
+    assert float(accumulation.state) == round(0.25 / 60, 4)
+    end = hass.states.get("sensor.pirateweather_precip_end")
+
+    # The nowcast moves on with the clock between polls
+    freezer.move_to(dt_util.utc_from_timestamp(start + 60))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_NOWCAST,
+        {ATTR_CONFIG_ENTRY_ID: entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["precipitating"]
+    assert response["onset"] is None
+    assert hass.states.get("sensor.pirateweather_precip_onset").state == "unknown"
+    accumulation = hass.states.get("sensor.pirateweather_next_hour_precip_accumulation")
+    assert float(accumulation.state) == 0
+    # Nowcast sensors that did not change are not rewritten each minute
+    state = hass.states.get("sensor.pirateweather_precip_end")
+    assert state.last_reported == end.last_reported
+
+
+async def test_find_window(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test the next window meeting every constraint is found and memoized."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly.extend(
+        {**hourly[0], "time": start + hour * 3600, "windSpeed": wind_speed}
+        for hour, wind_speed in ((1, 20.0), (2, 4.0), (3, 3.0))
+    )
+    freezer.move_to(dt_util.utc_from_timestamp(start + 600))
+    entry = await _setup_entry(hass, mock_config_entry_data)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_FIND_WINDOW,
+        {
+            ATTR_CONFIG_ENTRY_ID: entry.entry_id,
+            "duration": {"hours": 2},
+            "max_precip_probability": 0.2,
+            "max_wind_speed": 10,
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {
+        "start": datetime.fromtimestamp(start + 2 * 3600, UTC).isoformat(),
+        "end": datetime.fromtimestamp(start + 4 * 3600, UTC).isoformat(),
+    }
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_FIND_WINDOW,
+        {
+            ATTR_CONFIG_ENTRY_ID: entry.entry_id,
+            "duration": "00:30:00",
+            "block": "minutely",
+            "max_precip_intensity": 0,
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response["start"] is None
+
+    # Constraints are required
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_WINDOW,
+            {ATTR_CONFIG_ENTRY_ID: entry.entry_id, "duration": {"hours": 2}},
+            blocking=True,
+            return_response=True,
+        )
+
+    # Windows are searched once per forecast and hour
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    query = WindowQuery(2, (("max_wind_speed", 10.0),))
+    assert coordinator.find_window(query) is coordinator.find_window(query)
@@ -0,0 +1,174 @@
+"""Test the Pirate Weather solar production forecast."""
+
+from __future__ import annotations
+
+import copy
+import math
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_MONITORED_CONDITIONS
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pirateweather.const import (
+    CONF_SOLAR_AZIMUTH,
+    CONF_SOLAR_CAPACITY,
+    DOMAIN,
+    ENTRY_WEATHER_COORDINATOR,
+    PW_PLATFORM,
+)
+from custom_components.pirateweather.energy import async_get_solar_forecast
+from custom_components.pirateweather.forecast_models import Forecast
+from custom_components.pirateweather.solar import (
+    SYSTEM_EFFICIENCY,
+    SolarArray,
+    compute_solar_forecast,
+    plane_of_array_irradiance,
+    solar_position,
+)
+
+
+def test_solar_position() -> None:
+    """Test the position of the sun against the equinox and solstice."""
+    # The sun is overhead at the equator at solar noon of the March equinox
+    noon = datetime(2025, 3, 20, 12, 7, tzinfo=UTC).timestamp()
+    zenith, _ = solar_position(noon, 0, 0)
+    assert math.degrees(zenith) == pytest.approx(0, abs=0.5)
+
+    # It rises on the horizon north of east at the June solstice
+    sunrise = datetime(2025, 6, 21, 6, 0, tzinfo=UTC).timestamp()
+    zenith, azimuth = solar_position(sunrise, 0, 0)
+    assert math.degrees(zenith) == pytest.approx(90, abs=1)
+    assert math.degrees(azimuth) == pytest.approx(90 - 23.44, abs=1)
+
+
+def test_plane_of_array_irradiance() -> None:
+    """Test the irradiance is transposed onto the orientation of the array."""
+    # Early afternoon in San Francisco in October
+    zenith, azimuth = solar_position(
+        datetime(2025, 10, 5, 20, 30, tzinfo=UTC).timestamp(), 37.8267, -122.4233
+    )
+
+    flat = plane_of_array_irradiance(500, zenith, azimuth, SolarArray(1000, 0))
+    south = plane_of_array_irradiance(500, zenith, azimuth, SolarArray(1000, 30, 180))
+    north = plane_of_array_irradiance(500, zenith, azimuth, SolarArray(1000, 30, 0))
+    assert flat == pytest.approx(500)
+    assert south > flat > north
+
+
+def test_compute_solar_forecast(mock_pirate_weather_response) -> None:
+    """Test production is integrated per hour and per local day."""
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    hourly = payload["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly[0]["solar"] = 500
+    hourly.extend(
+        [
+            {**hourly[0], "time": start + 3600, "solar": 400},
+            {**hourly[0], "time": start + 7200, "solar": None},
+            # Night, and the missing value sentinel
+            {**hourly[0], "time": start + 36000, "solar": 0},
+            {**hourly[0], "time": start + 39600, "solar": -999},
+        ]
+    )
+    forecast = Forecast(payload, None, {})
+
+    solar = compute_solar_forecast(
+        forecast.hourly(), 37.8267, -122.4233, SolarArray(4000, 0)
+    )
+
+    first = dt_util.utc_from_timestamp(start).isoformat()
+    assert solar.wh_hours[first] == round(4000 * 500 / 1000 * SYSTEM_EFFICIENCY)
+    assert solar.wh_hours[dt_util.utc_from_timestamp(start + 36000).isoformat()] == 0
+    assert len(solar.wh_hours) == 3
+    assert sum(solar.wh_days.values()) == sum(solar.wh_hours.values())
+
+
+async def test_solar_energy(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test the forecast is served to the Energy dashboard and the sensors."""
+    hourly = mock_pirate_weather_response["hourly"]["data"]
+    start = hourly[0]["time"]
+    hourly[0]["solar"] = 500
+    hourly.append({**hourly[0], "time": start + 3600, "solar": 400})
+    freezer.move_to(dt_util.utc_from_timestamp(start))
+
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_MONITORED_CONDITIONS] = [
+        "solar_energy_today",
+        "solar_energy_tomorrow",
+    ]
+    config_data[PW_PLATFORM] = ["Sensor"]
+    config_data[CONF_SOLAR_CAPACITY] = 4000
+    config_data[CONF_SOLAR_AZIMUTH] = 180
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_solar_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    calls = mock_get_clientsession.return_value.get.call_count
+
+    solar = await async_get_solar_forecast(hass, entry.entry_id)
+    wh_hours = solar["wh_hours"]
+    assert list(wh_hours) == [
+        dt_util.utc_from_timestamp(start).isoformat(),
+        dt_util.utc_from_timestamp(start + 3600).isoformat(),
+    ]
+    assert wh_hours[dt_util.utc_from_timestamp(start).isoformat()] > 0
+
+    today = hass.states.get("sensor.pirateweather_solar_energy_today")
+    assert int(today.state) == sum(wh_hours.values())
+    assert today.attributes["unit_of_measurement"] == "Wh"
+    tomorrow = hass.states.get("sensor.pirateweather_solar_energy_tomorrow")
+    assert tomorrow.state == "unknown"
+
+    # The forecast is served from the coordinator without further API calls
+    assert await async_get_solar_forecast(hass, entry.entry_id) == solar
+    assert mock_get_clientsession.return_value.get.call_count == calls
+    assert await async_get_solar_forecast(hass, "not_an_entry") is None
+
+
+async def test_solar_forecast_at_null_island(
+    hass: HomeAssistant,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test coordinates on the equator and prime meridian are not replaced."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_SOLAR_CAPACITY] = 4000
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_solar_null_island_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    coordinator.latitude = 0.0
+    coordinator.longitude = 0.0
+
+    with patch(
+        "custom_components.pirateweather.weather_update_coordinator.compute_solar_forecast"
+    ) as compute:
+        coordinator.solar_forecast()
+
+    assert compute.call_args.args[1:3] == (0.0, 0.0)
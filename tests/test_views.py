@@ -0,0 +1,202 @@
+"""Test the Pirate Weather HTTP views."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+from http import HTTPStatus
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util.json import json_loads
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pirateweather.const import (
+    CONF_PUSH_UPDATES,
+    CONF_SHARE_FORECAST,
+    DOMAIN,
+    ENTRY_WEATHER_COORDINATOR,
+)
+
+
+async def _setup_entry(hass: HomeAssistant, config_data: dict) -> MockConfigEntry:
+    """Set up the HTTP integration and a Pirate Weather entry."""
+    assert await async_setup_component(hass, "http", {})
+
+    entry = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=config_data,
+        unique_id="test_views_unique_id",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_push_forecast(
+    hass: HomeAssistant,
+    hass_client,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test a pushed forecast replaces the coordinator data."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_PUSH_UPDATES] = True
+    entry = await _setup_entry(hass, config_data)
+
+    pushed = copy.deepcopy(mock_pirate_weather_response)
+    pushed["currently"]["time"] += 600
+    pushed["currently"]["temperature"] = 70.0
+
+    client = await hass_client()
+    resp = await client.post(
+        f"/api/pirateweather/{entry.entry_id}/forecast", json=pushed
+    )
+    assert resp.status == HTTPStatus.ACCEPTED
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    assert coordinator.data.currently().temperature == 70.0
+    # Only the initial refresh should have hit the API
+    assert mock_get_clientsession.return_value.get.call_count == 1
+
+
+async def test_push_forecast_invalid(
+    hass: HomeAssistant,
+    hass_client,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test invalid or stale pushed forecasts are rejected."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_PUSH_UPDATES] = True
+    entry = await _setup_entry(hass, config_data)
+    url = f"/api/pirateweather/{entry.entry_id}/forecast"
+
+    client = await hass_client()
+    resp = await client.post(url, json={"currently": {"time": 1}})
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+    stale = copy.deepcopy(mock_pirate_weather_response)
+    stale["currently"]["time"] -= 600
+    resp = await client.post(url, json=stale)
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+async def test_push_forecast_units_mismatch(
+    hass: HomeAssistant,
+    hass_client,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test pushed forecasts in other units than the entry are rejected."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_PUSH_UPDATES] = True
+    entry = await _setup_entry(hass, config_data)
+    url = f"/api/pirateweather/{entry.entry_id}/forecast"
+
+    pushed = copy.deepcopy(mock_pirate_weather_response)
+    pushed["currently"]["time"] += 600
+    pushed["currently"]["temperature"] = 21.0
+    pushed["flags"]["units"] = "si"
+
+    client = await hass_client()
+    resp = await client.post(url, json=pushed)
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+    del pushed["flags"]["units"]
+    resp = await client.post(url, json=pushed)
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_WEATHER_COORDINATOR]
+    assert coordinator.data.currently().temperature != 21.0
+
+
+async def test_push_forecast_disabled(
+    hass: HomeAssistant,
+    hass_client,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test pushes are refused when the entry has not opted in."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_PUSH_UPDATES] = True
+    await _setup_entry(hass, config_data)
+
+    other = MockConfigEntry(
+        version=2,
+        domain=DOMAIN,
+        data=mock_config_entry_data,
+        unique_id="test_views_disabled_unique_id",
+    )
+    other.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(other.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_client()
+    resp = await client.post(
+        f"/api/pirateweather/{other.entry_id}/forecast",
+        json=mock_pirate_weather_response,
+    )
+    assert resp.status == HTTPStatus.NOT_FOUND
+
+
+async def test_share_forecast_etag(
+    hass: HomeAssistant,
+    hass_client,
+    mock_get_clientsession,
+    mock_config_entry_data,
+    mock_pirate_weather_response,
+) -> None:
+    """Test the shared forecast is served with an ETag and revalidates."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_SHARE_FORECAST] = True
+    entry = await _setup_entry(hass, config_data)
+    url = f"/api/pirateweather/{entry.entry_id}/forecast"
+
+    client = await hass_client()
+    resp = await client.get(url)
+    assert resp.status == HTTPStatus.OK
+    # The API document is served as fetched, without the derived indices
+    body = await resp.read()
+    assert json_loads(body) == mock_pirate_weather_response
+    etag = resp.headers["ETag"]
+    assert etag == f'"{hashlib.sha256(body).hexdigest()}"'
+
+    resp = await client.get(url, headers={"If-None-Match": etag})
+    assert resp.status == HTTPStatus.NOT_MODIFIED
+    assert resp.headers["ETag"] == etag
+
+    resp = await client.get(url, params={"blocks": "currently,flags"})
+    assert resp.status == HTTPStatus.OK
+    document = await resp.json()
+    assert "currently" in document
+    assert "flags" in document
+    assert "hourly" not in document
+    assert document["latitude"] == mock_pirate_weather_response["latitude"]
+    assert resp.headers["ETag"] != etag
+
+    resp = await client.get(url, params={"blocks": "weekly"})
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+async def test_share_forecast_disabled(
+    hass: HomeAssistant,
+    hass_client,
+    mock_get_clientsession,
+    mock_config_entry_data,
+) -> None:
+    """Test the forecast is not served unless the entry has opted in."""
+    config_data = mock_config_entry_data.copy()
+    config_data[CONF_PUSH_UPDATES] = True
+    entry = await _setup_entry(hass, config_data)
+
+    client = await hass_client()
+    resp = await client.get(f"/api/pirateweather/{entry.entry_id}/forecast")
+    assert resp.status == HTTPStatus.NOT_FOUND
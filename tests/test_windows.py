@@ -0,0 +1,71 @@
+"""Test the Pirate Weather forecast window search."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from custom_components.pirateweather.forecast_models import Forecast
+from custom_components.pirateweather.windows import (
+    WindowQuery,
+    find_window,
+    parse_queries,
+    points_in,
+)
+
+
+def test_parse_queries(caplog: pytest.LogCaptureFixture) -> None:
+    """Test window definitions are parsed and invalid ones are skipped."""
+    queries = parse_queries(
+        "3:max_precip_probability=0.2:max_wind_speed=10, 2:min_temperature=5,,"
+        "0:max_wind_speed=10,3,3:max_snow=1,3:max_wind_speed=10:horizon=12,"
+        "3:max_wind_speed=10:horizon=2,3:horizon=12"
+    )
+
+    assert queries == [
+        WindowQuery(3, (("max_precip_probability", 0.2), ("max_wind_speed", 10.0))),
+        WindowQuery(2, (("min_temperature", 5.0),)),
+        WindowQuery(3, (("max_wind_speed", 10.0),), horizon=12),
+    ]
+    assert queries[0].key == "3h_max_precip_probability_0.2_max_wind_speed_10"
+    assert queries[1].label == "2h Min Temperature 5"
+    assert queries[2].key == "3h_max_wind_speed_10_within_12h"
+    assert queries[2].label == "3h Max Wind Speed 10 Within 12h"
+    assert caplog.text.count("Ignoring window") == 5
+    assert parse_queries(None) == []
+    assert points_in("hourly", 5400) == 2
+    assert points_in("minutely", 30) == 1
+
+
+def test_find_window(mock_pirate_weather_response) -> None:
+    """Test the first run of points meeting every constraint is found."""
+    payload = copy.deepcopy(mock_pirate_weather_response)
+    hourly = payload["hourly"]["data"]
+    start = hourly[0]["time"]
+    probabilities = [0.0, 0.5, 0.1, -999, 0.0, 0.1, 0.1, 0.0]
+    payload["hourly"]["data"] = [
+        {**hourly[0], "time": start + hour * 3600, "precipProbability": probability}
+        for hour, probability in enumerate(probabilities)
+    ]
+    block = Forecast(payload, None, {}).hourly()
+    dry = (("max_precip_probability", 0.2),)
+
+    # Missing values break a run, and windows end with their last hour
+    window = find_window(block, WindowQuery(3, dry), start + 600)
+    assert window.start.timestamp() == start + 4 * 3600
+    assert window.end.timestamp() == start + 7 * 3600
+    assert window.as_dict()["start"] == window.start.isoformat()
+
+    # The search starts at the hour covering now
+    window = find_window(block, WindowQuery(1, dry), start + 3600)
+    assert window.start.timestamp() == start + 2 * 3600
+
+    # Windows must fit within the horizon and the forecast
+    assert find_window(block, WindowQuery(3, dry, horizon=6), start).start is None
+    assert find_window(block, WindowQuery(9, dry), start).as_dict() == {
+        "start": None,
+        "end": None,
+    }
+    calm = (("max_precip_probability", 0.2), ("max_wind_speed", 5.0))
+    assert find_window(block, WindowQuery(1, calm), start).start is None